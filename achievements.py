@@ -0,0 +1,187 @@
+"""
+Goals and achievements as declarative rules.
+
+Each Achievement names the FinanceSimulation fields (or derived values such
+as net_worth) its test reads. The AchievementEngine indexes rules by those
+fields and, at every month end, compares the watched fields with their
+values at the previous update: only rules subscribed to a field that
+changed are re-tested, so a large catalogue costs a handful of attribute
+reads per month, not one test per rule. Rules come in three shapes:
+
+    threshold   test holds at a month end                 (months=1)
+    streak      test holds `months` month ends in a row   (also watches current_month)
+    at_end      judged once when the game ends            ("never did X")
+
+A rule with `goal` set completes that FinanceSimulation.goals entry, so the
+four scored goals are ordinary rules. Newly unlocked achievements are
+returned to the simulation, which passes each to its _on_achievement hook.
+"""
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+_UNSET = object()
+
+
+def _starting_net_worth(sim):
+    log = sim.monthly_log
+    if not log:
+        return 0.0
+    return sum(log.column(field)[0] for field in ('money', 'investments', 'emergency_fund')) - log.column('debt')[0]
+
+
+def _played_out(sim):
+    """The game ran its full length (it did not end in bankruptcy)."""
+    return sim.current_month >= sim.months_per_game
+
+
+def _living_costs(sim):
+    return sim.rent + sim.groceries + sim.transport
+
+
+@dataclass(frozen=True)
+class Achievement:
+    key: str
+    name: str
+    description: str
+    reads: tuple                # state fields `test` looks at (compared by value, so scalars)
+    test: Callable              # sim -> bool
+    months: int = 1             # consecutive month ends the test must hold
+    at_end: bool = False        # judged once, when the game ends
+    goal: Optional[str] = None  # FinanceSimulation.goals key this completes
+
+
+def _goal_rules():
+    return [
+        Achievement('goal_netWorth', "Net Worth $50k", "Reach the net worth goal", ('net_worth',),
+                    lambda s: s.net_worth >= s.goals['netWorth']['target'], goal='netWorth'),
+        Achievement('goal_emergencyFund', "Save $10k Fund", "Reach the emergency fund goal", ('emergency_fund',),
+                    lambda s: s.emergency_fund >= s.goals['emergencyFund']['target'], goal='emergencyFund'),
+        Achievement('goal_debtFree', "Become Debt-Free", "Pay off every loan", ('debt',),
+                    lambda s: s.debt <= 0, goal='debtFree'),
+        Achievement('goal_happiness', "70+ Happiness", "Reach the happiness goal", ('happiness',),
+                    lambda s: s.happiness >= s.goals['happiness']['target'], goal='happiness'),
+    ]
+
+
+def _milestones():
+    rules = []
+    for amount in (10_000, 25_000, 100_000, 250_000, 1_000_000):
+        rules.append(Achievement(f'net_worth_{amount}', f"Worth ${amount:,}", f"Net worth of ${amount:,}",
+                                 ('net_worth',), lambda s, a=amount: s.net_worth >= a))
+    for amount in (5_000, 25_000, 100_000, 500_000):
+        rules.append(Achievement(f'invested_{amount}', f"Investor ${amount:,}", f"${amount:,} invested",
+                                 ('investments',), lambda s, a=amount: s.investments >= a))
+    for months in (3, 6, 12):
+        rules.append(Achievement(f'safety_net_{months}', f"Safety Net {months}mo",
+                                 f"An emergency fund covering {months} months of living costs",
+                                 ('emergency_fund', 'rent', 'groceries', 'transport'),
+                                 lambda s, m=months: s.emergency_fund >= m * _living_costs(s)))
+    return rules
+
+
+def _streaks():
+    rules = []
+    for months in (3, 6, 12):
+        rules.append(Achievement(f'content_{months}', f"Content {months}mo", f"Happiness 70+ for {months} months running",
+                                 ('happiness',), lambda s: s.happiness >= 70, months=months))
+        rules.append(Achievement(f'calm_{months}', f"Calm {months}mo", f"Stress at 20 or below for {months} months running",
+                                 ('stress',), lambda s: s.stress <= 20, months=months))
+    for months in (6, 12, 24):
+        rules.append(Achievement(f'in_the_black_{months}', f"In the Black {months}mo",
+                                 f"Positive cash at every month end for {months} months", ('money',),
+                                 lambda s: s.money > 0, months=months))
+    return rules
+
+
+def _milestone_events():
+    return [
+        Achievement('early_debt_free', "Early Bird", "Pay off every loan within the first year", ('debt', 'current_month'),
+                    lambda s: s.debt <= 0 and s.current_month <= 12 and s.monthly_log.column('debt')[0] > 0),
+        Achievement('wheels', "Wheels", "Buy a vehicle", ('has_vehicle',), lambda s: s.has_vehicle),
+        Achievement('graduate', "Graduate", "Earn a university degree during the game", ('has_university',),
+                    lambda s: s.has_university and s.selected_education not in ('university', 'masters')),
+        Achievement('masters', "Master", "Earn a master's degree during the game", ('has_masters',),
+                    lambda s: s.has_masters and s.selected_education != 'masters'),
+        Achievement('comeback', "Comeback", "Net worth positive after starting in the red", ('net_worth',),
+                    lambda s: s.net_worth > 0 and _starting_net_worth(s) < 0),
+    ]
+
+
+def _end_of_game():
+    return [
+        Achievement('clean_living', "Clean Living", "Finish without a single risky choice", ('num_risky',),
+                    lambda s: _played_out(s) and s.num_risky == 0, at_end=True),
+        Achievement('all_work', "All Work", "Finish without any leisure", ('num_leisure',),
+                    lambda s: _played_out(s) and s.num_leisure == 0, at_end=True),
+        Achievement('grand_slam', "Grand Slam", "Finish with all four goals", ('goals',),
+                    lambda s: all(g['completed'] for g in s.goals.values()), at_end=True),
+        Achievement('no_addiction', "Never Hooked", "Finish without an addiction", ('debuffs',),
+                    lambda s: _played_out(s) and 'addict' not in s.debuffs, at_end=True),
+        Achievement('marathon', "Marathon", "Finish a game of 10 years or more", ('months_per_game',),
+                    lambda s: _played_out(s) and s.months_per_game >= 120, at_end=True),
+    ]
+
+
+ACHIEVEMENTS = tuple(_goal_rules() + _milestones() + _streaks() + _milestone_events() + _end_of_game())
+
+
+class AchievementEngine:
+    """What one game has unlocked, re-testing only the rules whose fields changed."""
+
+    def __init__(self, catalog=ACHIEVEMENTS):
+        self.catalog = catalog
+        watchers = {}
+        for i, rule in enumerate(catalog):
+            if not rule.at_end:
+                for field in rule.reads + (('current_month',) if rule.months > 1 else ()):
+                    watchers.setdefault(field, []).append(i)
+        self._watchers = watchers
+        self._fields = tuple(watchers)
+        self._at_end = [i for i, rule in enumerate(catalog) if rule.at_end]
+        self.reset()
+
+    def reset(self):
+        self.unlocked = {}      # key -> month unlocked
+        self.streaks = {}       # key -> consecutive month ends its test has held
+        self._last = {}         # watched field -> value at the previous update
+
+    def update(self, sim):
+        """Month end: re-test the rules watching a changed field; returns the newly unlocked."""
+        last = self._last
+        due = set()
+        for field in self._fields:
+            value = getattr(sim, field)
+            if last.get(field, _UNSET) != value:
+                last[field] = value
+                due.update(self._watchers[field])
+        return self._evaluate(sim, sorted(due))
+
+    def finish(self, sim):
+        """Game over: judge the at_end rules; returns the newly unlocked."""
+        return self._evaluate(sim, self._at_end)
+
+    def _evaluate(self, sim, indexes):
+        unlocked = []
+        for i in indexes:
+            rule = self.catalog[i]
+            if rule.key in self.unlocked:
+                continue
+            if rule.months > 1:
+                held = self.streaks.get(rule.key, 0) + 1 if rule.test(sim) else 0
+                self.streaks[rule.key] = held
+                if held < rule.months:
+                    continue
+            elif not rule.test(sim):
+                continue
+            self.unlocked[rule.key] = sim.current_month
+            unlocked.append(rule)
+        return unlocked
+
+    # ---------- save / resume ----------
+    def state(self):
+        return {'unlocked': dict(self.unlocked), 'streaks': dict(self.streaks)}
+
+    def load(self, state):
+        self.reset()
+        self.unlocked.update(state['unlocked'])
+        self.streaks.update(state['streaks'])
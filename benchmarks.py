@@ -0,0 +1,434 @@
+"""
+Micro-benchmarks for FinanceQuest hot paths.
+
+Runs the real game headless (SDL dummy video driver) and prints timings.
+
+    python benchmarks.py              # run everything
+    python benchmarks.py action_click
+"""
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+import random
+import rijika
+from rijika import FinanceGame, GameState
+from finance_sim import FinanceSimulation, ACTION_IDS, FINANCIAL_ACTIONS
+from replay import Replay, run_replay
+import strategy_solver
+import policies
+import finance_env
+import market_tape
+from loans import LoanLedger
+from achievements import ACHIEVEMENTS, Achievement, AchievementEngine
+from leaderboard import Leaderboard
+
+
+def _timeit(fn, repeat):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def _new_playing_game():
+    game = FinanceGame()
+    game.selected_class = 'middle'
+    game.selected_education = 'university'
+    game.selected_difficulty = 'normal'
+    game.start_game()
+    game.happiness = 60
+    game._draw_playing([])
+    return game
+
+
+def bench_action_click(repeat=300):
+    """Cost of the frame that follows an action click (button model refresh + draw)."""
+    game = _new_playing_game()
+
+    def refresh_only():
+        game.money = 1_000_000
+        game.actions_remaining = rijika.ACTIONS_PER_MONTH
+        game.need_button_update = True
+        game._update_playing_buttons()
+
+    def click_frame():
+        game.money = 1_000_000
+        game.actions_remaining = rijika.ACTIONS_PER_MONTH
+        game.take_life_choice('fineDining')
+        game.happiness = 60
+        game.screen.fill(rijika.COLOR_BG)
+        game._draw_playing([])
+
+    def click_panel():
+        game.money = 1_000_000
+        game.actions_remaining = rijika.ACTIONS_PER_MONTH
+        game.take_life_choice('fineDining')
+        game.happiness = 60
+        game._update_playing_buttons()
+        game._draw_playing_actions(400, 80)
+
+    print(f"action_click: button refresh   {_timeit(refresh_only, repeat):8.3f} ms")
+    print(f"action_click: click + panel    {_timeit(click_panel, repeat):8.3f} ms")
+    print(f"action_click: click + frame    {_timeit(click_frame, repeat):8.3f} ms")
+
+
+def bench_scroll(repeat=300):
+    """Cost of drawing the action panel while the list scrolls every frame."""
+    game = _new_playing_game()
+    game.debuffs = ['addict', 'unhappy']
+    game.need_button_update = True
+    game._update_playing_buttons()
+    offsets = [0, game.max_scroll // 2, game.max_scroll]
+    step = iter(range(10**9))
+
+    def scroll_frame():
+        game.scroll_offset = offsets[next(step) % len(offsets)]
+        game._draw_playing_actions(400, 80)
+
+    print(f"scroll: action panel frame     {_timeit(scroll_frame, repeat):8.3f} ms")
+
+
+def bench_chatbot_modal(repeat=300):
+    """Cost of drawing the chatbot modal while a long LLM answer is on screen."""
+    game = _new_playing_game()
+    words = ("Consider building a three month emergency fund before you invest, "
+             "then pay down the highest-interest debt first.").split()
+    game.chatbot.is_thinking = False
+    game.chatbot.last_response = '\n\n'.join(' '.join(words * 4) for _ in range(4))
+
+    def modal_frame():
+        rijika.draw_chatbot_modal(game.screen, game.font_small, game.chatbot, "how do I", True)
+
+    print(f"chatbot: modal frame           {_timeit(modal_frame, repeat):8.3f} ms")
+
+
+def bench_avatar_creator(repeat=200):
+    """Cost of one avatar-creator frame (builder tab) and of the playing header."""
+    game = _new_playing_game()
+    game.avatar_creator.visible = True
+
+    def creator_frame():
+        game._draw_avatar_creator_modal([])
+
+    def header_frame():
+        game._draw_playing_header()
+
+    print(f"avatar: creator frame          {_timeit(creator_frame, repeat):8.3f} ms")
+    print(f"avatar: playing header         {_timeit(header_frame, repeat):8.3f} ms")
+
+
+def _record_bot_game(rng):
+    """Headless game played by random choices, returned as a Replay."""
+    sim = FinanceSimulation()
+    sim.selected_class, sim.selected_education, sim.selected_difficulty = 'middle', 'university', 'normal'
+    sim.start_game(rng.getrandbits(32))
+    sim.recorder = Replay.for_game(sim)
+    while not sim.finished:
+        if sim.show_event_modal:
+            sim.handle_event_close()
+        for _ in range(rng.randint(0, 3)):
+            if rng.random() < 0.5:
+                sim._action_callback(rng.choice(ACTION_IDS))()
+            else:
+                sim.execute_financial_action(rng.choice(FINANCIAL_ACTIONS), rng.choice([500, 1000, 5000]))
+        sim.next_month()
+    return sim.recorder
+
+
+def bench_replay(repeat=500):
+    """Headless replay throughput (the replay.py verify / features path)."""
+    rng = random.Random(1)
+    replays = [_record_bot_game(rng) for _ in range(50)]
+    step = iter(range(10**9))
+
+    def one_replay():
+        run_replay(replays[next(step) % len(replays)])
+
+    ms = _timeit(one_replay, repeat)
+    print(f"replay: one game               {ms:8.3f} ms  ({1000 / ms:,.0f} replays/s)")
+
+
+def bench_solver(repeat=2000):
+    """Strategy-solver search iterations (one simulated game each)."""
+    solver = strategy_solver.Solver(('middle', 'university', 'normal'))
+
+    ms = _timeit(solver.iterate, repeat)
+    print(f"solver: one search iteration   {ms:8.3f} ms  ({1000 / ms:,.0f} iterations/s)")
+
+
+def bench_policy_game(repeat=500):
+    """One bot game through the Policy interface (the tournament.py inner loop)."""
+    policy = policies.RuleOfThumbPolicy(fund_months=6)
+    sim = FinanceSimulation()
+    sim.selected_class, sim.selected_education, sim.selected_difficulty = 'middle', 'university', 'normal'
+    seeds = iter(range(10**9))
+
+    def one_game():
+        sim.start_game(next(seeds))
+        policies.play_policy(sim, policy)
+
+    ms = _timeit(one_game, repeat)
+    print(f"policy: one bot game           {ms:8.3f} ms  ({1000 / ms:,.0f} games/s per core)")
+
+
+def bench_market_tape(repeat=500):
+    """bench_policy_game on a 100-year market tape (synthetic returns, timing only)."""
+    path = os.path.join(tempfile.mkdtemp(), "bench_tape.fqt")
+    market_tape.write_tape(path, np.random.default_rng(0).normal(0.007, 0.045, 1200), 192601)
+    policy = policies.RuleOfThumbPolicy(fund_months=6)
+    sim = FinanceSimulation()
+    sim.selected_class, sim.selected_education, sim.selected_difficulty = 'middle', 'university', 'normal'
+    sim.market_tape = market_tape.open_tape(path)
+    seeds = iter(range(10**9))
+
+    def one_game():
+        sim.start_game(next(seeds))
+        policies.play_policy(sim, policy)
+
+    ms = _timeit(one_game, repeat)
+    print(f"market_tape: one bot game      {ms:8.3f} ms  ({1000 / ms:,.0f} games/s per core)")
+
+
+def bench_vector_env(repeat=200, num_envs=4096):
+    """One VectorEnv step over `num_envs` games with random actions."""
+    env = finance_env.VectorEnv(num_envs, seed=0)
+    env.reset()
+    actions = iter(np.random.default_rng(0).integers(len(finance_env.ENV_ACTIONS), size=(repeat + 10, num_envs)))
+
+    ms = _timeit(lambda: env.step(next(actions)), repeat)
+    print(f"vector_env: {num_envs} games step  {ms:8.3f} ms  ({num_envs * 1000 / ms:,.0f} steps/s per core)")
+
+
+def bench_long_game(months=5000, sample=20):
+    """Month-advance and frame latency across a 5000-month game: both should stay flat."""
+    game = FinanceGame()
+    game.whatif.enabled = False     # rollouts run in other processes; keep the game thread's share only
+    game.selected_class, game.selected_education, game.selected_difficulty = 'middle', 'university', 'normal'
+    game.months_per_game = months + 2 * sample + 2     # the last checkpoint is still mid-game
+    game.start_game(1)
+    game._draw_playing([])
+
+    def advance():
+        game.money = max(game.money, 50000)     # stay solvent for the whole run
+        game.next_month()
+        if game.show_event_modal:
+            game.handle_event_close()
+        game.publish()
+        if game.need_button_update:
+            game._update_playing_buttons()
+        game.particles.clear()      # a player sees many frames per month, which retire these
+
+    for target in (1, 10, 100, 1000, months):
+        while game.current_month < target:
+            advance()
+        game.autosave.flush()       # its writer thread would otherwise compete for the CPU here
+        frame_ms = _timeit(lambda: game._draw_playing([]), sample)
+        month_ms = _timeit(advance, sample)
+        print(f"long_game: month {target:5}   advance {month_ms:7.3f} ms   frame {frame_ms:7.3f} ms")
+    start = time.perf_counter()
+    game.show_dashboard()
+    print(f"long_game: dashboard, {len(game.monthly_log)} months  {(time.perf_counter() - start) * 1000:7.1f} ms")
+    game.modal_stack.clear()
+    game.autosave.discard()
+    game.autosave.flush()
+
+
+def bench_autopilot(months=24, repeat=20):
+    """A 24-month autopilot run with a locked action (should be milliseconds, not 24 frames' worth)."""
+    game = FinanceGame()
+    game.whatif.enabled = False
+    game.selected_class, game.selected_education, game.selected_difficulty = 'middle', 'university', 'normal'
+
+    def run():
+        game.start_game(1)
+        game.lock_action('life_themePark')
+        game.autopilot(months)
+        game.modal_stack.clear()
+
+    ms = _timeit(run, repeat)
+    print(f"autopilot: {months} months  {ms:7.3f} ms/run (includes start_game)")
+    game.autosave.discard()
+    game.autosave.flush()
+
+
+def bench_loan_projection(repeat=2000):
+    """Debt-free month and interest left after a prepayment: closed form vs stepping month by month."""
+    ledger = LoanLedger()
+    ledger.open('personal', 'personal', 15000)
+    ledger.open('education', 'student', 50000)
+    ledger.open('masters', 'student', 50000)
+
+    def closed_form():
+        ledger.prepay(0.01)     # invalidates the cached schedules, as the Pay Debt action does
+        return ledger.paid_off_month(0), ledger.interest_left(0)
+
+    def stepped():
+        copy = LoanLedger.from_state(ledger.state())
+        month, paid = 0, 0.0
+        while copy.total > 0:
+            paid += copy.accrue()
+            month += 1
+        return month, paid - ledger.total
+
+    closed_ms, stepped_ms = _timeit(closed_form, repeat), _timeit(stepped, repeat // 20)
+    print(f"loan_projection: closed form {closed_ms * 1000:7.1f} us   month by month {stepped_ms * 1000:7.1f} us")
+
+
+def bench_timeline(months=2000, effects=500):
+    """Month advance with `effects` scheduled effects pending, against an empty timeline."""
+    rng = random.Random(0)
+    for pending in (0, effects):
+        sim = FinanceSimulation()
+        sim.selected_class, sim.selected_education, sim.selected_difficulty = 'middle', 'university', 'normal'
+        sim.months_per_game = months + 1
+        sim.start_game(1)
+        for i in range(pending):
+            if i % 10:
+                sim.timeline.schedule(rng.randrange(months), 'charge', args=0.0)
+            else:
+                sim.timeline.schedule(rng.randrange(12), 'charge', key=f"bench:{i}", every=12, args=0.0)
+
+        def advance():
+            sim.money = max(sim.money, 50000)
+            sim.next_month()
+            if sim.show_event_modal:
+                sim.handle_event_close()
+
+        ms = _timeit(advance, months - 10)
+        print(f"timeline: {pending:4} effects pending   advance {ms * 1000:7.1f} us/month")
+
+
+def bench_achievements(months=500, extra_rules=500):
+    """Month-end rule checks with `extra_rules` synthetic rules added, incremental vs testing every rule."""
+    fields = ('money', 'investments', 'emergency_fund', 'happiness', 'stress', 'has_vehicle', 'rent', 'num_risky')
+    extra = tuple(Achievement(f'bench_{i}', f"Bench {i}", "", (fields[i % len(fields)],),
+                              lambda s, f=fields[i % len(fields)], t=i * 1e9: getattr(s, f) > t)
+                  for i in range(extra_rules))
+    for catalog in (ACHIEVEMENTS, ACHIEVEMENTS + extra):
+        rules = [rule for rule in catalog if not rule.at_end]
+        for label, incremental in (("incremental", True), ("every rule ", False)):
+            sim = FinanceSimulation()
+            sim.selected_class, sim.selected_education, sim.selected_difficulty = 'middle', 'university', 'normal'
+            sim.months_per_game = months + 1
+            sim.start_game(1)
+            sim.achievements = AchievementEngine(catalog)
+            spent = [0.0]
+
+            def check_goals(check=sim.check_goals if incremental else (lambda: [rule.test(sim) for rule in rules])):
+                start = time.perf_counter()
+                check()
+                spent[0] += time.perf_counter() - start
+
+            sim.check_goals = check_goals
+            for _ in range(months):
+                sim.money = max(sim.money, 50000)
+                sim.next_month()
+                if sim.show_event_modal:
+                    sim.handle_event_close()
+            print(f"achievements: {len(catalog):4} rules  {label}  {spent[0] / months * 1e6:7.1f} us/month")
+
+def bench_state_store(repeat=20000):
+    """Derived values read back from the memo vs recomputed, and the cost of a tracked write."""
+    sim = FinanceSimulation()
+    sim.selected_class, sim.selected_education, sim.selected_difficulty = 'middle', 'university', 'normal'
+    sim.start_game(1)
+    derived = [getattr(FinanceSimulation, name) for name in ('net_worth', 'score', 'legal_moves')]
+
+    def memoized():
+        sim.net_worth; sim.score; sim.legal_moves
+
+    def recomputed():
+        for value in derived:
+            value.fget(sim)
+
+    for label, fn in (("memoized  ", memoized), ("recomputed", recomputed)):
+        print(f"state_store: net worth + score + legal moves, {label} {_timeit(fn, repeat) * 1e3:6.2f} us")
+
+    class Plain:
+        money = 0.0
+    plain = Plain()
+
+    def plain_write():
+        plain.money = 1.0
+
+    def tracked_write():
+        sim.money = 1.0
+
+    for label, fn in (("plain  ", plain_write), ("tracked", tracked_write)):
+        print(f"state_store: {label} attribute write {_timeit(fn, repeat) * 1e6:6.0f} ns")
+
+
+def bench_leaderboard(entries=100_000, repeat=200):
+    """A leaderboard holding `entries` games: opening it, recording one more, reading a board.
+
+    The million-game figures take about a minute and 240 MB of scratch space:
+        python -c "import benchmarks; benchmarks.bench_leaderboard(1_000_000)"
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        _bench_leaderboard(os.path.join(scratch, "bench.fql"), entries, repeat)
+
+
+def _bench_leaderboard(path, entries, repeat):
+    rng = random.Random(0)
+    setups = [(c, e, d) for c in ('lower', 'middle', 'upper') for e in ('high_school', 'university', 'masters')
+              for d in ('easy', 'normal', 'hard')]
+
+    def entry(i):
+        c, e, d = rng.choice(setups)
+        return {'score': rng.randrange(200_000), 'player': None, 'class': c, 'education': e, 'difficulty': d,
+                'months': 24, 'month': 24, 'goals': 2, 'achievements': 5, 'seed': i,
+                'played_at': '2026-01-01 12:00', 'replay': None}
+
+    board = Leaderboard(path)
+    for start in range(0, entries, 100_000):
+        board.add_many([entry(i) for i in range(start, min(start + 100_000, entries))])
+    print(f"leaderboard: {entries:,} games, log {os.path.getsize(path) / 1e6:,.0f} MB")
+
+    start = time.perf_counter()
+    board = Leaderboard(path)
+    print(f"leaderboard: open from checkpoint {(time.perf_counter() - start) * 1000:8.3f} ms")
+    os.remove(os.path.splitext(path)[0] + '.fqi')
+    start = time.perf_counter()
+    Leaderboard(path)._save_checkpoint()
+    print(f"leaderboard: rebuild from log     {(time.perf_counter() - start) * 1000:8.3f} ms")
+
+    seeds = iter(range(entries, 10**9))
+    ms = _timeit(lambda: board.add(entry(next(seeds))), repeat)
+    print(f"leaderboard: record a game        {ms:8.3f} ms  (fsync + checkpoint)")
+    ms = _timeit(lambda: board.top(10, 'middle', None, 'hard'), repeat * 100)
+    print(f"leaderboard: top 10 read          {ms * 1000:8.3f} us")
+
+
+BENCHMARKS = {
+    'action_click': bench_action_click,
+    'scroll': bench_scroll,
+    'chatbot_modal': bench_chatbot_modal,
+    'avatar_creator': bench_avatar_creator,
+    'replay': bench_replay,
+    'solver': bench_solver,
+    'policy_game': bench_policy_game,
+    'market_tape': bench_market_tape,
+    'vector_env': bench_vector_env,
+    'long_game': bench_long_game,
+    'autopilot': bench_autopilot,
+    'loan_projection': bench_loan_projection,
+    'timeline': bench_timeline,
+    'achievements': bench_achievements,
+    'state_store': bench_state_store,
+    'leaderboard': bench_leaderboard,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+    pygame.quit()
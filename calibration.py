@@ -0,0 +1,287 @@
+"""
+Difficulty calibration for FinanceQuest.
+
+Plays large batches of games with reference bots (policies.py) under candidate
+difficulty parameters (emergency_chance, market_volatility) and searches, for
+each difficulty, the parameters whose outcome rates come closest to the
+targets in TARGETS:
+
+    win     the game is survived to month 24 (not bankrupt)
+    goals   at least GOAL_WIN_COUNT of the four goals are completed
+
+'rule' is a sensible rule-of-thumb player, 'random' a novice. Games cycle
+through every class / education pair with fixed seeds, so all candidates are
+compared on the same scenarios. The search evaluates a grid, then repeatedly
+zooms in around the best point. A small penalty for moving away from the
+current values keeps a parameter in place when the rates do not depend on it
+(market volatility barely affects survival for players who mostly save).
+
+Results are cached per (policy, parameter vector, chunk of seeds) in
+calibration_cache.pkl, so a repeated or refined search (or one with more
+games) only plays what it has not seen. The cache is dropped when the other
+balance tables change.
+
+    python calibration.py                                  all difficulties
+    python calibration.py --difficulty hard -n 5400
+    python calibration.py --target normal rule.win=0.85 --target normal random.win=0.6
+    python calibration.py -o proposed.json
+
+The output is a table of current and proposed parameters with the rates
+reached and their 95% Wilson confidence intervals.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+
+from finance_sim import (FinanceSimulation, DifficultyConfig, CLASS_CONFIGS, EDUCATION_CONFIGS, DIFFICULTY_CONFIGS,
+                         LIFE_CHOICES, EMERGENCY_EVENTS, DROPDOWN_AMOUNTS, MONTHS_PER_GAME, ACTIONS_PER_MONTH,
+                         RULES_VERSION)
+import policies
+
+CACHE_FILE = "calibration_cache.pkl"
+CHUNK_SIZE = 90                 # a multiple of the 9 class / education pairs
+DEFAULT_GAMES = 1800
+GRID = 5
+ROUNDS = 3
+GOAL_WIN_COUNT = 3
+STAY_PENALTY = 0.01             # per squared full-range move away from the current value
+BOUNDS = {'emergency_chance': (0.0, 0.4), 'market_volatility': (0.0, 3.0)}
+
+REFERENCE_POLICIES = {
+    'rule': lambda: policies.RuleOfThumbPolicy(fund_months=6),
+    'random': policies.RandomPolicy,
+}
+# (policy, metric) -> target rate, per difficulty
+TARGETS = {
+    'easy':   {('rule', 'win'): 0.97, ('rule', 'goals'): 0.35, ('random', 'win'): 0.85},
+    'normal': {('rule', 'win'): 0.90, ('rule', 'goals'): 0.25, ('random', 'win'): 0.75},
+    'hard':   {('rule', 'win'): 0.75, ('rule', 'goals'): 0.15, ('random', 'win'): 0.55},
+}
+_PAIRS = [(c, e) for c in CLASS_CONFIGS for e in EDUCATION_CONFIGS]
+
+
+def rules_fingerprint():
+    """Everything except the difficulty table that decides a game's outcome, rules version included."""
+    parts = (RULES_VERSION, CLASS_CONFIGS, EDUCATION_CONFIGS, LIFE_CHOICES, EMERGENCY_EVENTS, DROPDOWN_AMOUNTS,
+             MONTHS_PER_GAME, ACTIONS_PER_MONTH, GOAL_WIN_COUNT, CHUNK_SIZE, sorted(REFERENCE_POLICIES))
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def wilson(hits, n, z=1.96):
+    """95% Wilson score interval for a binomial rate."""
+    if n == 0:
+        return 0.0, 1.0
+    p = hits / n
+    centre = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+# ============================================================
+# SIMULATION
+# ============================================================
+
+def play_chunk(policy_name, params, start):
+    """Play games [start, start + CHUNK_SIZE) under `params`; returns {'games', 'win', 'goals'} counts."""
+    emergency_chance, market_volatility = params
+    sim = FinanceSimulation()
+    sim.difficulty_configs = {'calibration': DifficultyConfig("Calibration", emergency_chance, market_volatility, "")}
+    policy = REFERENCE_POLICIES[policy_name]()
+    counts = {'games': 0, 'win': 0, 'goals': 0}
+    for i in range(start, start + CHUNK_SIZE):
+        sim.selected_class, sim.selected_education = _PAIRS[i % len(_PAIRS)]
+        sim.selected_difficulty = 'calibration'
+        sim.start_game(i)
+        policies.play_policy(sim, policy)
+        counts['games'] += 1
+        counts['win'] += sim.current_month >= sim.months_per_game
+        counts['goals'] += sum(g['completed'] for g in sim.goals.values()) >= GOAL_WIN_COUNT
+    return counts
+
+
+class Calibrator:
+    """Outcome rates per parameter vector, played on a process pool and cached on disk."""
+
+    def __init__(self, games=DEFAULT_GAMES, workers=None, force=False):
+        self.chunks = range(0, max(CHUNK_SIZE, games), CHUNK_SIZE)
+        self.workers = workers or os.cpu_count()
+        self.cache = {} if force else self._load()
+        self.played = 0
+
+    def _load(self):
+        try:
+            data = joblib.load(CACHE_FILE)
+            fingerprint, chunks = data.get('fingerprint'), data['chunks']
+        except Exception:       # missing, truncated, or pickled by code that has since changed: start afresh
+            return {}
+        return chunks if fingerprint == rules_fingerprint() else {}
+
+    def save(self):
+        tmp = CACHE_FILE + ".tmp"
+        joblib.dump({'fingerprint': rules_fingerprint(), 'chunks': self.cache}, tmp, compress=3)
+        os.replace(tmp, CACHE_FILE)
+
+    def measure(self, points, policy_names):
+        """Play whatever is missing for `points` x `policy_names`."""
+        todo = [(name, p, start) for p in points for name in policy_names for start in self.chunks
+                if (name, p, start) not in self.cache]
+        if not todo:
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [(job, pool.submit(play_chunk, *job)) for job in todo]
+            for job, future in futures:
+                self.cache[job] = future.result()
+        self.played += len(todo) * CHUNK_SIZE
+        self.save()
+
+    def rates(self, point, policy_name):
+        """{'win': (rate, low, high), 'goals': (...)} over this search's games."""
+        counts = [self.cache[(policy_name, point, start)] for start in self.chunks]
+        n = sum(c['games'] for c in counts)
+        out = {}
+        for metric in ('win', 'goals'):
+            hits = sum(c[metric] for c in counts)
+            out[metric] = (hits / n, *wilson(hits, n))
+        return out
+
+
+# ============================================================
+# SEARCH
+# ============================================================
+
+def _point(emergency_chance, market_volatility):
+    # rounded so nearby searches share cache entries
+    return round(emergency_chance, 4), round(market_volatility, 4)
+
+
+def _grid(centre, spans, size):
+    axes = []
+    for (name, (low, high)), c, span in zip(BOUNDS.items(), centre, spans):
+        lo, hi = max(low, c - span / 2), min(high, c + span / 2)
+        axes.append([lo + (hi - lo) * i / (size - 1) for i in range(size)])
+    return [_point(a, b) for a in axes[0] for b in axes[1]]
+
+
+def loss(calibrator, point, targets, current=None):
+    """
+    Sum of squared misses, each scaled by its binomial variance so every
+    target counts alike, plus the penalty for moving away from `current`.
+    """
+    total = 0.0
+    if current is not None:
+        total += STAY_PENALTY * sum(((p - c) / (high - low)) ** 2
+                                    for p, c, (low, high) in zip(point, current, BOUNDS.values()))
+    for (policy_name, metric), target in targets.items():
+        rate = calibrator.rates(point, policy_name)[metric][0]
+        total += (rate - target) ** 2 / max(target * (1 - target), 1e-3)
+    return total
+
+
+def calibrate(calibrator, difficulty, targets, grid=GRID, rounds=ROUNDS):
+    """Best parameter vector for `targets`, with the rates it reaches."""
+    policy_names = sorted({name for name, _ in targets})
+    current = DIFFICULTY_CONFIGS[difficulty]
+    centre = ((BOUNDS['emergency_chance'][0] + BOUNDS['emergency_chance'][1]) / 2,
+              (BOUNDS['market_volatility'][0] + BOUNDS['market_volatility'][1]) / 2)
+    spans = [high - low for low, high in BOUNDS.values()]
+    current_point = best = _point(current.emergency_chance, current.market_volatility)
+    calibrator.measure([best], policy_names)
+    for _ in range(rounds):
+        points = _grid(centre, spans, grid)
+        calibrator.measure(points, policy_names)
+        best = min([best] + points, key=lambda p: loss(calibrator, p, targets, current_point))
+        centre = best
+        spans = [s * 2 / (grid - 1) for s in spans]
+    return {
+        'difficulty': difficulty,
+        'current': {'emergency_chance': current.emergency_chance, 'market_volatility': current.market_volatility,
+                    'loss': loss(calibrator, current_point, targets),
+                    'rates': _rate_rows(calibrator, current_point, targets)},
+        'proposed': {'emergency_chance': best[0], 'market_volatility': best[1],
+                     'loss': loss(calibrator, best, targets),
+                     'rates': _rate_rows(calibrator, best, targets)},
+        'games': len(calibrator.chunks) * CHUNK_SIZE,
+    }
+
+
+def _rate_rows(calibrator, point, targets):
+    rows = []
+    for (policy_name, metric), target in sorted(targets.items()):
+        rate, low, high = calibrator.rates(point, policy_name)[metric]
+        rows.append({'policy': policy_name, 'metric': metric, 'target': target,
+                     'rate': rate, 'ci95': [low, high]})
+    return rows
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+def _parse_targets(specs):
+    targets = {d: dict(t) for d, t in TARGETS.items()}
+    for difficulty, *assignments in specs or []:
+        if difficulty not in targets:
+            raise SystemExit(f"Unknown difficulty: {difficulty}")
+        for assignment in assignments:
+            try:
+                key, value = assignment.split('=')
+                policy_name, metric = key.split('.')
+                value = float(value)
+            except ValueError:
+                raise SystemExit(f"Bad target {assignment!r}: expected policy.metric=rate")
+            if policy_name not in REFERENCE_POLICIES or metric not in ('win', 'goals'):
+                raise SystemExit(f"Bad target {assignment!r}: policies {sorted(REFERENCE_POLICIES)}, metrics win/goals")
+            targets[difficulty][(policy_name, metric)] = value
+    return targets
+
+
+def print_table(results):
+    print(f"{'difficulty':10} {'':9} {'emergency':>9} {'volatility':>10} {'loss':>6}  rates (target) [95% CI]")
+    for r in results:
+        for label in ('current', 'proposed'):
+            c = r[label]
+            rates = "  ".join(f"{row['policy']}.{row['metric']} {row['rate']:.1%} ({row['target']:.0%}) "
+                              f"[{row['ci95'][0]:.1%}-{row['ci95'][1]:.1%}]" for row in c['rates'])
+            print(f"{r['difficulty'] if label == 'current' else '':10} {label:9} {c['emergency_chance']:9.3f} "
+                  f"{c['market_volatility']:10.3f} {c['loss']:6.3f}  {rates}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search difficulty parameters that hit target win / goal rates.")
+    parser.add_argument('--difficulty', choices=list(DIFFICULTY_CONFIGS), action='append',
+                        help="difficulty to calibrate (repeatable; default: all)")
+    parser.add_argument('-n', '--games', type=int, default=DEFAULT_GAMES, help="games per policy and parameter vector")
+    parser.add_argument('--target', nargs='+', action='append', metavar='ARG',
+                        help="DIFFICULTY policy.metric=rate ... (e.g. hard rule.win=0.7)")
+    parser.add_argument('--grid', type=int, default=GRID, help="grid points per parameter and round")
+    parser.add_argument('--rounds', type=int, default=ROUNDS, help="zoom-in rounds")
+    parser.add_argument('-j', '--workers', type=int, help="worker processes (default: all cores)")
+    parser.add_argument('--force', action='store_true', help="ignore the cache")
+    parser.add_argument('-o', '--out', help="write the proposed config table as JSON")
+    args = parser.parse_args(argv)
+
+    targets = _parse_targets(args.target)
+    calibrator = Calibrator(args.games, args.workers, args.force)
+    start = time.perf_counter()
+    results = []
+    for difficulty in args.difficulty or list(DIFFICULTY_CONFIGS):
+        results.append(calibrate(calibrator, difficulty, targets[difficulty], max(2, args.grid), args.rounds))
+        print(f"  {difficulty} done ({calibrator.played:,} games played so far)", file=sys.stderr)
+    print_table(results)
+    print(f"{calibrator.played:,} new games in {time.perf_counter() - start:.1f}s (cache: {CACHE_FILE})")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
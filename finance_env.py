@@ -0,0 +1,420 @@
+"""
+Reinforcement-learning environments for FinanceQuest.
+
+FinanceQuestEnv wraps FinanceSimulation (the exact game rules) behind the
+Gymnasium API; VectorEnv steps thousands of games at once with the same rules
+re-expressed over NumPy arrays, for fast training.
+
+Actions (Discrete, see ENV_ACTIONS): every financial dropdown preset, the life
+choices the action panel offers, therapy, rehab and 'end' (advance to the next
+month). Illegal actions end the month, so every episode terminates;
+action_masks() tells an agent which actions are legal. Observations are the
+advisor's game context (OBS_FIELDS, as float32). The reward is the change in
+calculate_score(), so an episode's return is its final score minus its
+starting score. Pending events are acknowledged automatically.
+
+VectorEnv follows the same rules but draws its randomness from NumPy, so its
+games are not replay-compatible with FinanceSimulation; finished games are
+reset in the same step and their final score is reported in info. Holdings
+are a (num_envs, assets) array and each month's correlated returns for every
+game come from one portfolio.monthly_returns call. Investing buys the default
+asset, as in a game where the player never picks another. Loans are a
+(num_envs, len(loans.LOAN_SLOTS)) array of balances with their minimum
+payments; the slots are already in avalanche order, so paying debt clears
+them left to right, as the default payoff order does. FinanceSimulation's
+timeline of scheduled effects becomes one due-month array per effect.
+
+    env = FinanceQuestEnv('middle', 'university', 'normal')
+    obs, info = env.reset(seed=1)
+    obs, reward, terminated, truncated, info = env.step(env.action_space.sample())
+
+    venv = VectorEnv(4096, 'middle', 'university', 'normal', seed=1)
+    obs, info = venv.reset()
+    obs, rewards, terminated, truncated, info = venv.step(actions)   # actions: int array (num_envs,)
+
+Gymnasium is optional: without it the environments work the same, with
+minimal stand-ins for the action and observation spaces.
+"""
+import numpy as np
+
+from finance_sim import (FinanceSimulation, CLASS_CONFIGS, EDUCATION_CONFIGS, DIFFICULTY_CONFIGS, LIFE_CHOICES,
+                         EMERGENCY_EVENTS, FINANCIAL_ACTIONS, DROPDOWN_AMOUNTS, LEISURE_HAPPINESS_CAP,
+                         MONTHS_PER_GAME, ACTIONS_PER_MONTH, STARTING_HAPPINESS, BURNOUT_STRESS, BURNOUT_HAPPINESS,
+                         DEBUFF_MONTHS, VEHICLE_UPKEEP)
+import loans
+import portfolio
+
+try:
+    import gymnasium as gym
+    from gymnasium import spaces
+except ImportError:
+    gym = None
+
+ENV_ACTIONS = (tuple(f"{t}:{a}" for t in FINANCIAL_ACTIONS for a in DROPDOWN_AMOUNTS[t])
+               + tuple(f"life_{k}" for k, c in LIFE_CHOICES.items() if c.choice_type != 'risky')
+               + ('health_therapy', 'health_rehab', 'end'))
+END_ACTION = ENV_ACTIONS.index('end')
+OBS_FIELDS = ('month', 'money', 'debt', 'investments', 'emergency_fund', 'happiness', 'stress', 'actions_remaining')
+
+
+class _Discrete:
+    """Stand-in for gymnasium.spaces.Discrete."""
+
+    def __init__(self, n):
+        self.n = n
+        self._rng = np.random.default_rng()
+
+    def sample(self):
+        return int(self._rng.integers(self.n))
+
+
+class _Box:
+    """Stand-in for gymnasium.spaces.Box."""
+
+    def __init__(self, low, high, shape, dtype):
+        self.low, self.high, self.shape, self.dtype = low, high, shape, dtype
+
+
+def _spaces():
+    if gym is not None:
+        return spaces.Discrete(len(ENV_ACTIONS)), spaces.Box(-np.inf, np.inf, (len(OBS_FIELDS),), np.float32)
+    return _Discrete(len(ENV_ACTIONS)), _Box(-np.inf, np.inf, (len(OBS_FIELDS),), np.float32)
+
+
+# ============================================================
+# SINGLE GAME (exact rules)
+# ============================================================
+
+class FinanceQuestEnv(gym.Env if gym is not None else object):
+    metadata = {'render_modes': []}
+
+    def __init__(self, player_class='middle', education='university', difficulty='normal',
+                 months_per_game=MONTHS_PER_GAME):
+        self.setup = (player_class, education, difficulty)
+        self.months_per_game = months_per_game
+        self.action_space, self.observation_space = _spaces()
+        self.sim = FinanceSimulation()
+        self._rng = np.random.default_rng()
+        self._score = 0
+
+    def _obs(self):
+        context = self.sim.observe().context()
+        return np.array([context[f] for f in OBS_FIELDS], dtype=np.float32)
+
+    def _acknowledge(self):
+        if self.sim.show_event_modal:
+            self.sim.handle_event_close()
+
+    def action_masks(self):
+        legal = set(self.sim.legal_actions())
+        return np.array([a in legal for a in ENV_ACTIONS])
+
+    def reset(self, seed=None, options=None):
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+        sim = self.sim
+        sim.selected_class, sim.selected_education, sim.selected_difficulty = self.setup
+        sim.months_per_game = self.months_per_game
+        sim.start_game(int(self._rng.integers(2 ** 32)))
+        self._score = sim.calculate_score()
+        return self._obs(), {'action_mask': self.action_masks()}
+
+    def step(self, action):
+        sim = self.sim
+        self._acknowledge()
+        move = ENV_ACTIONS[int(action)]
+        sim.apply_action(move if move in sim.legal_actions() else 'end')
+        if not sim.finished:
+            self._acknowledge()
+        score = sim.calculate_score()
+        reward, self._score = score - self._score, score
+        info = {'action_mask': self.action_masks()}
+        if sim.finished:
+            info['final_score'] = score
+        return self._obs(), float(reward), sim.finished, False, info
+
+
+# ============================================================
+# VECTORIZED (NumPy)
+# ============================================================
+
+def _action_tables():
+    """Per-action requirement and effect columns, indexed by ENV_ACTIONS position."""
+    n = len(ENV_ACTIONS)
+    t = {name: np.zeros(n) for name in ('cost', 'to_inv', 'to_ef', 'prepay', 'happy', 'stress', 'income')}
+    t.update((name, np.full(n, -np.inf)) for name in ('min_money', 'min_ef', 'min_debt'))
+    flags = {name: np.zeros(n, dtype=bool) for name in (
+        'leisure', 'vehicle', 'university', 'masters', 'therapy', 'rehab', 'end')}
+    for i, move in enumerate(ENV_ACTIONS):
+        if move == 'end':
+            flags['end'][i] = True
+        elif ':' in move:
+            kind, amount = move.split(':')
+            amount = float(amount)
+            if kind == 'invest':
+                t['cost'][i], t['to_inv'][i], t['min_money'][i] = amount, amount, amount
+            elif kind == 'save':
+                t['cost'][i], t['to_ef'][i], t['min_money'][i] = amount, amount, amount
+            elif kind == 'withdraw':
+                t['cost'][i], t['to_ef'][i], t['min_ef'][i] = -amount, -amount, amount
+            elif kind == 'pay_debt':
+                t['cost'][i], t['prepay'][i], t['stress'][i] = amount, amount, -5
+                t['min_money'][i], t['min_debt'][i] = amount, amount
+        elif move == 'health_therapy':
+            t['cost'][i] = t['min_money'][i] = 800
+            t['happy'][i], t['stress'][i] = 15, -20
+            flags['therapy'][i] = True
+        elif move == 'health_rehab':
+            t['cost'][i] = t['min_money'][i] = 1500
+            flags['rehab'][i] = True
+        else:
+            key = move[len('life_'):]
+            choice = LIFE_CHOICES[key]
+            t['min_money'][i] = choice.cost
+            if choice.choice_type == 'education':
+                # the degree is paid for with a loan (opened in _apply_actions): cash is unchanged
+                t['income'][i], t['happy'][i], t['stress'][i] = (1500, 10, 15) if key == 'university' else (1000, 15, 20)
+                flags[key][i] = True
+            else:
+                t['cost'][i], t['happy'][i], t['stress'][i] = choice.cost, choice.happiness, choice.stress
+                flags['leisure'][i] = choice.choice_type == 'leisure'
+                flags['vehicle'][i] = key == 'vehicle'
+    return t, flags
+
+
+_TABLES, _FLAGS = _action_tables()
+_EVENTS = {name: np.array([getattr(e, name) for e in EMERGENCY_EVENTS], dtype=float)
+           for name in ('cost', 'months_no_income', 'investment_loss', 'stress_increase')}
+_GOAL_BONUS = 5000
+_DEFAULT_ASSET = portfolio.ASSET_INDEX[portfolio.DEFAULT_ASSET]
+_SLOT = {slot: i for i, (slot, _) in enumerate(loans.LOAN_SLOTS)}
+_LOAN_RATES = np.array([loans.LOAN_TYPES[kind].annual_rate / 12 for _, kind in loans.LOAN_SLOTS])
+_LOAN_TERMS = np.array([loans.LOAN_TYPES[kind].term_months for _, kind in loans.LOAN_SLOTS])
+_ONES = np.ones(len(loans.LOAN_SLOTS))
+
+
+class VectorEnv:
+    """`num_envs` FinanceQuest games of one setup stepped together as NumPy arrays."""
+
+    def __init__(self, num_envs, player_class='middle', education='university', difficulty='normal', seed=None,
+                 months_per_game=MONTHS_PER_GAME):
+        self.num_envs = num_envs
+        self.setup = (player_class, education, difficulty)
+        self.months_per_game = months_per_game
+        self.single_action_space, self.single_observation_space = _spaces()
+        self.rng = np.random.default_rng(seed)
+        cc, ec, dc = CLASS_CONFIGS[player_class], EDUCATION_CONFIGS[education], DIFFICULTY_CONFIGS[difficulty]
+        start_loans = np.zeros(len(loans.LOAN_SLOTS))
+        start_loans[_SLOT['personal']], start_loans[_SLOT['education']] = cc.debt, ec.cost
+        self._start = {'money': cc.starting_money, 'loans': start_loans, 'income': ec.income,
+                       'payments': loans.amortized_payment(start_loans, _LOAN_RATES, _LOAN_TERMS),
+                       'university': education in ('university', 'masters'), 'masters': education == 'masters'}
+        self._expenses = cc.rent + cc.groceries + cc.transport
+        self._emergency_chance = dc.emergency_chance
+        self._volatility = dc.market_volatility
+        n = num_envs
+        self.money, self.emergency_fund = np.zeros(n), np.zeros(n)
+        self.holdings = portfolio.empty_holdings(n)
+        self.loan_balances = np.zeros((n, len(loans.LOAN_SLOTS)))
+        self.loan_payments = np.zeros((n, len(loans.LOAN_SLOTS)))
+        self.happiness, self.stress, self.income = (np.zeros(n) for _ in range(3))
+        self.month, self.actions_remaining, self.months_no_income = (np.zeros(n, dtype=np.int64) for _ in range(3))
+        self.distracted_until, self.unhappy_until = np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64)
+        (self.has_vehicle, self.has_university, self.has_masters,
+         self.addict, self.unhappy, self.distracted) = (np.zeros(n, dtype=bool) for _ in range(6))
+        self.goals = np.zeros((n, 4), dtype=bool)     # net worth, emergency fund, debt-free, happiness
+        self.event = np.full(n, -1, dtype=np.int64)   # pending event: EMERGENCY_EVENTS index, -2 burnout, -1 none
+        self.score = np.zeros(n)
+
+    @property
+    def investments(self):
+        return portfolio.totals(self.holdings)
+
+    @property
+    def debt(self):
+        return self.loan_balances @ _ONES
+
+    # ---------- helpers ----------
+    def _reset_where(self, mask):
+        s = self._start
+        self.money[mask] = s['money']
+        self.loan_balances[mask] = s['loans']
+        self.loan_payments[mask] = s['payments']
+        self.income[mask] = s['income']
+        self.holdings[mask] = 0
+        self.emergency_fund[mask] = 0
+        self.happiness[mask] = STARTING_HAPPINESS
+        self.stress[mask] = 0
+        self.month[mask] = 0
+        self.actions_remaining[mask] = ACTIONS_PER_MONTH
+        self.months_no_income[mask] = 0
+        self.has_vehicle[mask] = False
+        self.has_university[mask] = s['university']
+        self.has_masters[mask] = s['masters']
+        self.addict[mask] = self.unhappy[mask] = self.distracted[mask] = False
+        self.goals[mask] = False
+        self.event[mask] = -1
+
+    def _calculate_score(self):
+        nw = self.money + self.investments + self.emergency_fund - self.debt
+        raw = nw + self.goals.sum(axis=1) * _GOAL_BONUS + self.happiness * 100 + self.month * 500
+        return np.maximum(0, np.trunc(raw))
+
+    def _observe(self):
+        return np.stack([self.month, self.money, self.debt, self.investments, self.emergency_fund,
+                         self.happiness, self.stress, self.actions_remaining], axis=1).astype(np.float32)
+
+    def _acknowledge_events(self, mask):
+        pending = mask & (self.event != -1)
+        if not pending.any():
+            return
+        idx = np.where(self.event >= 0, self.event, 0)
+        burnout = self.event == -2
+        cost = np.where(burnout, 2000, _EVENTS['cost'][idx]) * pending
+        no_income = np.where(burnout, 2, _EVENTS['months_no_income'][idx]) * pending
+        stress = np.where(burnout, 0, _EVENTS['stress_increase'][idx]) * pending
+        loss = np.where(burnout, 0, _EVENTS['investment_loss'][idx]) * pending
+        self.money -= cost
+        self.stress = np.where(stress > 0, np.minimum(100, self.stress + stress), self.stress)
+        self.months_no_income = np.maximum(no_income, self.months_no_income).astype(np.int64)
+        portfolio.crash(self.holdings, loss)
+        self.event[pending] = -1
+
+    def _legal(self, a, s=slice(None)):
+        """Whether action(s) `a` are legal; a per-game index array, or with s=np.newaxis every action at once."""
+        t, f = _TABLES, _FLAGS
+        legal = ((self.actions_remaining > 0)[s] & ~f['end'][a]
+                 & (self.money[s] >= t['min_money'][a]) & (self.emergency_fund[s] >= t['min_ef'][a])
+                 & (self.debt[s] >= t['min_debt'][a]))
+        legal &= ~f['leisure'][a] | (self.happiness < LEISURE_HAPPINESS_CAP)[s]
+        legal &= ~f['vehicle'][a] | ~self.has_vehicle[s]
+        legal &= ~f['university'][a] | ~self.has_university[s]
+        legal &= ~f['masters'][a] | (self.has_university & ~self.has_masters)[s]
+        legal &= ~f['therapy'][a] | (self.unhappy | self.distracted)[s]
+        legal &= ~f['rehab'][a] | self.addict[s]
+        return legal
+
+    def action_masks(self):
+        """(num_envs, len(ENV_ACTIONS)) bool array of legal actions; 'end' is always legal."""
+        masks = self._legal(slice(None), (slice(None), np.newaxis))
+        masks[:, END_ACTION] = True
+        return masks
+
+    def _apply_actions(self, a, act):
+        t, f = _TABLES, _FLAGS
+        self.money -= t['cost'][a] * act
+        self.holdings[:, _DEFAULT_ASSET] += t['to_inv'][a] * act
+        self.emergency_fund += t['to_ef'][a] * act
+        self._prepay(t['prepay'][a] * act)
+        for slot in ('university', 'masters'):
+            opened = f[slot][a] & act
+            if opened.any():
+                cost = LIFE_CHOICES[slot].cost
+                self.loan_balances[opened, _SLOT[slot]] = cost
+                self.loan_payments[opened, _SLOT[slot]] = loans.amortized_payment(
+                    cost, _LOAN_RATES[_SLOT[slot]], _LOAN_TERMS[_SLOT[slot]])
+        self.income += t['income'][a] * act
+        dh, ds = t['happy'][a] * act, t['stress'][a] * act
+        self.happiness = np.minimum(100, self.happiness + dh)
+        self.stress = np.where(ds > 0, np.minimum(100, self.stress + ds), np.maximum(0, self.stress + ds))
+        self.has_vehicle |= f['vehicle'][a] & act
+        self.has_university |= f['university'][a] & act
+        self.has_masters |= f['masters'][a] & act
+        therapy = f['therapy'][a] & act
+        self.unhappy &= ~therapy
+        self.distracted &= ~therapy
+        rehab = f['rehab'][a] & act
+        if rehab.any():
+            cured = rehab & (self.rng.random(self.num_envs) < self.happiness / 100)
+            self.addict &= ~cured
+            self.happiness = np.where(cured, np.minimum(100, self.happiness + 10), self.happiness)
+        self.actions_remaining -= act
+
+    def _prepay(self, amount):
+        # each game's payment fills its loans left to right (avalanche order)
+        payers = np.flatnonzero(amount)
+        balances = self.loan_balances[payers]
+        before = np.cumsum(balances, axis=1) - balances
+        self.loan_balances[payers] = balances - np.minimum(np.maximum(amount[payers, None] - before, 0), balances)
+
+    def _next_month(self, e):
+        """FinanceSimulation.next_month for the games in mask `e`; returns the games that ended."""
+        done = e & (self.month >= self.months_per_game)
+        e = e & ~done
+        u = self.rng.random((6, self.num_envs))
+        # scheduled effects: debuffs wearing off, vehicle upkeep
+        self.distracted &= ~(e & (self.month >= self.distracted_until))
+        self.unhappy &= ~(e & (self.month >= self.unhappy_until))
+        self.money -= VEHICLE_UPKEEP * (e & self.has_vehicle)
+        # income
+        paid = e & (self.months_no_income == 0)
+        fired = paid & self.distracted & (u[0] < 0.1)
+        self.money += np.where(paid, self.income * np.where(self.distracted, 0.8, 1.0), 0)
+        self.stress += fired * 30
+        self.months_no_income = np.where(fired, 2, np.where(e & ~paid, self.months_no_income - 1, self.months_no_income))
+        # expenses, then interest and minimum payments for the games still owing
+        self.money -= self._expenses * e
+        owing = np.flatnonzero(e & (self.debt > 0))
+        owed = self.loan_balances[owing] * (1 + _LOAN_RATES)
+        payment = np.minimum(self.loan_payments[owing], owed)
+        owed -= payment
+        dust = owed < loans._DUST
+        payment[dust] += owed[dust]
+        owed[dust] = 0.0
+        self.loan_balances[owing] = owed
+        self.money[owing] -= payment @ _ONES
+        debt = self.debt
+        invested = np.flatnonzero(e & (self.investments > 0))     # only these games need a draw
+        z = self.rng.standard_normal((len(invested), len(portfolio.ASSETS)))
+        self.holdings[invested] *= 1 + portfolio.monthly_returns(z, self._volatility)
+        self.emergency_fund = np.where(e & (self.emergency_fund > 0), self.emergency_fund * 1.00167, self.emergency_fund)
+        # wellbeing
+        stress = np.maximum(0, self.stress - 2)
+        dti = np.where(self.income > 0, debt / np.maximum(self.income * 12, 1e-9), 0)
+        stress += (dti > 0.5) * 5 + (self.emergency_fund < self.income * 3) * 2
+        happiness = np.maximum(0, self.happiness - 3)
+        burnout = e & ((stress >= BURNOUT_STRESS) | (happiness <= BURNOUT_HAPPINESS))
+        self.event = np.where(burnout, -2, self.event)
+        stress = np.where(burnout, 50, stress)
+        self.unhappy |= burnout
+        self.unhappy_until = np.where(burnout, self.month + 1 + DEBUFF_MONTHS['unhappy'], self.unhappy_until)
+        self.stress = np.where(e, np.minimum(100, stress), self.stress)
+        self.happiness = np.where(e, np.minimum(100, happiness), self.happiness)
+        # random events and debuffs
+        emergency = e & (u[2] < self._emergency_chance)
+        self.event = np.where(emergency, (u[3] * len(EMERGENCY_EVENTS)).astype(np.int64), self.event)
+        distracted = e & ~self.distracted & (u[4] < 0.5 - self.happiness / 100 * 0.4)
+        self.distracted |= distracted
+        self.distracted_until = np.where(distracted, self.month + 1 + DEBUFF_MONTHS['distracted'], self.distracted_until)
+        self.stress += distracted * 10
+        # month rollover and goals
+        self.month += e
+        self.actions_remaining = np.where(e, ACTIONS_PER_MONTH, self.actions_remaining)
+        nw = self.money + self.investments + self.emergency_fund - debt
+        self.goals |= (e[:, None] & np.stack([nw >= 50000, self.emergency_fund >= 10000, debt <= 0,
+                                              self.happiness >= 70], axis=1))
+        return done | (e & (self.money < -10000))
+
+    # ---------- Gymnasium-style API ----------
+    def reset(self, seed=None, options=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_where(np.ones(self.num_envs, dtype=bool))
+        self.score = self._calculate_score()
+        return self._observe(), {}
+
+    def step(self, actions):
+        a = np.asarray(actions, dtype=np.int64)
+        act = self._legal(a)
+        self._apply_actions(a, act)
+        terminated = self._next_month(~act)
+        self._acknowledge_events(~terminated)
+        score = self._calculate_score()
+        rewards = score - self.score
+        info = {}
+        if terminated.any():
+            info['final_score'] = np.where(terminated, score, np.nan)
+            self._reset_where(terminated)
+            score = np.where(terminated, self._calculate_score(), score)
+        self.score = score
+        return self._observe(), rewards, terminated, np.zeros(self.num_envs, dtype=bool), info
@@ -0,0 +1,994 @@
+"""
+FinanceQuest rules, without any UI.
+
+FinanceSimulation holds the whole game state and every rule that changes it.
+It never touches pygame: the GUI in rijika.py subclasses it and overrides the
+hooks (_effect, _on_achievement, _on_game_over) and subscribes to state
+changes (store.Store), while replay.py drives it headless to re-run recorded
+games. All randomness that affects the outcome goes through `self.rng`,
+seeded per game, so a seed plus the player's actions reproduces a game
+exactly.
+"""
+import base64
+import functools
+import random
+import struct
+from dataclasses import dataclass, asdict
+
+import numpy as np
+
+from achievements import AchievementEngine
+from loans import LoanLedger, DEFAULT_PAYOFF_ORDER
+from market_tape import CRASH_RETURN, open_tape
+from monthly_log import MonthlyLog
+import portfolio
+from portfolio import ASSETS, ASSET_INDEX, DEFAULT_ASSET
+from store import Store, derived, tracked
+from timeline import Timeline
+
+# Bumped by every rule change that changes how a seeded game plays out (and so what replays
+# score); cached solver policies and calibration results are keyed on it.
+#   1  correlated multi-asset returns
+#   2  loan ledger: minimum payments and interest per loan
+#   3  vehicle upkeep and debuffs that expire
+RULES_VERSION = 3
+MONTHS_PER_GAME = 24
+# Game lengths offered at setup, in months; every per-month cost is independent of the length
+GAME_LENGTHS = {'2 years': MONTHS_PER_GAME, '10 years': 120, '40 years': 480}
+STARTING_HAPPINESS = 50
+BURNOUT_STRESS = 100
+BURNOUT_HAPPINESS = 10
+ACTIONS_PER_MONTH = 3
+# Months a debuff lasts, from the month after it starts; the others last until treated
+DEBUFF_MONTHS = {'distracted': 3, 'unhappy': 6}
+VEHICLE_UPKEEP = 150        # a month, from the month the vehicle is bought
+
+
+@dataclass
+class ClassConfig:
+    name: str
+    starting_money: float
+    rent: float
+    groceries: float
+    transport: float
+    debt: float
+    description: str
+    avatar_emoji: str = "👤"
+
+
+@dataclass
+class EducationConfig:
+    name: str
+    cost: float
+    income: float
+    description: str
+
+
+@dataclass
+class DifficultyConfig:
+    name: str
+    emergency_chance: float
+    market_volatility: float
+    description: str
+
+
+@dataclass
+class LifeChoice:
+    name: str
+    cost: float
+    happiness: float
+    stress: float
+    choice_type: str
+    debuff_chance: float = 0.0
+    debuff: str = ""
+    win_chance: float = 0.0
+    win_amount: float = 0.0
+    one_time: bool = False
+
+
+@dataclass
+class EmergencyEvent:
+    name: str
+    description: str
+    cost: float = 0
+    months_no_income: int = 0
+    investment_loss: float = 0.0
+    stress_increase: float = 0
+
+
+@dataclass(frozen=True)
+class Observation:
+    """
+    Read-only view of a game for bots (see FinanceSimulation.observe). Fields
+    carry the simulation's own attribute names, so code written against a
+    FinanceSimulation's state reads an Observation unchanged.
+    """
+    selected_class: str
+    selected_education: str
+    selected_difficulty: str
+    current_month: int
+    actions_remaining: int
+    money: float
+    monthly_income: float
+    debt: float
+    investments: float
+    emergency_fund: float
+    happiness: float
+    stress: float
+    rent: float
+    groceries: float
+    transport: float
+    months_no_income: int
+    debuffs: tuple
+    has_vehicle: bool
+    has_university: bool
+    has_masters: bool
+    goals: dict
+    locked_action: str
+    pending_event: str
+    legal_actions: tuple
+
+    def context(self):
+        """The game-state summary given to the AI advisor."""
+        return {
+            'month': self.current_month,
+            'money': self.money,
+            'debt': self.debt,
+            'investments': self.investments,
+            'emergency_fund': self.emergency_fund,
+            'happiness': self.happiness,
+            'stress': self.stress,
+            'actions_remaining': self.actions_remaining
+        }
+
+
+CLASS_CONFIGS = {
+    'upper': ClassConfig("Upper Class", 50000, 2500, 800, 400, 0, "No debt - Start with financial freedom", "💼"),
+    'middle': ClassConfig("Middle Class", 15000, 1500, 500, 300, 5000, "Some starting debt - Balanced start", "👔"),
+    'lower':  ClassConfig("Lower Class", 2000, 800, 300, 150, 15000, "Significant debt - Challenging start", "🎒")
+}
+EDUCATION_CONFIGS = {
+    'polytechnic': EducationConfig("Polytechnic", 0, 3500, "Standard education - No debt"),
+    'university':  EducationConfig("University", 30000, 5000, "Higher earning potential, high debt"),
+    'masters':     EducationConfig("Masters", 50000, 6500, "Max earning potential, massive debt")
+}
+DIFFICULTY_CONFIGS = {
+    'easy':   DifficultyConfig("Easy Mode", 0.05, 0.5, "Fewer emergencies, stable markets"),
+    'normal': DifficultyConfig("Normal Mode", 0.10, 1.0, "Balanced challenge"),
+    'hard':   DifficultyConfig("Hard Mode", 0.20, 1.5, "Frequent emergencies, volatile markets")
+}
+LIFE_CHOICES = {
+    'vacation':     LifeChoice("Vacation", 2500, 15, -10, "leisure"),
+    'fineDining':   LifeChoice("Fine Dining", 500, 8, -3, "leisure"),
+    'staycation':   LifeChoice("Staycation", 800, 10, -5, "leisure"),
+    'themePark':    LifeChoice("Theme Park", 300, 12, -4, "leisure"),
+    'shopping':     LifeChoice("Shopping", 1000, 10, -5, "risky", 0.3, "addict"),
+    'gambling':     LifeChoice("Gambling", 1500, 5, 0, "risky", 0.4, "addict", 0.2, 3000),
+    'clubbing':     LifeChoice("Clubbing", 600, 8, -3, "risky", 0.25, "addict"),
+    'smoking':      LifeChoice("Smoking", 200, 2, -8, "risky", 0.5, "addict"),
+    'vehicle':      LifeChoice("Buy Vehicle", 25000, 20, 0, "utility", one_time=True),
+    'relationship': LifeChoice("Date Night", 500, 15, -5, "utility"),
+    'university':   LifeChoice("University", 30000, 0, 0, "education", one_time=True),
+    'masters':      LifeChoice("Masters", 50000, 0, 0, "education", one_time=True)
+}
+EMERGENCY_EVENTS = [
+    EmergencyEvent("Medical Emergency", "You've been diagnosed with a serious health condition requiring immediate treatment.", cost=8000, stress_increase=30),
+    EmergencyEvent("Job Loss", "Your company has downsized and you've been laid off. No income for 3 months.", months_no_income=3, stress_increase=40),
+    EmergencyEvent("Market Crash", "The stock market has crashed! Your investments have lost significant value.", investment_loss=0.4, stress_increase=25),
+    EmergencyEvent("Home Emergency", "Major repairs needed for your living space.", cost=3500, stress_increase=15),
+    EmergencyEvent("Family Emergency", "A family member needs financial assistance urgently.", cost=5000, stress_increase=20)
+]
+
+# Action ids as stored in replay files: only ever append to these.
+FINANCIAL_ACTIONS = ('invest', 'save', 'withdraw', 'pay_debt')
+# Preset amounts offered by each financial action's dropdown
+DROPDOWN_AMOUNTS = {
+    'save': (100, 500, 1000),
+    'invest': (1000, 5000, 10000),
+    'withdraw': (500, 1000, 5000),
+    'pay_debt': (1000, 5000, 10000),
+}
+# Lifestyle (leisure) actions are only offered below this happiness
+LEISURE_HAPPINESS_CAP = 80
+ACTION_IDS = tuple(f"life_{k}" for k in LIFE_CHOICES) + ('health_rehab', 'health_therapy')
+# Move strings of legal_actions(), built once
+_FINANCIAL_MOVES = tuple((t, tuple((a, f"{t}:{a}") for a in DROPDOWN_AMOUNTS[t])) for t in FINANCIAL_ACTIONS)
+_LIFE_MOVES = tuple((k, f"life_{k}") for k in LIFE_CHOICES)
+
+# Plain attributes copied as-is by FinanceSimulation.snapshot()
+SNAPSHOT_FIELDS = (
+    'selected_class', 'selected_education', 'selected_difficulty', 'seed',
+    'money', 'monthly_income', 'debt', 'investments', 'emergency_fund', 'happiness', 'stress',
+    'current_month', 'rent', 'groceries', 'transport', 'actions_taken_this_month', 'actions_remaining',
+    'months_no_income', 'has_vehicle', 'current_education_level', 'has_university', 'has_masters',
+    'game_message', 'show_event_modal',
+    'total_investments', 'total_saved', 'total_debt_paid', 'num_leisure', 'num_risky',
+    'months_per_game', 'invest_asset', 'payoff_order',
+)
+# Values for fields that autosaves written before the field existed lack
+_SNAPSHOT_DEFAULTS = {'months_per_game': MONTHS_PER_GAME, 'invest_asset': DEFAULT_ASSET,
+                      'payoff_order': DEFAULT_PAYOFF_ORDER}
+
+
+class FinanceSimulation(Store):
+    """
+    Game state and rules for one FinanceQuest run.
+
+    Set selected_class / selected_education / selected_difficulty (and
+    optionally months_per_game and market_tape), call start_game(seed), then drive it with the action methods and next_month().
+    If `recorder` is set, every player decision is reported to it (see
+    replay.Replay) so the game can be re-run later.
+
+    The state the UI shows is tracked (see store.py): net worth, score and
+    the legal moves are derived values, memoized until a field they depend
+    on changes, and subscribe() reports which fields changed. State changed
+    in place (holdings, loans, debuffs, goals) is announced with touch().
+    """
+
+    # ---------- tracked state ----------
+    money = tracked()
+    monthly_income = tracked()
+    emergency_fund = tracked()
+    happiness = tracked()
+    stress = tracked()
+    holdings = tracked()            # numpy array; touch('holdings') after changing it in place
+    loans = tracked()               # loans.LoanLedger; touch('loans') after opening, paying or accruing
+    debuffs = tracked()             # list; touch('debuffs') after appending or removing
+    goals = tracked()               # dict of dicts; touch('goals') after completing one
+    rent = tracked()
+    groceries = tracked()
+    transport = tracked()
+    current_month = tracked()
+    months_per_game = tracked()
+    actions_remaining = tracked()
+    locked_action = tracked()
+    invest_asset = tracked()
+    payoff_order = tracked()
+    has_vehicle = tracked()
+    has_university = tracked()
+    has_masters = tracked()
+    current_education_level = tracked()
+    game_message = tracked()
+    show_event_modal = tracked()
+    finished = tracked()
+
+    def __init__(self):
+        self.selected_class = None
+        self.selected_education = None
+        self.selected_difficulty = None
+        self.months_per_game = MONTHS_PER_GAME     # chosen at setup, like the three selections
+        self.market_tape = None             # market_tape.MarketTape for historical returns; None = random
+        self._market_returns = None         # this game's monthly returns from the tape, fixed by the seed
+        self._market_z = None               # the same months standardised, for the other assets' draws
+        self.seed = None
+        self.rng = random.Random()
+        self.recorder = None
+        self.finished = False
+        self._init_player_stats()
+        self.debuffs = []
+        self.has_vehicle = False
+        self.current_education_level = 'polytechnic'
+        self.has_university = False
+        self.has_masters = False
+        self.game_message = ""
+        self._init_goals()
+        self.achievements = AchievementEngine()     # goal and achievement rules, tested at month end
+        self.show_event_modal = False       # an event is waiting to be acknowledged
+        self.current_event = None
+        self._init_configs()
+
+        # ========== DATA SCIENCE ADDITIONS ==========
+        self.monthly_log = MonthlyLog()     # monthly snapshots for dashboard
+        # Action counters for statistics
+        self.total_investments = 0
+        self.total_saved = 0
+        self.total_debt_paid = 0
+        self.num_leisure = 0
+        self.num_risky = 0
+
+    def _init_player_stats(self):
+        self.money = 0.0
+        self.monthly_income = 0.0
+        self.loans = LoanLedger()                       # debt, one amortizing loan per source
+        self.payoff_order = DEFAULT_PAYOFF_ORDER        # which loans pay_off_debt() clears first
+        self.holdings = portfolio.empty_holdings()     # dollars per portfolio.ASSETS entry
+        self.invest_asset = DEFAULT_ASSET               # where invest_money() puts new money
+        self.emergency_fund = 0.0
+        self.happiness = STARTING_HAPPINESS
+        self.stress = 0.0
+        self.current_month = 0
+        self.rent = 0.0
+        self.groceries = 0.0
+        self.transport = 0.0
+        self.actions_taken_this_month = 0
+        self.actions_remaining = ACTIONS_PER_MONTH
+        self.locked_action = None
+        self.timeline = Timeline()      # effects due in later months (income back, debuffs wearing off, upkeep)
+
+    def _init_goals(self):
+        self.goals = {
+            'netWorth':    {'target': 50000, 'completed': False, 'label': 'Net Worth $50k'},
+            'emergencyFund': {'target': 10000, 'completed': False, 'label': 'Save $10k Fund'},
+            'debtFree':    {'completed': False, 'label': 'Become Debt-Free'},
+            'happiness':   {'target': 70, 'completed': False, 'label': '70+ Happiness'}
+        }
+
+    # ---------- derived values ----------
+    @derived('holdings')
+    def investments(self):
+        """Total invested across every asset."""
+        return float(self.holdings.sum())
+
+    @investments.setter
+    def investments(self, total):
+        # scales every holding alike; an empty portfolio gets it all in the default asset
+        current = self.holdings.sum()
+        if current > 0:
+            self.holdings *= total / current
+        else:
+            holdings = portfolio.empty_holdings()
+            holdings[ASSET_INDEX[DEFAULT_ASSET]] = total
+            self.holdings = holdings
+
+    @derived('loans')
+    def debt(self):
+        """Total owed across every loan."""
+        return self.loans.total
+
+    @debt.setter
+    def debt(self, total):
+        self.loans.scale(total)
+        self.touch('loans')
+
+    @derived('money', 'investments', 'emergency_fund', 'debt')
+    def net_worth(self):
+        return self.money + self.investments + self.emergency_fund - self.debt
+
+    @derived('debt', 'monthly_income')
+    def debt_to_income(self):
+        """Debt over a year's income (0 without income)."""
+        return self.debt / (self.monthly_income * 12) if self.monthly_income > 0 else 0
+
+    @derived('net_worth', 'goals', 'happiness', 'current_month')
+    def score(self):
+        goal_bonus = sum(1 for g in self.goals.values() if g['completed']) * 5000
+        return max(0, int(self.net_worth + goal_bonus + self.happiness * 100 + self.current_month * 500))
+
+    @derived('actions_remaining', 'finished', 'money', 'emergency_fund', 'debt', 'happiness',
+             'has_vehicle', 'has_university', 'has_masters', 'debuffs')
+    def legal_moves(self):
+        """legal_actions() as a tuple, recomputed only after a field it reads changes."""
+        moves = []
+        if self.actions_remaining > 0 and not self.finished:
+            for action_type, presets in _FINANCIAL_MOVES:
+                limit = self._financial_limit(action_type)
+                moves += [move for amount, move in presets if amount <= limit]
+            for key, move in _LIFE_MOVES:
+                choice = self.life_choices[key]
+                if choice.choice_type == 'leisure':
+                    if self.happiness < LEISURE_HAPPINESS_CAP and self.money >= choice.cost:
+                        moves.append(move)
+                elif choice.choice_type in ('utility', 'education') and self._is_choice_available(key, choice):
+                    moves.append(move)
+            if 'addict' in self.debuffs and self.money >= 1500:
+                moves.append('health_rehab')
+            if ('unhappy' in self.debuffs or 'distracted' in self.debuffs) and self.money >= 800:
+                moves.append('health_therapy')
+        moves.append('end')
+        return tuple(moves)
+
+    @property
+    def months_no_income(self):
+        """Months left before income resumes."""
+        due = self.timeline.due_month('income')
+        return max(0, due - self.current_month) if due is not None else 0
+
+    @months_no_income.setter
+    def months_no_income(self, months):
+        self.timeline.cancel('income')
+        self.suspend_income(months)
+
+    def _init_configs(self):
+        self.class_configs = CLASS_CONFIGS
+        self.education_configs = EDUCATION_CONFIGS
+        self.difficulty_configs = DIFFICULTY_CONFIGS
+        self.life_choices = LIFE_CHOICES
+        self.emergency_events = EMERGENCY_EVENTS
+
+    # ---------- hooks for the UI ----------
+    def _effect(self, kind):
+        """Visual feedback for a rule outcome ('income', 'invest', ...); the GUI spawns particles."""
+
+    def _on_achievement(self, achievement):
+        """An achievements.Achievement was just unlocked; the GUI shows a toast."""
+
+    def _on_game_over(self, completed, score):
+        """Called once when the run ends; the GUI saves stats and switches screens."""
+
+    def _record(self, op, *args):
+        if self.recorder is not None:
+            getattr(self.recorder, op)(*args)
+
+    # ---------- game flow ----------
+    def start_game(self, seed=None):
+        if not all([self.selected_class, self.selected_education, self.selected_difficulty]):
+            return False
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng.seed(self.seed)
+        self._plan_market()
+        self.finished = False
+        cc = self.class_configs[self.selected_class]
+        ec = self.education_configs[self.selected_education]
+        self.money = cc.starting_money
+        self.monthly_income = ec.income
+        self.loans = LoanLedger()
+        self.loans.open('personal', 'personal', cc.debt)
+        self.loans.open('education', 'student', ec.cost)
+        self.touch('loans')
+        self.payoff_order = DEFAULT_PAYOFF_ORDER
+        self.rent = cc.rent
+        self.groceries = cc.groceries
+        self.transport = cc.transport
+        self.holdings = portfolio.empty_holdings()
+        self.invest_asset = DEFAULT_ASSET
+        self.emergency_fund = 0
+        self.happiness = STARTING_HAPPINESS
+        self.stress = 0
+        self.current_month = 0
+        self.debuffs = []
+        self.timeline = Timeline()
+        self.has_vehicle = False
+        self.current_education_level = self.selected_education
+        self.has_university = self.selected_education in ['university', 'masters']
+        self.has_masters = self.selected_education == 'masters'
+        self.game_message = "Welcome to your financial journey! Good luck."
+        self.actions_taken_this_month = 0
+        self.actions_remaining = ACTIONS_PER_MONTH
+        self.locked_action = None
+        self.show_event_modal = False
+        self.current_event = None
+        for goal in self.goals.values():
+            goal['completed'] = False
+        self.touch('goals')
+        self.achievements.reset()
+
+        # Reset data science counters
+        self.monthly_log = MonthlyLog()
+        self.total_investments = 0
+        self.total_saved = 0
+        self.total_debt_paid = 0
+        self.num_leisure = 0
+        self.num_risky = 0
+        return True
+
+    def _action_callback(self, action_id):
+        if action_id.startswith('life_'):
+            return functools.partial(self.take_life_choice, action_id[len('life_'):])
+        return {'health_rehab': self.treat_addiction, 'health_therapy': self.seek_therapy}[action_id]
+
+    def _financial_limit(self, action_type):
+        """Largest amount the action panel lets `action_type` move right now."""
+        if action_type == 'withdraw': return self.emergency_fund
+        if action_type == 'pay_debt': return min(self.money, self.debt)
+        return self.money
+
+    def _can_afford_financial(self, action_type, amount):
+        return amount <= self._financial_limit(action_type)
+
+    def legal_actions(self):
+        """
+        Every move the action panel currently offers, as action strings:
+        'life_<key>' / 'health_rehab' / 'health_therapy', '<financial type>:<preset amount>'
+        and 'end' (advance to next month), which is always legal.
+        """
+        return list(self.legal_moves)
+
+    def apply_action(self, action):
+        """Play one action string from legal_actions(). A pending event is acknowledged first, as in the GUI."""
+        if self.show_event_modal:
+            self.handle_event_close()
+        if action == 'end':
+            self.next_month()
+        elif ':' in action:
+            action_type, amount = action.split(':')
+            self.execute_financial_action(action_type, float(amount))
+        else:
+            self._action_callback(action)()
+
+    def observe(self):
+        """Observation of the current state, with the moves legal_actions() offers."""
+        return Observation(
+            self.selected_class, self.selected_education, self.selected_difficulty,
+            self.current_month, self.actions_remaining, self.money, self.monthly_income, self.debt,
+            self.investments, self.emergency_fund, self.happiness, self.stress,
+            self.rent, self.groceries, self.transport, self.months_no_income, tuple(self.debuffs),
+            self.has_vehicle, self.has_university, self.has_masters,
+            {key: dict(goal) for key, goal in self.goals.items()},
+            self.locked_action['id'] if self.locked_action else None,
+            self.current_event.name if self.current_event else None,
+            self.legal_moves)
+
+    def lock_action(self, action_id, name=None):
+        """Lock `action_id` so next_month() runs it automatically; None unlocks."""
+        if action_id is None:
+            self.locked_action = None
+            return
+        if name is None:
+            key = action_id[len('life_'):]
+            name = self.life_choices[key].name if key in self.life_choices else {'health_rehab': "Rehab", 'health_therapy': "Therapy"}[action_id]
+        self.locked_action = {'name': name, 'callback': self._action_callback(action_id), 'id': action_id}
+
+    def next_month(self):
+        self._record('end_month', self.locked_action['id'] if self.locked_action else None)
+        if self.current_month >= self.months_per_game:
+            self.end_game(True)
+            return
+        messages = []
+        self._effect('month')
+        if self.locked_action:
+            messages.append(f"🔒 Auto: {self.locked_action['name']}")
+            # the auto-run is part of this month's END_MONTH op, not a separate action
+            recorder, self.recorder = self.recorder, None
+            try:
+                self.locked_action['callback']()
+            finally:
+                self.recorder = recorder
+        self._run_due_effects(messages)
+        messages.extend(self._process_income())
+        self._process_expenses()
+        if self.loans:      # interest and minimum payments
+            self.money -= self.loans.accrue()
+            self.touch('loans')
+        if self.market_tape is not None: self._check_market_crash()
+        if self.investments > 0: self._process_investments()
+        if self.emergency_fund > 0: self.emergency_fund *= 1.00167
+        self._update_wellbeing(messages)
+        self._check_random_events()
+
+        # Append monthly snapshot before incrementing month
+        self.monthly_log.append(self.current_month, self.money, self.debt, self.investments,
+                                self.emergency_fund, self.happiness, self.stress, *self.holdings)
+
+        self.current_month += 1
+        self.actions_taken_this_month = 0
+        self.actions_remaining = ACTIONS_PER_MONTH
+        self.game_message = " | ".join(messages) if messages else f"Month {self.current_month} complete."
+        self.check_goals()
+        if self.money < -10000:
+            self.end_game(False, "Bankrupt! Debt exceeded $10,000 limit.")
+
+    def _process_income(self):
+        messages = []
+        if self.months_no_income == 0:
+            income = self.monthly_income
+            if 'distracted' in self.debuffs:
+                income *= 0.8
+                messages.append("Distracted: -20% income")
+                if self.rng.random() < 0.1:
+                    self.suspend_income(2, self.current_month + 1)
+                    messages.append("Fired due to performance!")
+                    self.stress += 30
+                    self._effect('fired')
+            self.money += income
+            self._effect('income')
+        else:
+            messages.append(f"No income ({self.months_no_income - 1} months left)")
+        return messages
+
+    # ---------- scheduled effects ----------
+    def _run_due_effects(self, messages):
+        for kind, args in self.timeline.pop_due(self.current_month):
+            if kind == 'income_resumes':
+                messages.append("💼 Income resumes")
+            elif kind == 'debuff_expires':
+                if args in self.debuffs:
+                    self.debuffs.remove(args)
+                    self.touch('debuffs')
+                    messages.append(f"No longer {args}")
+            elif kind == 'charge':
+                self.money -= args
+
+    def suspend_income(self, months, start=None):
+        """No income for `months` months from `start` (default: the next month played); never shortens a suspension."""
+        due = (self.current_month if start is None else start) + months
+        current = self.timeline.due_month('income')
+        if months > 0 and (current is None or due > current):
+            self.timeline.schedule(due, 'income_resumes', key='income')
+
+    def _add_debuff(self, name):
+        """Add (or renew) a debuff while a month is being played."""
+        if name not in self.debuffs:
+            self.debuffs.append(name)
+            self.touch('debuffs')
+        if name in DEBUFF_MONTHS:
+            self._schedule_expiry(name, self.current_month + 1 + DEBUFF_MONTHS[name])
+
+    def _schedule_expiry(self, name, month):
+        self.timeline.schedule(month, 'debuff_expires', key=f"debuff:{name}", args=name)
+
+    def _start_upkeep(self):
+        self.timeline.schedule(self.current_month, 'charge', key='upkeep:vehicle', every=1, args=VEHICLE_UPKEEP)
+
+    def _remove_debuffs(self, names):
+        self.debuffs = [d for d in self.debuffs if d not in names]
+        for name in names:
+            self.timeline.cancel(f"debuff:{name}")
+
+    def _process_expenses(self):
+        self.money -= self.rent + self.groceries + self.transport
+
+    def _process_investments(self):
+        # one correlated draw for all assets; with a tape, stocks follow it and the rest follow stocks
+        diff = self.difficulty_configs[self.selected_difficulty]
+        z = np.array([self.rng.gauss(0.0, 1.0) for _ in ASSETS])
+        if self._market_returns is not None:
+            z[0] = self._market_z[self.current_month]
+        returns = portfolio.monthly_returns(z, diff.market_volatility)
+        if self._market_returns is not None:
+            returns[0] = self._market_returns[self.current_month]
+        self.holdings *= 1 + returns
+
+    def _plan_market(self, seed=None):
+        """Bootstrap this game's market from the tape; `seed` defaults to the game seed."""
+        tape = self.market_tape
+        if tape is None:
+            self._market_returns = self._market_z = None
+            return
+        returns = tape.returns[tape.path_for(self.seed if seed is None else seed, self.months_per_game)]
+        # difficulty scales the swings, not the trend
+        volatility = self.difficulty_configs[self.selected_difficulty].market_volatility
+        self._market_returns = (tape.mean + (returns - tape.mean) * volatility).tolist()
+        self._market_z = ((returns - tape.mean) / tape.std).tolist()
+
+    def _check_market_crash(self):
+        # the market moves every month, invested or not
+        monthly_return = self._market_returns[self.current_month]
+        if monthly_return <= CRASH_RETURN:
+            self.trigger_event(EmergencyEvent(
+                "Market Crash", f"The stock market fell {-monthly_return:.0%} this month. Your investments fell with it.",
+                stress_increase=25))
+
+    def _update_wellbeing(self, messages):
+        self.stress = max(0, self.stress - 2)
+        if self.debt_to_income > 0.5: self.stress += 5
+        if self.emergency_fund < self.monthly_income * 3: self.stress += 2
+        self.happiness = max(0, self.happiness - 3)
+        if 'unhappy' in self.debuffs: messages.append("You are unhappy!")
+        if self.stress >= BURNOUT_STRESS or self.happiness <= BURNOUT_HAPPINESS: self._trigger_burnout()
+        self.stress = min(100, self.stress)
+        self.happiness = min(100, self.happiness)
+
+    def _trigger_burnout(self):
+        self.trigger_event(EmergencyEvent("🔥 BURNOUT!", "You've reached your breaking point. Forced medical leave.", cost=2000, months_no_income=2))
+        self.stress = 50
+        self._add_debuff('unhappy')
+
+    def _check_random_events(self):
+        diff = self.difficulty_configs[self.selected_difficulty]
+        if self.rng.random() < diff.emergency_chance:
+            event = self.rng.choice(self.emergency_events)
+            # with a market tape, crashes come from the tape itself
+            if not (self.market_tape is not None and event.investment_loss > 0):
+                self.trigger_event(event)
+        debuff_chance = 0.5 - (self.happiness / 100) * 0.4
+        if self.rng.random() < debuff_chance and 'distracted' not in self.debuffs:
+            self._add_debuff('distracted')
+            self.stress += 10
+
+    def trigger_event(self, event):
+        self.current_event = event
+        self.show_event_modal = True
+
+    def handle_event_close(self):
+        self._record('event_close')
+        if self.current_event:
+            if self.current_event.cost > 0:
+                self.money -= self.current_event.cost
+                self._effect('event_cost')
+            if self.current_event.stress_increase > 0:
+                self.stress = min(100, self.stress + self.current_event.stress_increase)
+            if self.current_event.months_no_income > 0:
+                self.suspend_income(self.current_event.months_no_income)
+            if self.current_event.investment_loss > 0:
+                portfolio.crash(self.holdings, self.current_event.investment_loss)
+                self.touch('holdings')
+        self.show_event_modal = False
+        self.current_event = None
+
+    # ---------- player actions ----------
+    def take_life_choice(self, choice_key):
+        self._record('action', f"life_{choice_key}")
+        if self.actions_remaining <= 0:
+            self.game_message = f"⚠️ No actions left! ({self.actions_taken_this_month}/{ACTIONS_PER_MONTH})"
+            return
+        choice = self.life_choices[choice_key]
+        if not self._validate_life_choice(choice_key, choice): return
+        self.money -= choice.cost
+        self.actions_taken_this_month += 1
+        self.actions_remaining -= 1
+        if choice.happiness > 0:
+            self._effect('choice')
+
+        # Update counters for statistics
+        if choice.choice_type == 'leisure':
+            self.num_leisure += 1
+        elif choice.choice_type == 'risky':
+            self.num_risky += 1
+
+        if choice.choice_type == 'education':
+            self._handle_education_upgrade(choice_key, choice)
+            return
+        self.happiness = min(100, self.happiness + choice.happiness)
+        self.stress = max(0, self.stress + choice.stress)
+        if choice.choice_type == 'risky':
+            if self._handle_risky_choice(choice_key, choice): return
+        if choice_key == 'vehicle':
+            self.has_vehicle = True
+            self._start_upkeep()
+        self.game_message = f"{choice.name}: Happiness +{choice.happiness:.0f} | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
+
+    def _validate_life_choice(self, choice_key, choice):
+        if choice.one_time and choice_key == 'vehicle' and self.has_vehicle:
+            self.game_message = "You already own a vehicle!"; return False
+        if choice_key == 'university' and self.has_university:
+            self.game_message = "You already have a degree!"; return False
+        if choice_key == 'masters':
+            if self.has_masters: self.game_message = "Already have a master's!"; return False
+            if not self.has_university: self.game_message = "Need University degree first!"; return False
+        if self.money < choice.cost: self.game_message = "Not enough money!"; return False
+        return True
+
+    def _is_choice_available(self, choice_key, choice):
+        if self.money < choice.cost: return False
+        if choice_key == 'vehicle' and self.has_vehicle: return False
+        if choice_key == 'university' and self.has_university: return False
+        if choice_key == 'masters' and (self.has_masters or not self.has_university): return False
+        return True
+
+    def _handle_education_upgrade(self, choice_key, choice):
+        if choice_key == 'university':
+            self.monthly_income += 1500; self.has_university = True; self.current_education_level = 'university'
+            self.loans.open('university', 'student', choice.cost); self.touch('loans'); self.money += choice.cost
+            self.happiness = min(100, self.happiness + 10); self.stress = min(100, self.stress + 15)
+            self.game_message = "🎓 Degree Earned! Income +$1500/mo (Added to debt)"
+        elif choice_key == 'masters':
+            self.monthly_income += 1000; self.has_masters = True; self.current_education_level = 'masters'
+            self.loans.open('masters', 'student', choice.cost); self.touch('loans'); self.money += choice.cost
+            self.happiness = min(100, self.happiness + 15); self.stress = min(100, self.stress + 20)
+            self.game_message = "🎓 Masters Earned! Income +$1000/mo (Added to debt)"
+
+    def _handle_risky_choice(self, choice_key, choice):
+        if choice_key == 'gambling' and self.rng.random() < choice.win_chance:
+            self.money += choice.win_amount
+            self.game_message = f"You won ${choice.win_amount:.0f}!"
+            self._effect('jackpot')
+            return True
+        if choice.debuff_chance > 0 and self.rng.random() < choice.debuff_chance:
+            if choice.debuff not in self.debuffs:
+                self.debuffs.append(choice.debuff); self.touch('debuffs')
+                self.game_message = f"Addicted to {choice.name}!"
+                self._effect('addicted')
+                return True
+        return False
+
+    def set_invest_asset(self, asset_key):
+        """Choose the portfolio.ASSETS entry that investing buys."""
+        if asset_key == self.invest_asset:
+            return
+        self._record('invest_asset', asset_key)
+        self.invest_asset = asset_key
+
+    def invest_money(self, amount):
+        if self.actions_remaining <= 0: self.game_message = f"No actions left!"; return
+        if self.money >= amount:
+            self.money -= amount; self.holdings[ASSET_INDEX[self.invest_asset]] += amount; self.touch('holdings')
+            self.total_investments += amount   # for statistics
+            self.actions_taken_this_month += 1; self.actions_remaining -= 1
+            self.game_message = (f"Invested ${amount:.0f} in {ASSETS[ASSET_INDEX[self.invest_asset]].name} | "
+                                 f"Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}")
+            self._effect('invest')
+
+    def add_to_emergency_fund(self, amount):
+        if self.actions_remaining <= 0: self.game_message = f"⚠️ No actions left!"; return
+        if self.money >= amount:
+            self.money -= amount; self.emergency_fund += amount
+            self.total_saved += amount   # for statistics
+            self.actions_taken_this_month += 1; self.actions_remaining -= 1
+            self.game_message = f"Saved ${amount:.0f} | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
+
+    def set_payoff_order(self, order):
+        """Choose the loans.PAYOFF_ORDERS rule pay_off_debt() follows."""
+        if order == self.payoff_order:
+            return
+        self._record('payoff_order', order)
+        self.payoff_order = order
+
+    def pay_off_debt(self, amount):
+        if self.actions_remaining <= 0: self.game_message = f"No actions left!"; return
+        payment = min(amount, self.debt, self.money)
+        if payment > 0:
+            payment = self.loans.prepay(payment, self.payoff_order)
+            self.touch('loans')
+            self.money -= payment; self.stress = max(0, self.stress - 5)
+            self.total_debt_paid += payment   # for statistics
+            self.actions_taken_this_month += 1; self.actions_remaining -= 1
+            self.game_message = f"💳 Paid ${payment:.0f} debt | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
+            self._effect('debt_paid')
+
+    def execute_financial_action(self, action_type, amount):
+        self._record('financial', action_type, amount)
+        if action_type == 'invest':
+            self.invest_money(amount)
+        elif action_type == 'save':
+            if self.money >= amount:
+                self.money -= amount; self.emergency_fund += amount
+                self.total_saved += amount   # for statistics
+                self.actions_taken_this_month += 1; self.actions_remaining -= 1
+                self.game_message = f"💵 Saved ${amount:.0f} | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
+            else:
+                self.game_message = "Not enough money"
+        elif action_type == 'withdraw':
+            self._withdraw_emergency(amount)
+        elif action_type == 'pay_debt':
+            self.pay_off_debt(amount)
+
+    def _withdraw_emergency(self, amount):
+        if self.actions_remaining <= 0: self.game_message = f"No actions left!"; return
+        withdrawal = min(amount, self.emergency_fund)
+        if withdrawal > 0:
+            self.emergency_fund -= withdrawal; self.money += withdrawal
+            self.actions_taken_this_month += 1; self.actions_remaining -= 1
+            self.game_message = f"Withdrew ${withdrawal:.0f} | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
+
+    def treat_addiction(self):
+        self._record('action', 'health_rehab')
+        if self.actions_remaining <= 0: self.game_message = f"No actions left!"; return
+        if self.money < 1500: self.game_message = "Need $1500 for treatment"; return
+        self.money -= 1500; self.actions_taken_this_month += 1; self.actions_remaining -= 1
+        if self.rng.random() < self.happiness / 100:
+            self._remove_debuffs(['addict'])
+            self.happiness = min(100, self.happiness + 10)
+            self.game_message = f"Addiction cured! | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
+            self._effect('cured')
+        else:
+            self.game_message = f"Treatment failed. | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
+
+    def seek_therapy(self):
+        self._record('action', 'health_therapy')
+        if self.actions_remaining <= 0: self.game_message = f"No actions left!"; return
+        if self.money < 800: self.game_message = "Need $800 for therapy"; return
+        self.money -= 800
+        self._remove_debuffs(['unhappy', 'distracted'])
+        self.stress = max(0, self.stress - 20); self.happiness = min(100, self.happiness + 15)
+        self.actions_taken_this_month += 1; self.actions_remaining -= 1
+        self.game_message = f"Therapy successful! | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
+        self._effect('therapy')
+
+    # ---------- scoring ----------
+    def check_goals(self):
+        """Month end: test the achievement rules whose fields changed (the four goals among them)."""
+        self._unlock(self.achievements.update(self))
+
+    def _unlock(self, achievements):
+        for achievement in achievements:
+            if achievement.goal is not None:
+                self.goals[achievement.goal]['completed'] = True
+                self.touch('goals')
+            self._on_achievement(achievement)
+
+    def calculate_score(self):
+        return self.score
+
+    def end_game(self, completed, reason=''):
+        score = self.calculate_score()
+        self.game_message = reason or ('Game completed!' if completed else 'Game over!')
+        self.finished = True
+        self._unlock(self.achievements.finish(self))
+        self._record('game_over', score)
+        self._on_game_over(completed, score)
+
+    # ---------- save / resume ----------
+    def snapshot(self):
+        """
+        JSON-ready state of the game in progress, without monthly_log.
+
+        The locked action is stored by its stable id and the RNG state is
+        included, so restore() continues exactly where the snapshot was taken.
+        """
+        state = {name: getattr(self, name) for name in SNAPSHOT_FIELDS}
+        state['debuffs'] = list(self.debuffs)
+        state['goals'] = {key: goal['completed'] for key, goal in self.goals.items()}
+        state['locked_action'] = self.locked_action['id'] if self.locked_action else None
+        state['current_event'] = asdict(self.current_event) if self.current_event else None
+        state['market_tape'] = self.market_tape.path if self.market_tape is not None else None
+        state['holdings'] = self.holdings.tolist()
+        state['loans'] = self.loans.state()
+        state['timeline'] = self.timeline.state()
+        state['achievements'] = self.achievements.state()
+        version, internal, gauss = self.rng.getstate()
+        state['rng'] = [version, base64.b64encode(struct.pack(f'<{len(internal)}I', *internal)).decode('ascii'), gauss]
+        return state
+
+    def restore(self, state, monthly_log=()):
+        self.holdings = portfolio.empty_holdings()
+        self.loans = LoanLedger()
+        self.timeline = Timeline()
+        for name in SNAPSHOT_FIELDS:
+            setattr(self, name, state[name] if name in state else _SNAPSHOT_DEFAULTS[name])
+        if 'holdings' in state:     # older autosaves only have the totals, set above
+            self.holdings = np.array(state['holdings'])
+        if 'loans' in state:
+            self.loans = LoanLedger.from_state(state['loans'])
+        self.debuffs = list(state['debuffs'])
+        if 'timeline' in state:
+            self.timeline = Timeline.from_state(state['timeline'])
+        else:       # older autosaves: start the clocks now
+            for name in self.debuffs:
+                if name in DEBUFF_MONTHS:
+                    self._schedule_expiry(name, self.current_month + DEBUFF_MONTHS[name])
+            if self.has_vehicle:
+                self._start_upkeep()
+        for key, completed in state['goals'].items():
+            self.goals[key]['completed'] = completed
+        self.touch('goals')
+        if 'achievements' in state:
+            self.achievements.load(state['achievements'])
+        else:       # older autosaves: the goals already reached count as unlocked
+            self.achievements.reset()
+            self.achievements.unlocked.update((a.key, self.current_month) for a in self.achievements.catalog
+                                              if a.goal is not None and self.goals[a.goal]['completed'])
+        self.lock_action(state['locked_action'])
+        event = state['current_event']
+        self.current_event = EmergencyEvent(**event) if event else None
+        version, internal, gauss = state['rng']
+        raw = base64.b64decode(internal)
+        self.rng.setstate((version, struct.unpack(f'<{len(raw) // 4}I', raw), gauss))
+        self.market_tape = open_tape(state['market_tape']) if state.get('market_tape') else None
+        self._plan_market()
+        self.monthly_log = MonthlyLog.from_rows(monthly_log)
+        self.finished = False
+
+    # ========== DATA SCIENCE HELPER METHODS ==========
+    def game_summary(self):
+        """End-of-game statistics row as stored in game_summaries.json, or None without data."""
+        if not self.monthly_log:
+            return None
+        avg_happiness = self.monthly_log.mean('happiness')
+        avg_stress = self.monthly_log.mean('stress')
+        return {
+            'class': self.selected_class,
+            'education': self.selected_education,
+            'difficulty': self.selected_difficulty,
+            'total_investments': self.total_investments,
+            'total_saved': self.total_saved,
+            'total_debt_paid': self.total_debt_paid,
+            'num_leisure': self.num_leisure,
+            'num_risky': self.num_risky,
+            'had_addiction': int('addict' in self.debuffs),
+            'avg_happiness': avg_happiness,
+            'avg_stress': avg_stress,
+            'final_score': self.calculate_score(),
+        }
+
+    def goal_training_row(self):
+        """Early-game features and final goal outcomes for the goal predictor, or None."""
+        if len(self.monthly_log) < 6:
+            return None  # not enough data
+        avg_hap = self.monthly_log.window_mean('happiness', 0, 6)
+        avg_str = self.monthly_log.window_mean('stress', 0, 6)
+
+        # Use the cumulative action totals (they include actions up to month 6)
+        # This is a simplification; ideally we'd have per‑month action counts.
+        return {
+            'early_avg_happiness': avg_hap,
+            'early_avg_stress': avg_str,
+            'early_total_investments': self.total_investments,
+            'early_total_saved': self.total_saved,
+            'early_total_debt_paid': self.total_debt_paid,
+            'early_num_leisure': self.num_leisure,
+            'early_num_risky': self.num_risky,
+            'goal_networth': self.goals['netWorth']['completed'],
+            'goal_emergency': self.goals['emergencyFund']['completed'],
+            'goal_debtfree': self.goals['debtFree']['completed'],
+            'goal_happiness': self.goals['happiness']['completed'],
+        }
@@ -0,0 +1,324 @@
+"""
+Local leaderboard: every finished game, tamper-evident, with top-K boards.
+
+Three files:
+
+    leaderboard.fql   append-only log, one record per finished game:
+                          u32 length   32-byte mac   json entry
+                      mac = HMAC-SHA256(key, previous record's mac + entry),
+                      the first record chaining from 32 zero bytes
+    leaderboard.fqi   checkpoint of the boards and the log length and chain
+                      head they cover, itself MAC'd with the key
+    leaderboard.key   random per-install key, created on first use
+
+An entry records the score, the player's avatar, the setup, how far the game
+got, its seed, when it was played and `replay`, the SHA-256 of the replay
+file's bytes (see replay.py).
+
+Boards: an entry goes into the 8 boards its setup belongs to, one per subset
+of (class, education, difficulty) with the rest as "any": overall, per
+class, per class and education, ... down to the exact setup. Each board is a
+min-heap of its best TOP_K entries, so an insert costs O(log K) per board
+however long the log is, and a board is sorted only when it is read after
+changing. Opening loads the checkpoint and reads only the log records
+written after it, so the title screen is instant at millions of games; a
+checkpoint that fails its MAC or does not match the log is rebuilt from the
+log.
+
+Tampering: editing, dropping or reordering a record breaks the chain. Loading
+stops at the first new record that fails its MAC (`rejected` counts the bytes
+ignored, and the next add() cuts them off along with any torn write from a
+crash); records the checkpoint already covers are re-checked by entries() and
+`verify`, which also catch an edit there. The key sits next
+to the log, so this stops casual edits rather than a determined local user;
+the real proof is the replay: verify_entry() re-runs it and checks both its
+hash and its score.
+
+    python leaderboard.py top --class lower -k 5
+    python leaderboard.py verify replays/       check the chain, re-run every replay
+"""
+import argparse
+import hashlib
+import heapq
+import hmac
+import itertools
+import json
+import os
+import struct
+import sys
+import time
+
+from replay import encode_replay, list_replays, load_replay, run_replay
+
+LEADERBOARD_PATH = "leaderboard.fql"
+TOP_K = 10
+_HEADER = struct.Struct('<I32s')
+_GENESIS = bytes(32)
+_ANY = '*'
+
+
+def replay_hash(replay):
+    return hashlib.sha256(encode_replay(replay)).hexdigest()
+
+
+def entry_for(sim, player=None, replay=None):
+    """Leaderboard entry for the finished game in `sim`; `replay` is its replay.Replay, if recorded."""
+    return {
+        'score': sim.calculate_score(),
+        'player': player,
+        'class': sim.selected_class,
+        'education': sim.selected_education,
+        'difficulty': sim.selected_difficulty,
+        'months': sim.months_per_game,
+        'month': sim.current_month,
+        'goals': sum(1 for g in sim.goals.values() if g['completed']),
+        'achievements': len(sim.achievements.unlocked),
+        'seed': sim.seed,
+        'played_at': time.strftime('%Y-%m-%d %H:%M'),
+        'replay': replay_hash(replay) if replay is not None else None,
+    }
+
+
+def verify_entry(entry, replay):
+    """True if `replay` is the one `entry` was recorded with and re-simulating it gives its score."""
+    return (entry['replay'] == replay_hash(replay)
+            and run_replay(replay).calculate_score() == entry['score'] == replay.final_score)
+
+
+def _board_keys(entry):
+    setup = (entry['class'], entry['education'], entry['difficulty'])
+    for mask in itertools.product((False, True), repeat=3):
+        yield '|'.join(value if keep else _ANY for value, keep in zip(setup, mask))
+
+
+def _load_key(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        key = os.urandom(32)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+        return key
+
+
+class Leaderboard:
+    def __init__(self, path=LEADERBOARD_PATH, top_k=TOP_K):
+        self.path = path
+        self.top_k = top_k
+        self._checkpoint_path = os.path.splitext(path)[0] + '.fqi'
+        self._key = _load_key(os.path.splitext(path)[0] + '.key')
+        self.count = 0              # entries in the log
+        self.rejected = 0           # bytes after the last record that passed its MAC
+        self._boards = {}           # board key -> min-heap of (score, -seq, entry)
+        self._sorted = {}           # board key -> its entries best first, until it changes
+        self._head = _GENESIS       # mac of the last record
+        self._end = 0               # log offset after the last good record
+        self._last = None           # offset of the last good record
+        if not self._load_checkpoint():
+            self._boards, self.count, self._head, self._end, self._last = {}, 0, _GENESIS, 0, None
+        self._read_log()
+
+    # ---------- queries ----------
+    def top(self, k=None, player_class=None, education=None, difficulty=None):
+        """Best entries, highest score first; None for a setup part means any."""
+        key = '|'.join(v or _ANY for v in (player_class, education, difficulty))
+        board = self._sorted.get(key)
+        if board is None:
+            board = self._sorted[key] = [entry for _, _, entry in sorted(self._boards.get(key, ()), reverse=True)]
+        return board[:k or self.top_k]
+
+    def best(self):
+        top = self.top(1)
+        return top[0]['score'] if top else 0
+
+    # ---------- writing ----------
+    def add(self, entry):
+        self.add_many([entry])
+        return entry
+
+    def add_many(self, entries):
+        """
+        Append `entries` to the log (one fsync) and refresh the checkpoint.
+
+        Nothing in memory changes until the records are on disk, so after a
+        failed write (OSError) the board and the chain head still match the log.
+        """
+        out = bytearray()
+        head, last, pos = self._head, self._last, self._end
+        for entry in entries:
+            body = json.dumps(entry, separators=(',', ':')).encode('utf-8')
+            mac = hmac.new(self._key, head + body, hashlib.sha256).digest()
+            out += _HEADER.pack(len(body), mac) + body
+            head, last = mac, pos
+            pos += _HEADER.size + len(body)
+        with open(self.path, 'ab') as f:
+            if f.tell() != self._end:
+                f.truncate(self._end)       # drop a torn or rejected tail (or a failed append) first
+                f.seek(self._end)
+            f.write(out)
+            f.flush()
+            os.fsync(f.fileno())
+        for entry in entries:
+            self._index(entry)
+        self._head, self._last, self._end = head, last, pos
+        self.rejected = 0
+        self._save_checkpoint()
+
+    def _index(self, entry):
+        seq = self.count
+        self.count += 1
+        item = (entry['score'], -seq, entry)
+        for key in _board_keys(entry):
+            board = self._boards.setdefault(key, [])
+            if len(board) < self.top_k:
+                heapq.heappush(board, item)
+            elif item[:2] > board[0][:2]:
+                heapq.heapreplace(board, item)
+            else:
+                continue
+            self._sorted.pop(key, None)
+
+    # ---------- log ----------
+    def entries(self):
+        """Every entry in the log whose MAC chain holds, oldest first."""
+        for _, _, _, entry in self._records(0, _GENESIS):
+            yield entry
+
+    def _records(self, pos, head, report=False):
+        """Yield (start, end, mac, entry) for each record from offset `pos`, reading one at a time."""
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            f.seek(pos)
+            while True:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                length, mac = _HEADER.unpack(header)
+                body = f.read(length)
+                if len(body) < length:
+                    return      # torn write
+                if not hmac.compare_digest(mac, hmac.new(self._key, head + body, hashlib.sha256).digest()):
+                    if report:
+                        self.rejected = size - pos
+                    return
+                end = pos + _HEADER.size + length
+                yield pos, end, mac, json.loads(body)
+                head, pos = mac, end
+
+    def _read_log(self):
+        for start, end, mac, entry in self._records(self._end, self._head, report=True):
+            self._index(entry)
+            self._head, self._last, self._end = mac, start, end
+
+    # ---------- checkpoint ----------
+    def _load_checkpoint(self):
+        try:
+            with open(self._checkpoint_path, 'rb') as f:
+                mac, body = f.read(32), f.read()
+        except FileNotFoundError:
+            return False
+        if not hmac.compare_digest(mac, hmac.new(self._key, body, hashlib.sha256).digest()):
+            return False
+        state = json.loads(body)
+        if state['top_k'] != self.top_k or not self._log_matches(state['last'], state['end'], bytes.fromhex(state['head'])):
+            return False
+        self.count, self._end, self._last = state['count'], state['end'], state['last']
+        self._head = bytes.fromhex(state['head'])
+        self._boards = {key: [(entry['score'], -seq, entry) for seq, entry in board]
+                        for key, board in state['boards'].items()}
+        for board in self._boards.values():
+            heapq.heapify(board)
+        return True
+
+    def _log_matches(self, last, end, head):
+        """The log still holds the record the checkpoint ends with."""
+        if last is None:
+            return end == 0
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(last)
+                header = f.read(_HEADER.size)
+        except FileNotFoundError:
+            return False
+        if len(header) < _HEADER.size:
+            return False
+        length, mac = _HEADER.unpack(header)
+        return mac == head and last + _HEADER.size + length == end
+
+    def _save_checkpoint(self):
+        body = json.dumps({
+            'top_k': self.top_k, 'count': self.count, 'end': self._end, 'last': self._last, 'head': self._head.hex(),
+            'boards': {key: [(-neg_seq, entry) for _, neg_seq, entry in board] for key, board in self._boards.items()},
+        }, separators=(',', ':')).encode('utf-8')
+        tmp = self._checkpoint_path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(hmac.new(self._key, body, hashlib.sha256).digest() + body)
+        os.replace(tmp, self._checkpoint_path)
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+def _verify(board, paths):
+    entries = list(board.entries())
+    broken = len(entries) < board.count or board.rejected
+    print(f"{len(entries)}/{board.count} entries pass the MAC chain" + (" - the log was edited" if broken else ""))
+    replays = {}
+    for path in list_replays(*paths):
+        try:
+            replay = load_replay(path)
+        except (OSError, ValueError):
+            continue
+        replays[replay_hash(replay)] = replay
+    checked = failed = 0
+    for entry in entries:
+        replay = replays.get(entry['replay'])
+        if replay is None:
+            continue
+        checked += 1
+        try:
+            ok = verify_entry(entry, replay)
+        except (OSError, ValueError):      # its market tape is missing or was rebuilt
+            ok = False
+        if not ok:
+            failed += 1
+            print(f"{entry['played_at']}  {entry['score']:,}: replay does not reproduce this score")
+    print(f"{checked - failed}/{checked} scores reproduced by their replays "
+          f"({len(entries) - checked} without a replay on disk)")
+    return 1 if failed or broken else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and verify the FinanceQuest leaderboard.")
+    parser.add_argument('--file', default=LEADERBOARD_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    top = sub.add_parser('top', help="print a board")
+    top.add_argument('-k', type=int, default=TOP_K, help=f"entries to show (at most {TOP_K}, what a board keeps)")
+    top.add_argument('--class', dest='player_class')
+    top.add_argument('--education')
+    top.add_argument('--difficulty')
+    verify = sub.add_parser('verify', help="check the log and re-run the replays of its entries")
+    verify.add_argument('paths', nargs='*', help="replay files or directories (default: replays/)")
+    args = parser.parse_args(argv)
+    if args.command == 'top' and not 1 <= args.k <= TOP_K:
+        # a board keeps only TOP_K entries; a bigger top_k would not match the checkpoint and rebuild it
+        parser.error(f"-k must be between 1 and {TOP_K}")
+
+    board = Leaderboard(args.file)
+    if args.command == 'verify':
+        return _verify(board, args.paths)
+    for i, e in enumerate(board.top(args.k, args.player_class, args.education, args.difficulty), 1):
+        print(f"{i:3}. {e['score']:>10,}  {e['player'] or '':2} {e['class']}/{e['education']}/{e['difficulty']}"
+              f"  {e['month']}/{e['months']} months  {e['played_at']}  {'replay' if e['replay'] else ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Loan ledger: the player's debt as separate amortizing loans.
+
+Each loan has its own principal, rate and term, and a fixed minimum payment
+set when it is opened:
+
+    payment = principal * r / (1 - (1 + r) ** -term)      r = annual rate / 12
+
+next_month() charges every loan's minimum payment (accrue). Following its
+schedule, a loan's balance after k payments has the closed form
+
+    balance_k = B * g**k - payment * (g**k - 1) / r        g = 1 + r
+
+so each loan caches one Schedule, anchored at the month it was last
+prepaid (or opened), and answers "balance in month m", "paid off in month"
+and "interest still to pay" in O(1). Only a prepayment, which keeps the
+payment and shortens the term, re-anchors it.
+
+Prepayments (the Pay Debt action) go to the loans in PAYOFF_ORDERS order:
+'avalanche' pays the highest rate first (least interest overall),
+'snowball' the smallest balance first (fewest open loans soonest).
+
+Loans are opened in a fixed order, so a game's loans line up with the
+LOAN_SLOTS columns finance_env.VectorEnv keeps per game.
+"""
+import math
+from collections import namedtuple
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class LoanType:
+    key: str
+    name: str
+    annual_rate: float          # always above zero: the closed forms divide by it
+    term_months: int
+
+
+LOAN_TYPES = {
+    'personal': LoanType('personal', "Personal Loan", 0.07, 60),
+    'student': LoanType('student', "Student Loan", 0.05, 120),
+}
+# Every loan a game can hold, in the order they are opened: (slot key, loan type)
+LOAN_SLOTS = (('personal', 'personal'), ('education', 'student'),
+              ('university', 'student'), ('masters', 'student'))
+PAYOFF_ORDERS = ('avalanche', 'snowball')
+PAYOFF_ORDER_NAMES = {'avalanche': ("Avalanche", "highest rate first"), 'snowball': ("Snowball", "smallest balance first")}
+DEFAULT_PAYOFF_ORDER = 'avalanche'
+_DUST = 0.005       # balances under half a cent are paid off
+
+# anchor month, balance then, month the balance reaches zero, size of the last payment
+Schedule = namedtuple('Schedule', 'month balance paid_off_month final_payment')
+
+
+def amortized_payment(principal, rate, term):
+    """Fixed monthly payment that clears `principal` in `term` months (works on arrays too)."""
+    return principal * rate / (1 - (1 + rate) ** -term)
+
+
+def payments_left(balance, rate, payment):
+    """Monthly payments of `payment` still needed to clear `balance` (inf if they never do)."""
+    if balance <= _DUST:
+        return 0
+    if payment <= balance * rate:
+        return math.inf
+    return math.ceil(math.log(payment / (payment - balance * rate)) / math.log1p(rate) - 1e-9)
+
+
+class Loan:
+    __slots__ = ('slot', 'kind', 'balance', 'rate', 'payment', '_schedule')
+
+    def __init__(self, slot, kind, balance, payment=None):
+        self.slot = slot
+        self.kind = kind
+        self.balance = balance
+        self.rate = LOAN_TYPES[kind].annual_rate / 12
+        self.payment = payment if payment is not None else amortized_payment(balance, self.rate, LOAN_TYPES[kind].term_months)
+        self._schedule = None
+
+    @property
+    def name(self):
+        return LOAN_TYPES[self.kind].name
+
+    def schedule(self, month):
+        """The cached Schedule, anchored at `month` if there is none yet."""
+        if self._schedule is None:
+            n = payments_left(self.balance, self.rate, self.payment)
+            if n in (0, math.inf):
+                final = 0.0 if n == 0 else self.payment
+            else:
+                final = self._balance_after(self.balance, n - 1) * (1 + self.rate)
+            self._schedule = Schedule(month, self.balance, month + n, final)
+        return self._schedule
+
+    def _balance_after(self, balance, k):
+        g = (1 + self.rate) ** k
+        return balance * g - self.payment * (g - 1) / self.rate
+
+    def balance_at(self, month, now):
+        """Projected balance at the start of `month` (>= now) if only minimum payments are made."""
+        s = self.schedule(now)
+        if month >= s.paid_off_month:
+            return 0.0
+        return max(0.0, self._balance_after(s.balance, month - s.month))
+
+    def interest_left(self, now):
+        """Interest still to pay on the minimum payments."""
+        s = self.schedule(now)
+        if s.paid_off_month == math.inf:
+            return math.inf
+        remaining = s.paid_off_month - now
+        return self.payment * (remaining - 1) + s.final_payment - self.balance if remaining > 0 else 0.0
+
+    def state(self):
+        return [self.slot, self.kind, self.balance, self.payment]
+
+
+class LoanLedger:
+    """Every open loan of one game; `total` is the player's debt."""
+
+    def __init__(self, loans=()):
+        self.loans = list(loans)
+        self.total = sum(loan.balance for loan in self.loans)
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(Loan(*row) for row in state)
+
+    def state(self):
+        return [loan.state() for loan in self.loans]
+
+    def __iter__(self):
+        return iter(self.loans)
+
+    def __len__(self):
+        return len(self.loans)
+
+    def open(self, slot, kind, principal):
+        if principal > 0:
+            self.loans.append(Loan(slot, kind, principal))
+            self.total += principal
+
+    def minimum_payment(self):
+        return sum(min(loan.payment, loan.balance * (1 + loan.rate)) for loan in self.loans)
+
+    def accrue(self):
+        """One month of interest and minimum payments; returns the amount paid."""
+        paid = 0.0
+        for loan in self.loans:
+            owed = loan.balance * (1 + loan.rate)
+            payment = min(loan.payment, owed)
+            loan.balance = owed - payment
+            if loan.balance < _DUST:
+                payment += loan.balance
+                loan.balance = 0.0
+            paid += payment
+        self._settle()
+        return paid
+
+    def prepay(self, amount, order=DEFAULT_PAYOFF_ORDER):
+        """Pay `amount` off early, loan by loan in `order`; returns the amount applied."""
+        if order == 'snowball':
+            ranked = sorted(self.loans, key=lambda loan: loan.balance)
+        else:
+            ranked = sorted(self.loans, key=lambda loan: -loan.rate)     # stable: older loans first on ties
+        applied = 0.0
+        for loan in ranked:
+            part = min(amount - applied, loan.balance)
+            if part <= 0:
+                break
+            loan.balance -= part
+            loan._schedule = None
+            applied += part
+        self._settle()
+        return applied
+
+    def scale(self, total):
+        """Set the debt to `total`, scaling every loan alike (autosaves from before the ledger)."""
+        if self.total > 0:
+            for loan in self.loans:
+                loan.balance *= total / self.total
+                loan._schedule = None
+            self._settle()
+        else:
+            self.loans = []
+            self.total = 0.0
+            self.open('education', 'student', total)
+
+    def _settle(self):
+        self.loans = [loan for loan in self.loans if loan.balance > 0]
+        self.total = sum(loan.balance for loan in self.loans)
+
+    # ---------- projections (O(1) per loan) ----------
+    def paid_off_month(self, now):
+        """Month the last loan is cleared on minimum payments (now if debt-free)."""
+        return max((loan.schedule(now).paid_off_month for loan in self.loans), default=now)
+
+    def interest_left(self, now):
+        return sum(loan.interest_left(now) for loan in self.loans)
+
+    def balance_at(self, month, now):
+        return sum(loan.balance_at(month, now) for loan in self.loans)
@@ -0,0 +1,191 @@
+"""
+Historical market tapes: monthly index returns that drive investment growth.
+
+By default FinanceSimulation draws each month's investment returns at random:
+correlated Gaussian returns for every asset (portfolio.monthly_returns).
+With a tape set on the simulation (sim.market_tape), stock returns come from
+a real index history instead and the other assets follow them. Each game plays a circular block
+bootstrap of the tape: blocks of BLOCK_MONTHS consecutive months starting at
+random points, so crashes, recoveries and streaks keep their shape while no
+two games see the same market. The block starts are drawn from the game seed
+alone, so the market path of a game does not depend on what the player does
+and replays reproduce it exactly. A month returning CRASH_RETURN or worse is
+the game's "Market Crash" event.
+
+File layout (little-endian):
+
+    b"FQT\\x01"  u32 months  u32 first month (YYYYMM)  u32 crc32 of the data
+    f64 * months    simple monthly returns (0.01 = +1%)
+
+The returns are memory-mapped, never read into the process: every game, and
+every worker process of a tournament or calibration run, shares the OS page
+cache copy. A MarketTape pickles as its path and re-maps on the other side.
+
+No tape ships with the game; build one from any index history in CSV form:
+
+    python market_tape.py convert sp500.csv -o market_tape.fqt --date Date --column Close
+    python market_tape.py convert returns.csv -o market_tape.fqt --kind return --percent
+    python market_tape.py info market_tape.fqt
+
+Daily or weekly prices are reduced to the last price of each month. Put the
+result at DEFAULT_TAPE_PATH and the setup screen offers a historical market.
+"""
+import argparse
+import csv
+import functools
+import os
+import struct
+import sys
+import zlib
+
+import numpy as np
+
+DEFAULT_TAPE_PATH = "market_tape.fqt"
+TAPE_MAGIC = b"FQT\x01"
+_HEADER = struct.Struct('<4sIII')
+BLOCK_MONTHS = 12
+CRASH_RETURN = -0.10
+
+
+class MarketTape:
+    """A read-only, memory-mapped series of monthly returns."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size or header[:4] != TAPE_MAGIC:
+            raise ValueError(f"{path}: not a FinanceQuest market tape")
+        _, self.months, self.first_month, self.checksum = _HEADER.unpack(header)
+        if self.months < BLOCK_MONTHS:
+            raise ValueError(f"{path}: a tape needs at least {BLOCK_MONTHS} months, has {self.months}")
+        self.returns = np.memmap(path, dtype='<f8', mode='r', offset=_HEADER.size, shape=(self.months,))
+        self.mean = float(self.returns.mean())
+        self.std = float(self.returns.std())
+
+    def __reduce__(self):
+        return open_tape, (self.path,)
+
+    def __len__(self):
+        return self.months
+
+    @property
+    def name(self):
+        return os.path.splitext(os.path.basename(self.path))[0]
+
+    def path_for(self, seed, months, block=BLOCK_MONTHS):
+        """Tape indices of `months` bootstrapped months for the game with this seed."""
+        rng = np.random.default_rng(seed)
+        starts = rng.integers(0, self.months, size=-(-months // block))
+        return ((starts[:, None] + np.arange(block)) % self.months).ravel()[:months]
+
+    def verify(self):
+        """True if the data still matches the checksum written by the converter."""
+        return zlib.crc32(self.returns.tobytes()) == self.checksum
+
+
+@functools.lru_cache(maxsize=None)
+def open_tape(path=DEFAULT_TAPE_PATH):
+    """The tape at `path`, mapped once per process."""
+    return MarketTape(path)
+
+
+def available(path=DEFAULT_TAPE_PATH):
+    return os.path.exists(path)
+
+
+def write_tape(path, returns, first_month):
+    returns = np.ascontiguousarray(returns, dtype='<f8')
+    data = returns.tobytes()
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(TAPE_MAGIC, len(returns), first_month, zlib.crc32(data)))
+        f.write(data)
+    os.replace(tmp, path)
+    open_tape.cache_clear()
+
+
+# ============================================================
+# CSV CONVERSION
+# ============================================================
+
+def _parse_date(date):
+    """'2019-03-29', '2019/03', '03/29/2019' -> (201903, day of month or 0)."""
+    parts = [p for p in date.replace('/', '-').replace('.', '-').split(' ')[0].split('-') if p]
+    if len(parts) >= 2 and len(parts[0]) == 4:
+        year, month, day = parts[0], parts[1], parts[2] if len(parts) > 2 else 0
+    elif len(parts) == 3 and len(parts[2]) == 4:
+        year, month, day = parts[2], parts[0], parts[1]
+    else:
+        raise ValueError(f"unrecognised date {date!r}")
+    return int(year) * 100 + int(month), int(day)
+
+
+def _next_month(key):
+    year, month = divmod(key, 100)
+    return key + 1 if month < 12 else (year + 1) * 100 + 1
+
+
+def read_csv(path, date_column, value_column, kind='price', percent=False):
+    """(monthly returns, first YYYYMM) from a CSV of prices or returns, any date order."""
+    monthly = {}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            value = row[value_column].strip().replace(',', '')
+            if not value or value.lower() in ('null', 'nan', '.'):
+                continue
+            key, day = _parse_date(row[date_column].strip())
+            if key not in monthly or day >= monthly[key][0]:
+                monthly[key] = (day, float(value))
+    keys = sorted(monthly)
+    for a, b in zip(keys, keys[1:]):
+        if b != _next_month(a):
+            raise ValueError(f"{path}: no data between {a} and {b}")
+    values = np.array([monthly[k][1] for k in keys])
+    if kind == 'price':
+        return values[1:] / values[:-1] - 1, keys[1]
+    return values / 100 if percent else values, keys[0]
+
+
+def _describe(tape):
+    r = np.asarray(tape.returns)
+    start = tape.first_month
+    end = start
+    for _ in range(tape.months - 1):
+        end = _next_month(end)
+    worst = int(r.argmin())
+    print(f"{tape.path}: {tape.months} months, {start // 100}-{start % 100:02d} to {end // 100}-{end % 100:02d}")
+    print(f"  mean {r.mean() * 12:+.1%}/yr   volatility {r.std() * 12 ** 0.5:.1%}/yr   "
+          f"worst month {r[worst]:+.1%}   crash months (<= {CRASH_RETURN:.0%}) {int((r <= CRASH_RETURN).sum())}")
+    print(f"  checksum {'ok' if tape.verify() else 'MISMATCH'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and inspect FinanceQuest market tapes.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    convert = sub.add_parser('convert', help="CSV of index prices or returns -> tape")
+    convert.add_argument('csv')
+    convert.add_argument('-o', '--out', default=DEFAULT_TAPE_PATH)
+    convert.add_argument('--date', default='Date', help="date column (default: Date)")
+    convert.add_argument('--column', default='Close', help="value column (default: Close)")
+    convert.add_argument('--kind', choices=['price', 'return'], default='price')
+    convert.add_argument('--percent', action='store_true', help="returns are in percent (1.5 = +1.5%%)")
+    info = sub.add_parser('info', help="summarise a tape")
+    info.add_argument('tape', nargs='?', default=DEFAULT_TAPE_PATH)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'convert':
+            returns, first_month = read_csv(args.csv, args.date, args.column, args.kind, args.percent)
+            write_tape(args.out, returns, first_month)
+            _describe(open_tape(args.out))
+        else:
+            _describe(open_tape(args.tape))
+    except (OSError, KeyError, ValueError) as e:
+        print(f"market_tape {args.command} failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Column store for the per-month snapshots a game records (FinanceSimulation.monthly_log).
+
+Rows live in one preallocated float64 array, one column per FIELDS entry,
+doubled when a long (or batch-simulated) game outgrows it: 88 bytes a month
+instead of a ~600-byte dict. Running column sums make whole-game sums and
+means O(1); window aggregates use a prefix-sum table that is built on the
+first window query after an append, then answers every window in O(1):
+
+    log.mean('happiness')                 average over the game so far
+    log.window_mean('stress', 0, 6)       average over months 0-5
+    log.column('money')                   NumPy view, no copy
+    log.frame()                           pandas DataFrame over the same memory
+    log.rows(start)                       JSON-ready dicts (autosave records)
+
+lttb() downsamples a long series for plotting, so the dashboard draws the
+same number of points for a 40-year game as for a 2-year one.
+"""
+import numpy as np
+
+from portfolio import ASSET_KEYS
+
+# 'investments' is the portfolio total; the per-asset holdings follow it
+FIELDS = ('month', 'money', 'debt', 'investments', 'emergency_fund', 'happiness', 'stress') + ASSET_KEYS
+_INDEX = {name: i for i, name in enumerate(FIELDS)}
+_INITIAL_CAPACITY = 32
+
+
+class MonthlyLog:
+    def __init__(self, capacity=_INITIAL_CAPACITY):
+        self._n = 0
+        self._data = np.empty((capacity, len(FIELDS)))
+        self._sums = np.zeros(len(FIELDS))
+        self._prefix = None         # _prefix[i] = sum of rows [0, i), rebuilt lazily
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Rebuild a log from rows() output (e.g. an autosave)."""
+        log = cls(max(_INITIAL_CAPACITY, len(rows)))
+        for row in rows:
+            log.append(*(row.get(name, 0.0) for name in FIELDS))    # logs saved before a field existed lack it
+        return log
+
+    def __len__(self):
+        return self._n
+
+    def __eq__(self, other):
+        return isinstance(other, MonthlyLog) and self._n == other._n and np.array_equal(self.values(), other.values())
+
+    def append(self, *values):
+        """Add one month; `values` in FIELDS order."""
+        n = self._n
+        if n == len(self._data):
+            self._grow()
+        row = self._data[n]
+        row[:] = values
+        np.add(self._sums, row, out=self._sums)
+        self._prefix = None
+        self._n = n + 1
+
+    def _grow(self):
+        data = np.empty((2 * len(self._data), len(FIELDS)))
+        data[:self._n] = self._data[:self._n]
+        self._data = data
+
+    def _prefix_sums(self):
+        if self._prefix is None:
+            self._prefix = np.zeros((self._n + 1, len(FIELDS)))
+            np.cumsum(self._data[:self._n], axis=0, out=self._prefix[1:])
+        return self._prefix
+
+    # ---------- aggregates ----------
+    def sum(self, field):
+        return float(self._sums[_INDEX[field]])
+
+    def mean(self, field):
+        return self.sum(field) / self._n if self._n else 0.0
+
+    def window_sum(self, field, start, stop):
+        """Sum of `field` over months [start, stop), clipped to the recorded months."""
+        start, stop = max(0, start), min(self._n, stop)
+        if stop <= start:
+            return 0.0
+        i = _INDEX[field]
+        prefix = self._prefix_sums()
+        return float(prefix[stop, i] - prefix[start, i])
+
+    def window_mean(self, field, start, stop):
+        start, stop = max(0, start), min(self._n, stop)
+        return self.window_sum(field, start, stop) / (stop - start) if stop > start else 0.0
+
+    # ---------- views ----------
+    def values(self):
+        """(months, len(FIELDS)) view of the recorded rows."""
+        return self._data[:self._n]
+
+    def column(self, field):
+        return self._data[:self._n, _INDEX[field]]
+
+    def frame(self):
+        """pandas DataFrame over the recorded rows, sharing the log's memory."""
+        import pandas as pd     # only the dashboard needs it; headless simulations stay light
+        return pd.DataFrame(self.values(), columns=list(FIELDS), copy=False)
+
+    def rows(self, start=0, stop=None):
+        """Months [start, stop) as plain dicts."""
+        stop = self._n if stop is None else min(self._n, stop)
+        return [dict(zip(FIELDS, (int(r[0]),) + tuple(r[1:].tolist()))) for r in self._data[start:stop]]
+
+
+def lttb(x, y, max_points):
+    """
+    Indices of at most `max_points` points that keep the shape of the series
+    (Largest-Triangle-Three-Buckets): the first and last points, plus the
+    point of each bucket that spans the largest triangle with the previous
+    pick and the next bucket's average.
+    """
+    n = len(x)
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    picked = np.empty(max_points, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        picked[i + 1] = a
+    return picked
@@ -0,0 +1,188 @@
+"""
+Bot players for FinanceQuest.
+
+A Policy looks at an Observation of the game (FinanceSimulation.observe) and
+says which actions to take; play_policy() applies them through the same rules
+the GUI uses (take_life_choice, execute_financial_action, next_month), so a
+bot can only do what a player could.
+
+Each month play_policy() asks `plan_month(obs)` for the actions to play next,
+as action strings from `obs.legal_actions`. A policy may return the whole
+month at once or one action at a time: while actions remain and the last plan
+was played, it is asked again with a fresh observation. Returning [] or a
+plan containing 'end' finishes the month. Illegal actions are skipped.
+
+To write a bot, subclass Policy, give it a unique `name` and implement
+plan_month(); reset() is called before every game. Policies are pickled into
+tournament worker processes, so keep their state picklable.
+"""
+import random
+
+from finance_sim import LIFE_CHOICES, ACTIONS_PER_MONTH
+import strategy_solver
+
+
+class Policy:
+    name = "policy"
+
+    def reset(self, setup, seed):
+        """Called before each game with (class, education, difficulty) and the game seed."""
+
+    def plan_month(self, obs):
+        """Actions to play next this month; [] or 'end' finishes the month."""
+        return []
+
+
+def _play_actions(sim, policy):
+    """Play `policy`'s actions for the current month, without ending it."""
+    while True:
+        obs = sim.observe()
+        legal = obs.legal_actions
+        played = 0
+        for action in policy.plan_month(obs):
+            if action == 'end':
+                return
+            if played:
+                legal = sim.legal_actions()
+            if action in legal:
+                sim.apply_action(action)
+                played += 1
+        if not played or sim.actions_remaining <= 0:
+            return
+
+
+def play_policy(sim, policy):
+    """Play a started game to the end with `policy`; returns the final score."""
+    policy.reset((sim.selected_class, sim.selected_education, sim.selected_difficulty), sim.seed)
+    while not sim.finished:
+        if sim.show_event_modal:
+            sim.handle_event_close()
+        _play_actions(sim, policy)
+        sim.next_month()
+    return sim.calculate_score()
+
+
+def fast_forward(sim, months, policy=None):
+    """
+    Advance a started game by up to `months` months in one go (autopilot).
+
+    Each month `policy` (if given) plays its actions, then next_month() runs
+    the locked action as usual; events are acknowledged as soon as they
+    happen. Returns a summary of the stretch: months played, net worth and
+    score before and after, the events that hit and the goals and
+    achievements reached.
+    """
+    start = {'month': sim.current_month, 'net_worth': sim.net_worth, 'score': sim.calculate_score(),
+             'goals': {key for key, goal in sim.goals.items() if goal['completed']},
+             'achievements': set(sim.achievements.unlocked)}
+    events = []
+
+    def acknowledge():
+        if sim.show_event_modal:
+            event = sim.current_event
+            events.append({'month': sim.current_month, 'name': event.name, 'cost': event.cost})
+            sim.handle_event_close()
+
+    if policy is not None:
+        policy.reset((sim.selected_class, sim.selected_education, sim.selected_difficulty), sim.seed)
+    stop = sim.current_month + months
+    acknowledge()
+    while not sim.finished and sim.current_month < stop:
+        if policy is not None:
+            _play_actions(sim, policy)
+        sim.next_month()
+        if not sim.finished:
+            acknowledge()
+    return {
+        'start_month': start['month'], 'end_month': sim.current_month,
+        'net_worth': (start['net_worth'], sim.net_worth),
+        'score': (start['score'], sim.calculate_score()),
+        'events': events,
+        'goals_reached': [sim.goals[key]['label'] for key, goal in sim.goals.items()
+                          if goal['completed'] and key not in start['goals']],
+        'achievements': [a.name for a in sim.achievements.catalog
+                         if a.key in sim.achievements.unlocked and a.key not in start['achievements'] and a.goal is None],
+        'finished': sim.finished,
+        'bankrupt': sim.finished and sim.current_month < sim.months_per_game,
+    }
+
+
+# ============================================================
+# BUILT-IN BOTS
+# ============================================================
+
+class IdlePolicy(Policy):
+    """Never acts: the baseline every strategy should beat."""
+    name = "idle"
+
+
+class RandomPolicy(Policy):
+    """Uniformly random legal moves, reseeded per game so tournaments stay reproducible."""
+    name = "random"
+
+    def __init__(self):
+        self.rng = random.Random()
+
+    def reset(self, setup, seed):
+        self.rng.seed(seed ^ 0x5EED)
+
+    def plan_month(self, obs):
+        return [self.rng.choice(obs.legal_actions)]
+
+
+class ChooserPolicy(Policy):
+    """
+    Adapts a per-decision `choose(state, legal) -> action` (as used by
+    strategy_solver) to the Policy interface, one action per call.
+    """
+
+    def __init__(self, name, choose):
+        self.name = name
+        self.choose = choose
+
+    def plan_month(self, obs):
+        return [self.choose(obs, obs.legal_actions)]
+
+
+class RuleOfThumbPolicy(ChooserPolicy):
+    """strategy_solver.HeuristicPolicy with fixed strategy knobs."""
+
+    def __init__(self, **params):
+        choose = strategy_solver.HeuristicPolicy(**params)
+        p = choose.params
+        name = f"rule happy{p['happiness_target']} fund{p['fund_months']}mo {p['surplus']}" + (" +edu" if p['upgrade'] else "")
+        super().__init__(name, choose)
+
+
+class SolverPolicy(Policy):
+    """The strategy solver's cached policy for whichever setup is being played (solved on first use)."""
+    name = "solver"
+
+    def __init__(self, iterations=strategy_solver.DEFAULT_ITERATIONS):
+        self.iterations = iterations
+        self._policies = {}
+        self._current = None
+
+    def reset(self, setup, seed):
+        if setup not in self._policies:
+            self._policies[setup] = strategy_solver.solver_policy(setup, self.iterations)
+        self._current = self._policies[setup]
+
+    def plan_month(self, obs):
+        return [self._current(obs, obs.legal_actions)]
+
+
+class SpendThriftPolicy(Policy):
+    """Plans the whole month up front: as much leisure as possible, cheapest first."""
+    name = "spendthrift"
+
+    def plan_month(self, obs):
+        leisure = [a for a in obs.legal_actions if a.startswith('life_') and LIFE_CHOICES[a[5:]].choice_type == 'leisure']
+        return sorted(leisure, key=lambda a: LIFE_CHOICES[a[5:]].cost)[:ACTIONS_PER_MONTH] + ['end']
+
+
+def default_roster():
+    """Baselines plus every HeuristicPolicy knob combination."""
+    roster = [IdlePolicy(), RandomPolicy(), SpendThriftPolicy()]
+    roster += [RuleOfThumbPolicy(**h.params) for h in strategy_solver.HeuristicPolicy.grid()]
+    return roster
@@ -0,0 +1,85 @@
+"""
+Multi-asset investment portfolio.
+
+A player's investments are a holdings array, one dollar amount per entry of
+ASSETS. Each month every asset returns
+
+    MEAN + volatility * (CHOLESKY @ z)      z ~ N(0, 1), one draw per asset
+
+where CHOLESKY is the lower-triangular factor of the monthly covariance
+built from each asset's volatility and CORRELATION, computed once at import.
+The same expression handles one game (z of shape (assets,)) and a batch of
+games (z of shape (games, assets)) in one matrix product, so
+FinanceSimulation and finance_env.VectorEnv share these rules.
+
+Stocks come first, so the first row of CHOLESKY is the stock market alone:
+with a market tape (market_tape.py) the tape's standardised return replaces
+z[0], and bonds, cash and crypto then move as they would given that stock
+market.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Asset:
+    key: str
+    name: str
+    annual_return: float
+    annual_volatility: float
+    crash_exposure: float       # share of a Market Crash's loss this asset takes
+    description: str
+
+
+ASSETS = (
+    Asset('stocks', "Stocks", 0.07, 0.15, 1.0, "Index fund: solid long-run growth, real swings"),
+    Asset('bonds', "Bonds", 0.035, 0.06, 0.25, "Steadier than stocks, lower return"),
+    Asset('cash', "Money Market", 0.02, 0.005, 0.0, "Almost no risk, barely beats inflation"),
+    Asset('crypto', "Crypto", 0.12, 0.60, 1.5, "Speculative: huge swings both ways"),
+)
+ASSET_KEYS = tuple(a.key for a in ASSETS)
+ASSET_INDEX = {key: i for i, key in enumerate(ASSET_KEYS)}
+DEFAULT_ASSET = 'stocks'
+
+CORRELATION = np.array([
+    # stocks bonds  cash  crypto
+    [1.00,   0.10,  0.00, 0.40],
+    [0.10,   1.00,  0.20, 0.00],
+    [0.00,   0.20,  1.00, 0.00],
+    [0.40,   0.00,  0.00, 1.00],
+])
+MEAN = np.array([a.annual_return for a in ASSETS]) / 12
+_MONTHLY_VOLATILITY = np.array([a.annual_volatility for a in ASSETS]) / 12 ** 0.5
+CHOLESKY = np.linalg.cholesky(CORRELATION * np.outer(_MONTHLY_VOLATILITY, _MONTHLY_VOLATILITY))
+_CHOLESKY_T = np.ascontiguousarray(CHOLESKY.T)
+CRASH_EXPOSURE = np.array([a.crash_exposure for a in ASSETS])
+_ONES = np.ones(len(ASSETS))
+_WORST_RETURN = -0.95       # the normal tails would otherwise take a holding below zero
+_MAX_CRASH_LOSS = 0.95
+
+
+def empty_holdings(games=None):
+    return np.zeros(len(ASSETS) if games is None else (games, len(ASSETS)))
+
+
+def totals(holdings):
+    """Invested total per game (a matrix product: far faster than sum(axis=-1) over so few assets)."""
+    return holdings @ _ONES
+
+
+def monthly_returns(z, volatility=1.0):
+    """Correlated asset returns for standard normals `z` of shape (..., len(ASSETS))."""
+    return np.maximum(MEAN + (z @ _CHOLESKY_T) * volatility, _WORST_RETURN)
+
+
+def crash(holdings, loss):
+    """Apply a Market Crash of `loss` (scalar, or one per game) to `holdings` in place."""
+    holdings *= 1 - np.minimum(np.multiply.outer(loss, CRASH_EXPOSURE), _MAX_CRASH_LOSS)
+    return holdings
+
+
+def allocation(holdings):
+    """Share of the invested total in each asset (zeros when nothing is invested)."""
+    total = totals(holdings)[..., None]
+    return np.divide(holdings, total, out=np.zeros_like(holdings), where=total > 0)
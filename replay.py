@@ -0,0 +1,385 @@
+"""
+Compact, deterministic FinanceQuest replays.
+
+A replay is the game seed, the three setup choices and the ordered list of
+player decisions. Re-running it against FinanceSimulation reproduces the game
+exactly, so recorded games can be re-scored and their training features
+regenerated after balance changes.
+
+File layout (all integers are unsigned LEB128 varints):
+
+    b"FQR\\x01"  seed  class  education  difficulty   (strings: length + utf-8)
+    ops...       each op is a varint code followed by its arguments:
+        1 ACTION      action code (index into finance_sim.ACTION_IDS)
+        2 FINANCIAL   kind (index into FINANCIAL_ACTIONS), amount
+        3 EVENT_CLOSE
+        4 AUTO        action code of the locked action next_month() runs
+        5 END_MONTH
+        6 GAME_OVER   final score (always the last op)
+        7 GAME_LENGTH months_per_game (right after the header; only for
+                      games longer or shorter than MONTHS_PER_GAME)
+        8 MARKET_TAPE tape path (string), crc32 of its data (right after the
+                      header; only for games played on a market tape)
+        9 INVEST_ASSET index into portfolio.ASSET_KEYS that investing targets from now on
+       10 PAYOFF_ORDER index into loans.PAYOFF_ORDERS that paying debt follows from now on
+
+Amounts are varint(dollars << 1) for whole dollars, otherwise varint(1)
+followed by a little-endian double.
+
+    python replay.py verify replays/                re-score and compare
+    python replay.py features replays/ -o goal_training_data.json
+    python replay.py summaries replays/ -o game_summaries.json
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+
+from finance_sim import FinanceSimulation, ACTION_IDS, FINANCIAL_ACTIONS, MONTHS_PER_GAME
+from loans import PAYOFF_ORDERS
+from market_tape import open_tape
+from portfolio import ASSET_KEYS
+
+REPLAY_DIR = "replays"
+REPLAY_MAGIC = b"FQR\x01"
+
+OP_ACTION = 1
+OP_FINANCIAL = 2
+OP_EVENT_CLOSE = 3
+OP_AUTO = 4
+OP_END_MONTH = 5
+OP_GAME_OVER = 6
+OP_GAME_LENGTH = 7
+OP_MARKET_TAPE = 8
+OP_INVEST_ASSET = 9
+OP_PAYOFF_ORDER = 10
+
+_ACTION_CODES = {action_id: i for i, action_id in enumerate(ACTION_IDS)}
+_FINANCIAL_CODES = {kind: i for i, kind in enumerate(FINANCIAL_ACTIONS)}
+_ASSET_CODES = {key: i for i, key in enumerate(ASSET_KEYS)}
+_PAYOFF_CODES = {order: i for i, order in enumerate(PAYOFF_ORDERS)}
+
+
+class Replay:
+    """
+    One recorded game. Also acts as the FinanceSimulation recorder: assign it
+    to `sim.recorder` and the simulation reports every decision to it.
+    """
+
+    def __init__(self, seed, player_class, education, difficulty, ops=None, final_score=None,
+                 months_per_game=MONTHS_PER_GAME, market_tape=None):
+        self.seed = seed
+        self.player_class = player_class
+        self.education = education
+        self.difficulty = difficulty
+        self.months_per_game = months_per_game
+        self.market_tape = market_tape      # (path, checksum) of the tape the game was played on
+        self.ops = ops if ops is not None else []      # [(op, arg, ...), ...]
+        self.final_score = final_score
+
+    @classmethod
+    def for_game(cls, sim):
+        tape = sim.market_tape
+        return cls(sim.seed, sim.selected_class, sim.selected_education, sim.selected_difficulty,
+                   months_per_game=sim.months_per_game,
+                   market_tape=(tape.path, tape.checksum) if tape is not None else None)
+
+    @property
+    def months(self):
+        return sum(1 for op in self.ops if op[0] == OP_END_MONTH)
+
+    # ---------- recorder interface ----------
+    def action(self, action_id):
+        self.ops.append((OP_ACTION, _ACTION_CODES[action_id]))
+
+    def financial(self, action_type, amount):
+        self.ops.append((OP_FINANCIAL, _FINANCIAL_CODES[action_type], amount))
+
+    def invest_asset(self, asset_key):
+        self.ops.append((OP_INVEST_ASSET, _ASSET_CODES[asset_key]))
+
+    def payoff_order(self, order):
+        self.ops.append((OP_PAYOFF_ORDER, _PAYOFF_CODES[order]))
+
+    def event_close(self):
+        self.ops.append((OP_EVENT_CLOSE,))
+
+    def end_month(self, auto_action_id):
+        if auto_action_id is not None:
+            self.ops.append((OP_AUTO, _ACTION_CODES[auto_action_id]))
+        self.ops.append((OP_END_MONTH,))
+
+    def game_over(self, score):
+        self.final_score = score
+
+
+# ============================================================
+# ENCODING
+# ============================================================
+
+def _put_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _put_str(out, s):
+    raw = s.encode('utf-8')
+    _put_varint(out, len(raw))
+    out += raw
+
+
+def _get_str(data, pos):
+    n, pos = _get_varint(data, pos)
+    return data[pos:pos + n].decode('utf-8'), pos + n
+
+
+def _put_amount(out, amount):
+    if float(amount).is_integer() and amount >= 0:
+        _put_varint(out, int(amount) << 1)
+    else:
+        _put_varint(out, 1)
+        out += struct.pack('<d', amount)
+
+
+def _get_amount(data, pos):
+    tag, pos = _get_varint(data, pos)
+    if tag & 1:
+        return struct.unpack_from('<d', data, pos)[0], pos + 8
+    return tag >> 1, pos
+
+
+def encode_replay(replay):
+    out = bytearray(REPLAY_MAGIC)
+    _put_varint(out, replay.seed)
+    for s in (replay.player_class, replay.education, replay.difficulty):
+        _put_str(out, s)
+    if replay.months_per_game != MONTHS_PER_GAME:
+        _put_varint(out, OP_GAME_LENGTH)
+        _put_varint(out, replay.months_per_game)
+    if replay.market_tape is not None:
+        _put_varint(out, OP_MARKET_TAPE)
+        _put_str(out, replay.market_tape[0])
+        _put_varint(out, replay.market_tape[1])
+    for op in replay.ops:
+        _put_varint(out, op[0])
+        if op[0] in (OP_ACTION, OP_AUTO, OP_INVEST_ASSET, OP_PAYOFF_ORDER):
+            _put_varint(out, op[1])
+        elif op[0] == OP_FINANCIAL:
+            _put_varint(out, op[1])
+            _put_amount(out, op[2])
+    if replay.final_score is not None:
+        _put_varint(out, OP_GAME_OVER)
+        _put_varint(out, replay.final_score)
+    return bytes(out)
+
+
+def decode_replay(data):
+    if data[:4] != REPLAY_MAGIC:
+        raise ValueError("not a FinanceQuest replay")
+    pos = 4
+    seed, pos = _get_varint(data, pos)
+    player_class, pos = _get_str(data, pos)
+    education, pos = _get_str(data, pos)
+    difficulty, pos = _get_str(data, pos)
+    ops, final_score, months_per_game, market_tape = [], None, MONTHS_PER_GAME, None
+    while pos < len(data):
+        op, pos = _get_varint(data, pos)
+        if op in (OP_ACTION, OP_AUTO, OP_INVEST_ASSET, OP_PAYOFF_ORDER):
+            code, pos = _get_varint(data, pos)
+            ops.append((op, code))
+        elif op == OP_FINANCIAL:
+            kind, pos = _get_varint(data, pos)
+            amount, pos = _get_amount(data, pos)
+            ops.append((op, kind, amount))
+        elif op in (OP_EVENT_CLOSE, OP_END_MONTH):
+            ops.append((op,))
+        elif op == OP_GAME_OVER:
+            final_score, pos = _get_varint(data, pos)
+        elif op == OP_GAME_LENGTH:
+            months_per_game, pos = _get_varint(data, pos)
+        elif op == OP_MARKET_TAPE:
+            path, pos = _get_str(data, pos)
+            checksum, pos = _get_varint(data, pos)
+            market_tape = (path, checksum)
+        else:
+            raise ValueError(f"unknown replay op {op}")
+    return Replay(seed, player_class, education, difficulty, ops, final_score, months_per_game, market_tape)
+
+
+def save_replay(replay, directory=REPLAY_DIR):
+    os.makedirs(directory, exist_ok=True)
+    name = f"replay_{time.strftime('%Y%m%d_%H%M%S')}_{replay.seed:08x}.fqr"
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        f.write(encode_replay(replay))
+    return path
+
+
+def load_replay(path):
+    with open(path, 'rb') as f:
+        return decode_replay(f.read())
+
+
+def list_replays(*paths):
+    """Replay files under the given files/directories, oldest first."""
+    found = []
+    for path in paths or (REPLAY_DIR,):
+        if os.path.isdir(path):
+            found += [os.path.join(path, n) for n in os.listdir(path) if n.endswith('.fqr')]
+        elif os.path.exists(path):
+            found.append(path)
+    return sorted(found, key=os.path.getmtime)
+
+
+# ============================================================
+# PLAYBACK
+# ============================================================
+
+def replay_steps(sim, replay):
+    """Set up `sim` from `replay`; returns a generator applying its ops one by one."""
+    sim.selected_class = replay.player_class
+    sim.selected_education = replay.education
+    sim.selected_difficulty = replay.difficulty
+    sim.months_per_game = replay.months_per_game
+    sim.market_tape = None
+    if replay.market_tape is not None:
+        path, checksum = replay.market_tape
+        tape = open_tape(path)
+        if tape.checksum != checksum:
+            raise ValueError(f"replay was played on a different {path} (checksum {checksum:08x}, found {tape.checksum:08x})")
+        sim.market_tape = tape
+    sim.start_game(replay.seed)
+    sim.recorder = None     # never re-record a replay
+    return _apply_ops(sim, replay.ops)
+
+
+def _apply_ops(sim, ops):
+    auto = None
+    for op in ops:
+        code = op[0]
+        if code == OP_ACTION:
+            sim._action_callback(ACTION_IDS[op[1]])()
+        elif code == OP_FINANCIAL:
+            sim.execute_financial_action(FINANCIAL_ACTIONS[op[1]], op[2])
+        elif code == OP_INVEST_ASSET:
+            sim.set_invest_asset(ASSET_KEYS[op[1]])
+        elif code == OP_PAYOFF_ORDER:
+            sim.set_payoff_order(PAYOFF_ORDERS[op[1]])
+        elif code == OP_EVENT_CLOSE:
+            sim.handle_event_close()
+        elif code == OP_AUTO:
+            auto = ACTION_IDS[op[1]]
+            continue
+        elif code == OP_END_MONTH:
+            sim.lock_action(auto)
+            auto = None
+            sim.next_month()
+        yield op
+
+
+def run_replay(replay, sim=None):
+    """Re-run `replay` headless and return the finished simulation."""
+    sim = sim if sim is not None else FinanceSimulation()
+    for _ in replay_steps(sim, replay):
+        pass
+    return sim
+
+
+class ReplayPlayer:
+    """Steps a replay on a live game at an adjustable number of ops per second."""
+    SPEEDS = (1, 2, 4, 8, 16, 32, 64)
+
+    def __init__(self, sim, replay, speed_index=2):
+        self.replay = replay
+        self.speed_index = speed_index
+        self.done = False
+        self._steps = replay_steps(sim, replay)
+        self._budget = 0.0
+
+    @property
+    def speed(self):
+        return self.SPEEDS[self.speed_index]
+
+    def faster(self):
+        self.speed_index = min(self.speed_index + 1, len(self.SPEEDS) - 1)
+
+    def slower(self):
+        self.speed_index = max(self.speed_index - 1, 0)
+
+    def advance(self, dt_ms):
+        """Apply as many ops as `dt_ms` of playback allows; returns False once finished."""
+        self._budget += dt_ms / 1000 * self.speed
+        while self._budget >= 1 and not self.done:
+            self._budget -= 1
+            if next(self._steps, None) is None:
+                self.done = True
+        return not self.done
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+def _rerun_all(paths):
+    for path in list_replays(*paths):
+        replay = load_replay(path)
+        try:
+            sim = run_replay(replay)
+        except (OSError, ValueError) as e:     # its market tape is missing or was rebuilt
+            print(f"{path}: skipped ({e})")
+            continue
+        yield path, replay, sim
+
+
+def _write_rows(rows, out):
+    with open(out, 'w') as f:
+        json.dump(rows, f, indent=2)
+    print(f"Wrote {len(rows)} rows to {out}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-run recorded FinanceQuest games.")
+    parser.add_argument('command', choices=['verify', 'features', 'summaries'])
+    parser.add_argument('paths', nargs='*', help=f"replay files or directories (default: {REPLAY_DIR}/)")
+    parser.add_argument('-o', '--out', help="JSON file to write (features / summaries)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.command == 'verify':
+        total = mismatched = 0
+        for path, replay, sim in _rerun_all(args.paths):
+            total += 1
+            score = sim.calculate_score()
+            if score != replay.final_score:
+                mismatched += 1
+                print(f"{path}: recorded {replay.final_score}, replayed {score}")
+        print(f"{total - mismatched}/{total} replays reproduce their recorded score "
+              f"({time.perf_counter() - start:.2f}s)")
+        return 1 if mismatched else 0
+
+    build = FinanceSimulation.goal_training_row if args.command == 'features' else FinanceSimulation.game_summary
+    rows = [row for _, _, sim in _rerun_all(args.paths) for row in [build(sim)] if row is not None]
+    if args.out:
+        _write_rows(rows, args.out)
+    else:
+        json.dump(rows, sys.stdout, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
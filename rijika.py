@@ -4,11 +4,14 @@ import random
 import json
 import os
 from enum import Enum
-from dataclasses import dataclass
 from typing import List, Dict, Optional, Callable
 import math
 import uuid
 import threading
+import functools
+from abc import ABC, abstractmethod
+import bisect
+from collections import OrderedDict
 
 import pandas as pd
 import matplotlib
@@ -28,6 +31,17 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables.history import RunnableWithMessageHistory
 from langchain_community.chat_message_histories import ChatMessageHistory
 
+from finance_sim import FinanceSimulation, MONTHS_PER_GAME, GAME_LENGTHS, ACTIONS_PER_MONTH, DROPDOWN_AMOUNTS, LEISURE_HAPPINESS_CAP, VEHICLE_UPKEEP
+from monthly_log import lttb
+from portfolio import ASSETS, ASSET_INDEX
+from loans import PAYOFF_ORDERS, PAYOFF_ORDER_NAMES
+from replay import Replay, ReplayPlayer, save_replay, load_replay, list_replays
+from leaderboard import Leaderboard, entry_for
+from savegame import Autosave, load_autosave
+from whatif import WhatIfEvaluator
+import policies
+import market_tape
+
 load_dotenv()
 
 pygame.init()
@@ -35,6 +49,22 @@ pygame.init()
 SCREEN_WIDTH = 1400
 SCREEN_HEIGHT = 950
 FPS = 60
+DASHBOARD_POINTS = 300      # long games are downsampled to this many points per chart line
+AUTOPILOT_MONTHS = 12
+ACHIEVEMENT_TOAST_MS = 3000     # how long an unlocked achievement stays on screen
+ACHIEVEMENT_TOASTS_SHOWN = 3
+TITLE_TOP_SCORES = 8            # leaderboard rows on the title screen
+# Buttons of the playing screen that stay put; everything else is the action list
+FIXED_PLAYING_BUTTONS = ("next_month", "autopilot", "help", "chatbot", "predict")
+# The game state each playing-screen widget shows; when any of it changes the widget is refreshed
+# (FinanceSimulation.subscribe). legal_moves covers every field the action buttons' enabled states read.
+WIDGET_FIELDS = {
+    'actions': ('legal_moves', 'invest_asset', 'payoff_order', 'locked_action'),
+    'header': ('current_month', 'months_per_game', 'money', 'net_worth'),
+    'goals': ('goals',),
+    'advisor': ('current_month', 'money', 'debt', 'investments', 'emergency_fund', 'happiness', 'stress',
+                'actions_remaining'),
+}
 
 COLOR_BG = (10, 15, 25)
 COLOR_PANEL = (20, 30, 45)
@@ -49,11 +79,6 @@ COLOR_ACCENT = (180, 100, 255)
 COLOR_BORDER = (60, 80, 100)
 COLOR_GRADIENT_START = (0, 150, 255)
 COLOR_GRADIENT_END = (100, 50, 200)
-MONTHS_PER_GAME = 24
-STARTING_HAPPINESS = 50
-BURNOUT_STRESS = 100
-BURNOUT_HAPPINESS = 10
-ACTIONS_PER_MONTH = 3
 
 AVATARS = [
     {"emoji": "👨‍💼", "label": "Executive"},
@@ -109,19 +134,199 @@ AVATAR_BG_COLORS = [
     ((200, 200, 200), "Silver"),
 ]
 
-def draw_composite_avatar(screen, face_emoji, acc_data, x, y, font_size):
-    font = pygame.font.SysFont("Segoe UI Emoji", int(font_size))
+# ============================================================
+# SPRITE CACHES
+# ============================================================
+
+_gradient_sprite_cache = {}
+
+
+def get_gradient_sprite(width, height, top_color, bottom_color):
+    """Vertical gradient surface, rendered once per (size, colours) and reused."""
+    key = (width, height, tuple(top_color[:3]), tuple(bottom_color[:3]))
+    sprite = _gradient_sprite_cache.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((max(1, width), max(1, height)))
+        for i in range(height):
+            ratio = i / height
+            color = (
+                int(top_color[0] * (1 - ratio) + bottom_color[0] * ratio),
+                int(top_color[1] * (1 - ratio) + bottom_color[1] * ratio),
+                int(top_color[2] * (1 - ratio) + bottom_color[2] * ratio)
+            )
+            pygame.draw.line(sprite, color, (0, i), (width, i))
+        _gradient_sprite_cache[key] = sprite
+    return sprite
+
+
+_shadow_sprite_cache = {}
+
+
+def get_shadow_sprite(width, height, alpha):
+    """Translucent black drop-shadow surface, cached per size and alpha."""
+    key = (width, height, alpha)
+    sprite = _shadow_sprite_cache.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((width, height), pygame.SRCALPHA)
+        sprite.fill((0, 0, 0, alpha))
+        _shadow_sprite_cache[key] = sprite
+    return sprite
+
+
+_dim_overlay_cache = {}
+
+
+def get_dim_overlay(alpha):
+    """Full-screen black overlay at the given alpha, allocated once per alpha level."""
+    overlay = _dim_overlay_cache.get(alpha)
+    if overlay is None:
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, alpha))
+        _dim_overlay_cache[alpha] = overlay
+    return overlay
+
+
+@functools.lru_cache(maxsize=None)
+def get_font(name, size, bold=False):
+    """Shared Font object per (name, size, bold); SysFont lookups are too slow for per-frame use."""
+    return pygame.font.SysFont(name, size, bold=bold)
+
+
+def get_bar_sprite(width, height, color):
+    """Pre-shaded progress bar fill: full colour at the top, 70% at the bottom."""
+    shaded = (color[0] * 0.7, color[1] * 0.7, color[2] * 0.7)
+    return get_gradient_sprite(width, height, color, shaded)
+
+
+# ============================================================
+# TEXT LAYOUT
+# ============================================================
+
+WRAP_CACHE_SIZE = 256
+_wrap_cache = OrderedDict()
+
+
+def _wrap_paragraph(words, font, max_width, lines):
+    """Greedy wrap of one paragraph using cumulative word widths.
+
+    cum[k] is the width of words[:k] each followed by a space, so the line
+    words[i:j] is about cum[j] - cum[i] - space wide and the break point for a
+    line starting at i is a bisect on cum.  Kerning makes that estimate off by
+    a few pixels, so the guess is then nudged against the measured line,
+    which keeps the result identical to a word-by-word greedy wrap.  A word
+    wider than max_width still gets a line of its own.
+    """
+    space = font.size(' ')[0]
+    cum = [0]
+    for word in words:
+        cum.append(cum[-1] + font.size(word)[0] + space)
+    i, n = 0, len(words)
+    while i < n:
+        j = max(bisect.bisect_right(cum, cum[i] + max_width + space, i + 1) - 1, i + 1)
+        while j > i + 1 and font.size(' '.join(words[i:j]))[0] > max_width:
+            j -= 1
+        while j < n and font.size(' '.join(words[i:j + 1]))[0] <= max_width:
+            j += 1
+        lines.append(' '.join(words[i:j]))
+        i = j
+
+
+def wrap_text(text, font, max_width, keep_newlines=False):
+    """Word-wrapped lines for `text`, memoized per (text, font, max_width).
+
+    With keep_newlines, each '\n'-separated paragraph wraps on its own and
+    blank paragraphs become empty lines.  Returns a shared tuple.
+    """
+    key = (text, font, max_width, keep_newlines)
+    lines = _wrap_cache.get(key)
+    if lines is not None:
+        _wrap_cache.move_to_end(key)
+        return lines
+    out = []
+    if keep_newlines:
+        for para in text.split('\n'):
+            words = para.split()
+            if words:
+                _wrap_paragraph(words, font, max_width, out)
+            else:
+                out.append('')
+    else:
+        _wrap_paragraph(text.split(), font, max_width, out)
+    lines = tuple(out)
+    _wrap_cache[key] = lines
+    if len(_wrap_cache) > WRAP_CACHE_SIZE:
+        _wrap_cache.popitem(last=False)
+    return lines
+
+
+AVATAR_SPRITE_CACHE_SIZE = 64
+_avatar_sprite_cache = OrderedDict()
+_emoji_atlas_cache = {}
+
+
+def get_avatar_sprite(face_emoji, acc_data, font_size, bg_color=None, bg_radius=0, ring_color=None):
+    """
+    Avatar composited once per (face, accessory, background, size).
+
+    Returns (surface, (cx, cy)) where (cx, cy) is the avatar centre inside the
+    surface; blit at (x - cx, y - cy) to centre it on (x, y).  With bg_color
+    the filled circle (and a 2px ring 2px outside it) is baked in as well.
+    """
+    acc_emoji, _, offsets = acc_data if acc_data else (None, None, (0, 0))
+    key = (face_emoji, acc_emoji, tuple(offsets), font_size, bg_color, bg_radius, ring_color)
+    cached = _avatar_sprite_cache.get(key)
+    if cached is not None:
+        _avatar_sprite_cache.move_to_end(key)
+        return cached
+    font = get_font("Segoe UI Emoji", int(font_size))
     face_surf = font.render(face_emoji, True, COLOR_TEXT)
-    face_rect = face_surf.get_rect(center=(x, y))
-    screen.blit(face_surf, face_rect)
-    if acc_data and acc_data[0]:
-        acc_emoji, _, offsets = acc_data
-        off_x_pct, off_y_pct = offsets
-        pixel_x = x + (font_size * off_x_pct)
-        pixel_y = y + (font_size * off_y_pct)
+    face_rect = face_surf.get_rect(center=(0, 0))
+    bounds = face_rect.copy()
+    acc_surf = acc_rect = None
+    if acc_emoji:
         acc_surf = font.render(acc_emoji, True, COLOR_TEXT)
-        acc_rect = acc_surf.get_rect(center=(pixel_x, pixel_y))
-        screen.blit(acc_surf, acc_rect)
+        acc_rect = acc_surf.get_rect(center=(font_size * offsets[0], font_size * offsets[1]))
+        bounds.union_ip(acc_rect)
+    if bg_color is not None:
+        outer = bg_radius + 2 if ring_color is not None else bg_radius
+        bounds.union_ip(pygame.Rect(-outer, -outer, outer * 2 + 1, outer * 2 + 1))
+    # keep the centre on an integer pixel well inside the surface so the
+    # accessory offset truncates exactly as it does when drawn on screen
+    pad = max(-bounds.left, -bounds.top, bounds.right, bounds.bottom) + 1
+    surf = pygame.Surface((pad * 2, pad * 2), pygame.SRCALPHA)
+    # transparent pixels carry the glyph colour so antialiased edges don't
+    # pick up black when the sprite is blended onto the screen
+    surf.fill((*COLOR_TEXT, 0))
+    if bg_color is not None:
+        pygame.draw.circle(surf, bg_color, (pad, pad), bg_radius)
+        if ring_color is not None:
+            pygame.draw.circle(surf, ring_color, (pad, pad), bg_radius + 2, 2)
+    surf.blit(face_surf, face_surf.get_rect(center=(pad, pad)))
+    if acc_surf is not None:
+        surf.blit(acc_surf, acc_surf.get_rect(center=(pad + font_size * offsets[0], pad + font_size * offsets[1])))
+    cached = (surf, (pad, pad))
+    _avatar_sprite_cache[key] = cached
+    if len(_avatar_sprite_cache) > AVATAR_SPRITE_CACHE_SIZE:
+        _avatar_sprite_cache.popitem(last=False)
+    return cached
+
+
+def draw_composite_avatar(screen, face_emoji, acc_data, x, y, font_size, bg_color=None, bg_radius=0, ring_color=None):
+    surf, (cx, cy) = get_avatar_sprite(face_emoji, acc_data, font_size, bg_color, bg_radius, ring_color)
+    screen.blit(surf, (x - cx, y - cy))
+
+
+def get_emoji_atlas(font_size):
+    """Every face, accessory and quick-pick emoji rendered once at `font_size`."""
+    atlas = _emoji_atlas_cache.get(font_size)
+    if atlas is None:
+        font = get_font("Segoe UI Emoji", font_size)
+        emojis = [em for em, _ in AVATAR_FACES]
+        emojis += [em or "∅" for em, _, _ in AVATAR_ACCESSORIES]
+        emojis += [av["emoji"] for av in AVATARS]
+        atlas = {em: font.render(em, True, COLOR_TEXT) for em in emojis}
+        _emoji_atlas_cache[font_size] = atlas
+    return atlas
 
 
 # ============================================================
@@ -219,16 +424,7 @@ Response: Concise (2–3 sentences max). Use emojis occasionally to be friendly.
         """
 
     def get_context_from_game(self, game):
-        return {
-            'month': game.current_month,
-            'money': game.money,
-            'debt': game.debt,
-            'investments': game.investments,
-            'emergency_fund': game.emergency_fund,
-            'happiness': game.happiness,
-            'stress': game.stress,
-            'actions_remaining': game.actions_remaining
-        }
+        return game.observe().context()
 
     def _hardcoded_response(self, question, game_state=None):
         question = question.lower()
@@ -304,24 +500,7 @@ def draw_chatbot_icon(screen, x, y, is_thinking=False, has_new_message=False):
 
 def _wrap_text_modal(text, font, max_width):
     """Word-wrap helper that respects newlines in the text."""
-    paragraphs = text.split('\n')
-    all_lines = []
-    for para in paragraphs:
-        words = para.split()
-        if not words:
-            all_lines.append('')
-            continue
-        current_line = []
-        for word in words:
-            current_line.append(word)
-            if font.size(' '.join(current_line))[0] > max_width:
-                current_line.pop()
-                if current_line:
-                    all_lines.append(' '.join(current_line))
-                current_line = [word]
-        if current_line:
-            all_lines.append(' '.join(current_line))
-    return all_lines
+    return wrap_text(text, font, max_width, keep_newlines=True)
 
 
 def draw_chatbot_modal(screen, font, chatbot, input_text="", input_active=False, game_state=None):
@@ -345,7 +524,7 @@ def draw_chatbot_modal(screen, font, chatbot, input_text="", input_active=False,
     MAX_LINES   = 14          # cap bubble growth at this many lines
     FONT_SIZE   = 16
 
-    font_small = pygame.font.SysFont("Arial", FONT_SIZE)
+    font_small = get_font("Arial", FONT_SIZE)
 
     # ── measure how many lines the current response needs ──────────────────
     bubble_inner_w = MODAL_W - 60 - BUBBLE_PAD * 2   # bubble width minus padding
@@ -380,10 +559,10 @@ def draw_chatbot_modal(screen, font, chatbot, input_text="", input_active=False,
     pygame.draw.rect(screen, COLOR_PANEL,
                      (modal_x, modal_y, MODAL_W, HEADER_H),
                      border_top_left_radius=20, border_top_right_radius=20)
-    avatar_font = pygame.font.SysFont("Segoe UI Emoji", 36)
+    avatar_font = get_font("Segoe UI Emoji", 36)
     screen.blit(avatar_font.render("🦊", True, COLOR_TEXT),
                 (modal_x + 16, modal_y + 14))
-    title_font = pygame.font.SysFont("Arial", 22, bold=True)
+    title_font = get_font("Arial", 22, bold=True)
     screen.blit(
         title_font.render(f"{chatbot.name} – Financial Assistant", True, COLOR_PRIMARY),
         (modal_x + 70, modal_y + 22),
@@ -408,7 +587,7 @@ def draw_chatbot_modal(screen, font, chatbot, input_text="", input_active=False,
 
     # overflow indicator
     if len(wrapped) > MAX_LINES:
-        more_font = pygame.font.SysFont("Arial", 13)
+        more_font = get_font("Arial", 13)
         more_surf = more_font.render("▾ scroll for more", True, COLOR_ACCENT)
         screen.blit(more_surf,
                     (bubble_x + bubble_w - more_surf.get_width() - 8,
@@ -431,7 +610,7 @@ def draw_chatbot_modal(screen, font, chatbot, input_text="", input_active=False,
         display  = "Ask Finley anything… " + cursor if input_active else "💬  Ask Finley anything…"
         txt_col  = COLOR_TEXT_DIM
 
-    inp_font = pygame.font.SysFont("Arial", 15)
+    inp_font = get_font("Arial", 15)
     inp_surf = inp_font.render(display, True, txt_col)
     # vertically centre inside input box
     screen.blit(inp_surf, (input_rect.x + 12,
@@ -455,58 +634,6 @@ class GameState(Enum):
     GAME_OVER = 5
 
 
-@dataclass
-class ClassConfig:
-    name: str
-    starting_money: float
-    rent: float
-    groceries: float
-    transport: float
-    debt: float
-    description: str
-    avatar_emoji: str = "👤"
-
-
-@dataclass
-class EducationConfig:
-    name: str
-    cost: float
-    income: float
-    description: str
-
-
-@dataclass
-class DifficultyConfig:
-    name: str
-    emergency_chance: float
-    market_volatility: float
-    description: str
-
-
-@dataclass
-class LifeChoice:
-    name: str
-    cost: float
-    happiness: float
-    stress: float
-    choice_type: str
-    debuff_chance: float = 0.0
-    debuff: str = ""
-    win_chance: float = 0.0
-    win_amount: float = 0.0
-    one_time: bool = False
-
-
-@dataclass
-class EmergencyEvent:
-    name: str
-    description: str
-    cost: float = 0
-    months_no_income: int = 0
-    investment_loss: float = 0.0
-    stress_increase: float = 0
-
-
 class Button:
     def __init__(self, x, y, width, height, text, color=COLOR_PANEL, text_color=COLOR_TEXT,
                  button_id="", tooltip="", gradient=False, icon=None):
@@ -539,9 +666,11 @@ class Button:
             self._cache_dirty = False
         return self._text_cache[cache_key]
 
-    def draw(self, screen, font):
+    def draw(self, screen, font, origin=(0, 0)):
+        """Draw the button; `origin` is the top-left of `screen` in screen coordinates."""
         if not self.visible:
             return
+        rect = self.rect.move(-origin[0], -origin[1]) if origin != (0, 0) else self.rect
         if self.button_id == "next_month" and self.enabled:
             self.pulse += 0.05 * self.pulse_dir
             if self.pulse > 1 or self.pulse < 0:
@@ -565,27 +694,19 @@ class Button:
         if self.enabled:
             shadow_offset = 6 if self.hover else 3
             shadow_alpha = 100 if self.hover else 50
-            shadow_surf = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-            shadow_surf.fill((0, 0, 0, shadow_alpha))
-            screen.blit(shadow_surf, (self.rect.x + shadow_offset, self.rect.y + shadow_offset + pulse_offset))
+            shadow_surf = get_shadow_sprite(rect.width, rect.height, shadow_alpha)
+            screen.blit(shadow_surf, (rect.x + shadow_offset, rect.y + shadow_offset + pulse_offset))
         if self.gradient and self.enabled:
-            for i in range(self.rect.height):
-                ratio = i / self.rect.height
-                color = (
-                    int(COLOR_GRADIENT_START[0] * (1 - ratio) + COLOR_GRADIENT_END[0] * ratio),
-                    int(COLOR_GRADIENT_START[1] * (1 - ratio) + COLOR_GRADIENT_END[1] * ratio),
-                    int(COLOR_GRADIENT_START[2] * (1 - ratio) + COLOR_GRADIENT_END[2] * ratio)
-                )
-                pygame.draw.line(screen, color,
-                                 (self.rect.x, self.rect.y + i - pulse_offset),
-                                 (self.rect.x + self.rect.width, self.rect.y + i - pulse_offset))
+            sprite = get_gradient_sprite(rect.width, rect.height,
+                                         COLOR_GRADIENT_START, COLOR_GRADIENT_END)
+            screen.blit(sprite, (rect.x, rect.y - pulse_offset))
         else:
-            button_y = self.rect.y - (2 if self.hover else 0) - pulse_offset
-            button_rect = pygame.Rect(self.rect.x, button_y, self.rect.width, self.rect.height)
+            button_y = rect.y - (2 if self.hover else 0) - pulse_offset
+            button_rect = pygame.Rect(rect.x, button_y, rect.width, rect.height)
             pygame.draw.rect(screen, draw_color, button_rect, border_radius=12)
         border_width = 3 if self.hover else 2
         if self.enabled:
-            button_rect = pygame.Rect(self.rect.x, self.rect.y - pulse_offset, self.rect.width, self.rect.height)
+            button_rect = pygame.Rect(rect.x, rect.y - pulse_offset, rect.width, rect.height)
             pygame.draw.rect(screen, border_color, button_rect, border_width, border_radius=12)
         display_text = self.text
         if self.icon:
@@ -598,24 +719,15 @@ class Button:
                 center=(button_rect.centerx, start_y + i * font.get_linesize() + font.get_linesize() // 2))
             screen.blit(text_surface, text_rect)
 
-    def draw_tooltip(self, screen, font):
+    def draw_tooltip(self, screen, font, extra=""):
         if not self.hover or not self.tooltip or not self.enabled:
             return
         padding = 12
-        tooltip_font = pygame.font.SysFont("Arial", 14, bold=True)
+        tooltip_font = get_font("Arial", 14, bold=True)
         max_width = 350
-        words = self.tooltip.split()
-        lines = []
-        current_line = []
-        for word in words:
-            current_line.append(word)
-            if tooltip_font.size(' '.join(current_line))[0] > max_width - padding * 2:
-                current_line.pop()
-                if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
-        if current_line:
-            lines.append(' '.join(current_line))
+        lines = wrap_text(self.tooltip, tooltip_font, max_width - padding * 2)
+        if extra:
+            lines += wrap_text(extra, tooltip_font, max_width - padding * 2, keep_newlines=True)
         line_height = tooltip_font.get_linesize()
         tooltip_width = max(tooltip_font.size(line)[0] for line in lines) + padding * 2
         tooltip_height = len(lines) * line_height + padding * 2
@@ -658,6 +770,39 @@ class Button:
             self._cache_dirty = True
 
 
+class HitGrid:
+    """
+    Uniform-grid spatial index over widget rects.
+
+    Each widget is bucketed into every cell its rect touches, so a point query
+    only tests the handful of widgets sharing that cell. Rects are copied on
+    insert; rebuild the grid when the layout changes.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, widget, rect):
+        rect = pygame.Rect(rect)
+        cs = self.cell_size
+        for cx in range(rect.left // cs, (rect.right - 1) // cs + 1):
+            for cy in range(rect.top // cs, (rect.bottom - 1) // cs + 1):
+                self.cells.setdefault((cx, cy), []).append((rect, widget))
+
+    def query(self, pos):
+        """Topmost (last inserted) widget whose rect contains `pos`, or None."""
+        bucket = self.cells.get((pos[0] // self.cell_size, pos[1] // self.cell_size))
+        if bucket:
+            for rect, widget in reversed(bucket):
+                if rect.collidepoint(pos):
+                    return widget
+        return None
+
+
 # ============================================================
 # CUSTOM AVATAR CREATOR STATE
 # ============================================================
@@ -671,6 +816,7 @@ class CustomAvatarCreator:
         self.custom_emoji_text = ""
         self.custom_emoji_input_active = False
         self.tab = 'builder'
+        self._sprites = {}
 
     def get_avatar_composition(self):
         if self.custom_emoji_text.strip():
@@ -682,12 +828,203 @@ class CustomAvatarCreator:
     def get_bg_color(self):
         return AVATAR_BG_COLORS[self.selected_bg_idx][0]
 
+    def get_sprite(self, font_size, bg_radius=0, ring_color=None):
+        """Composited preview of the current selection, kept until the selection changes."""
+        key = (font_size, bg_radius, ring_color)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            face, acc_data = self.get_avatar_composition()
+            bg = self.get_bg_color() if bg_radius else None
+            sprite = get_avatar_sprite(face, acc_data, font_size, bg, bg_radius, ring_color)
+            self._sprites[key] = sprite
+        return sprite
+
+    def select_face(self, idx, custom_text=""):
+        self.selected_face_idx = idx
+        self.set_custom_emoji(custom_text)
+
+    def select_accessory(self, idx):
+        self.selected_acc_idx = idx
+        self.set_custom_emoji("")
+
+    def select_bg(self, idx):
+        self.selected_bg_idx = idx
+        self._sprites.clear()
+
+    def set_custom_emoji(self, text):
+        self.custom_emoji_text = text
+        self._sprites.clear()
+
     def reset_custom(self):
-        self.custom_emoji_text = ""
+        self.set_custom_emoji("")
         self.custom_emoji_input_active = False
 
 
-class FinanceGame:
+# ============================================================
+# MODAL LAYERS
+# ============================================================
+
+class Modal(ABC):
+    """
+    Retained-mode overlay pushed on FinanceGame.modal_stack.
+
+    The static part of the modal is rendered once into `self.surface` by
+    `render()`; every frame the main loop only blits the dimming overlay and
+    that surface. While a modal is on top of the stack it receives all input
+    events and the screen underneath keeps animating without input.
+    """
+    dim_alpha = 200
+
+    def __init__(self):
+        self.surface = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.closed = False
+
+    @abstractmethod
+    def render(self, game):
+        """The modal's static part as a Surface the size of `self.rect`."""
+
+    def draw(self, game, screen):
+        if self.surface is None:
+            self.surface = self.render(game)
+        screen.blit(get_dim_overlay(self.dim_alpha), (0, 0))
+        screen.blit(self.surface, self.rect)
+
+    def handle_event(self, game, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.close()
+
+    def close(self):
+        self.closed = True
+
+
+class GoalPredictionModal(Modal):
+    def __init__(self, results):
+        super().__init__()
+        self.results = results
+        panel_w, panel_h = 500, 350
+        self.rect = pygame.Rect((SCREEN_WIDTH - panel_w) // 2, (SCREEN_HEIGHT - panel_h) // 2, panel_w, panel_h)
+        self.close_rect = pygame.Rect(self.rect.right - 60, self.rect.y + 10, 40, 40)
+
+    def render(self, game):
+        panel_w, panel_h = self.rect.size
+        surf = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
+        pygame.draw.rect(surf, COLOR_PANEL, (0, 0, panel_w, panel_h), border_radius=15)
+        pygame.draw.rect(surf, COLOR_ACCENT, (0, 0, panel_w, panel_h), 3, border_radius=15)
+        title = game.font_medium.render("Goal Completion Odds", True, COLOR_PRIMARY)
+        surf.blit(title, title.get_rect(center=(panel_w // 2, 30)))
+        y = 70
+        for goal, prob in self.results.items():
+            color = COLOR_SUCCESS if prob > 0.7 else COLOR_WARNING if prob > 0.3 else COLOR_DANGER
+            surf.blit(game.font_small.render(f"{goal}: {prob*100:.1f}%", True, color), (30, y))
+            # progress bar
+            bar_x, bar_y, bar_w, bar_h = 200, y - 5, 250, 20
+            pygame.draw.rect(surf, COLOR_PANEL_HOVER, (bar_x, bar_y, bar_w, bar_h), border_radius=5)
+            pygame.draw.rect(surf, color, (bar_x, bar_y, int(bar_w * prob), bar_h), border_radius=5)
+            y += 40
+        close_btn = Button(self.close_rect.x - self.rect.x, self.close_rect.y - self.rect.y, 40, 40,
+                           "✕", COLOR_DANGER, COLOR_TEXT, "close_pred")
+        close_btn.draw(surf, game.font_small)
+        return surf
+
+    def handle_event(self, game, event):
+        super().handle_event(game, event)
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.close_rect.collidepoint(event.pos):
+                self.close()
+
+
+class DashboardModal(Modal):
+    dim_alpha = 180
+
+    def __init__(self, dashboard_surface):
+        super().__init__()
+        width, height = dashboard_surface.get_size()
+        self.dashboard_surface = dashboard_surface
+        self.rect = pygame.Rect((SCREEN_WIDTH - width) // 2, (SCREEN_HEIGHT - height) // 2, width, height)
+        close_btn_size = 40
+        self.close_rect = pygame.Rect(self.rect.right - close_btn_size - 10, self.rect.y + 10,
+                                      close_btn_size, close_btn_size)
+
+    def render(self, game):
+        surf = self.dashboard_surface.copy()
+        local = self.close_rect.move(-self.rect.x, -self.rect.y)
+        pygame.draw.rect(surf, COLOR_DANGER, local, border_radius=8)
+        pygame.draw.rect(surf, COLOR_TEXT, local, 2, border_radius=8)
+        label = game.font_medium.render("✕", True, COLOR_TEXT)
+        surf.blit(label, label.get_rect(center=local.center))
+        return surf
+
+    def handle_event(self, game, event):
+        super().handle_event(game, event)
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.close_rect.collidepoint(event.pos):
+                self.close()
+
+
+class AutopilotSummaryModal(Modal):
+    """What happened during an autopilot run (policies.fast_forward summary)."""
+
+    def __init__(self, summary):
+        super().__init__()
+        self.summary = summary
+        panel_w, panel_h = 560, 450
+        self.rect = pygame.Rect((SCREEN_WIDTH - panel_w) // 2, (SCREEN_HEIGHT - panel_h) // 2, panel_w, panel_h)
+        self.close_rect = pygame.Rect(self.rect.right - 60, self.rect.y + 10, 40, 40)
+
+    def render(self, game):
+        s = self.summary
+        panel_w, panel_h = self.rect.size
+        surf = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
+        pygame.draw.rect(surf, COLOR_PANEL, (0, 0, panel_w, panel_h), border_radius=15)
+        pygame.draw.rect(surf, COLOR_ACCENT, (0, 0, panel_w, panel_h), 3, border_radius=15)
+        title = game.font_medium.render("Autopilot Summary", True, COLOR_PRIMARY)
+        surf.blit(title, title.get_rect(center=(panel_w // 2, 30)))
+        (nw0, nw1), (sc0, sc1) = s['net_worth'], s['score']
+        lines = [
+            (f"Months {s['start_month']} -> {s['end_month']}", COLOR_TEXT),
+            (f"Net worth: ${nw0:,.0f} -> ${nw1:,.0f} ({nw1 - nw0:+,.0f})", COLOR_SUCCESS if nw1 >= nw0 else COLOR_DANGER),
+            (f"Score: {sc0:,} -> {sc1:,}", COLOR_TEXT),
+            (f"Goals reached: {', '.join(s['goals_reached']) or 'none'}", COLOR_SUCCESS if s['goals_reached'] else COLOR_TEXT_DIM),
+            (f"Achievements: {', '.join(s['achievements'][:3]) or 'none'}" + (f" +{len(s['achievements']) - 3}" if len(s['achievements']) > 3 else ""),
+             COLOR_SUCCESS if s['achievements'] else COLOR_TEXT_DIM),
+            (f"Events: {len(s['events']) or 'none'}", COLOR_WARNING if s['events'] else COLOR_TEXT_DIM),
+        ]
+        shown = s['events'][:5]
+        lines += [(f"   Month {e['month']}: {e['name']}" + (f" (-${e['cost']:,.0f})" if e['cost'] else ""), COLOR_TEXT_DIM)
+                  for e in shown]
+        if len(s['events']) > len(shown):
+            lines.append((f"   ... and {len(s['events']) - len(shown)} more", COLOR_TEXT_DIM))
+        if s['bankrupt']:
+            lines.append(("Bankrupt! The game is over.", COLOR_DANGER))
+        elif s['finished']:
+            lines.append(("Game completed!", COLOR_SUCCESS))
+        y = 70
+        for text, color in lines:
+            surf.blit(game.font_small.render(text, True, color), (30, y))
+            y += 30
+        close_btn = Button(self.close_rect.x - self.rect.x, self.close_rect.y - self.rect.y, 40, 40,
+                           "✕", COLOR_DANGER, COLOR_TEXT, "close_autopilot")
+        close_btn.draw(surf, game.font_small)
+        return surf
+
+    def handle_event(self, game, event):
+        super().handle_event(game, event)
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.close_rect.collidepoint(event.pos):
+                self.close()
+
+
+# Particle colour and origin for each FinanceSimulation._effect kind
+EFFECT_PARTICLES = {
+    'month': COLOR_SUCCESS, 'choice': COLOR_SUCCESS, 'debt_paid': COLOR_SUCCESS, 'cured': COLOR_SUCCESS,
+    'event_cost': COLOR_DANGER, 'addicted': COLOR_DANGER, 'jackpot': COLOR_WARNING,
+    'invest': COLOR_PRIMARY, 'therapy': COLOR_ACCENT,
+    'income': COLOR_SUCCESS, 'fired': COLOR_DANGER,     # spawn along the header
+}
+
+
+class FinanceGame(FinanceSimulation):
     def __init__(self):
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("FinanceQuest - Master Your Financial Future")
@@ -697,31 +1034,46 @@ class FinanceGame:
         self._init_fonts()
         self.state = GameState.TITLE
         self.tutorial_step = 0
-        self.selected_class = None
-        self.selected_education = None
-        self.selected_difficulty = None
         self.selected_avatar_index = 0
         self.particles = []
-        self._init_player_stats()
-        self.debuffs = []
-        self.months_no_income = 0
-        self.has_vehicle = False
-        self.current_education_level = 'polytechnic'
-        self.has_university = False
-        self.has_masters = False
-        self.game_message = ""
+        super().__init__()
+        try:
+            self.leaderboard = Leaderboard()
+        except OSError as e:
+            print(f"Leaderboard unavailable, scores will not be recorded: {e}")
+            self.leaderboard = None
         self.high_score = self._load_high_score()
-        self._init_goals()
-        self.show_event_modal = False
-        self.current_event = None
+        self.new_high_score = False         # the game just finished beat high_score
+        self.replay_player = None           # set while watching a recorded game
+        self.autosave = Autosave()
+        self.whatif = WhatIfEvaluator()
+        self.autopilot_policy = None        # policies.Policy to play each autopilot month; None = locked action only
+        self._fast_forward = False          # autopilot running: no particles, toasts or per-month autosaves
+        self.achievement_toasts = []        # [(achievement, tick it disappears)], newest last
+        self._whatif_key = None             # state hash the what-if results for the action panel belong to
         self.scroll_offset = 0
         self.max_scroll = 0
         self.help_scroll_offset = 0
         self.help_max_scroll = 0
         self.cached_buttons = {state: [] for state in GameState}
-        self.need_button_update = True
+        self.modal_stack: List[Modal] = []
+        self._action_buttons = {}           # stable id -> Button, built once per game
+        self._active_action_ids = []
+        self._hit_fixed = HitGrid()         # header / main-area buttons, screen coords
+        self._hit_actions = HitGrid()       # action panel buttons, unscrolled coords
+        self._hovered_button = None
+        self._action_surface = None         # pre-rendered action list, scrolled by blitting
+        self._action_content_h = 0
+        self._action_render_keys = {}
+        self._action_dirty = set()
         self._bg_cache = {}
-        self._init_configs()
+        self._modal_layers = {}             # name -> (key, pre-rendered surface)
+        self._label_cache = {}
+        self.need_button_update = True      # rebuild the action panel on the next frame
+        self._widget_versions = dict.fromkeys(WIDGET_FIELDS, 0)
+        self._advisor_context = None        # what the chatbot is told about the game, until it changes
+        for widget, fields in WIDGET_FIELDS.items():
+            self.subscribe(fields, functools.partial(self._on_state_change, widget))
         self._init_ui_elements()
         self.active_dropdown = None
         self.dropdown_hover = False
@@ -737,15 +1089,6 @@ class FinanceGame:
         self.chatbot_has_new_message = False
         self.avatar_creator = CustomAvatarCreator()
 
-        # ========== DATA SCIENCE ADDITIONS ==========
-        self.monthly_log = []               # monthly snapshots for dashboard
-        # Action counters for statistics
-        self.total_investments = 0
-        self.total_saved = 0
-        self.total_debt_paid = 0
-        self.num_leisure = 0
-        self.num_risky = 0
-
         # ========== GOAL PREDICTION ==========
         self.goal_predictor = None
         self.goal_features = None
@@ -765,20 +1108,7 @@ class FinanceGame:
         self.font_emoji_med = pygame.font.SysFont("Segoe UI Emoji", 26)
 
     def _init_player_stats(self):
-        self.money = 0.0
-        self.monthly_income = 0.0
-        self.debt = 0.0
-        self.investments = 0.0
-        self.emergency_fund = 0.0
-        self.happiness = STARTING_HAPPINESS
-        self.stress = 0.0
-        self.current_month = 0
-        self.rent = 0.0
-        self.groceries = 0.0
-        self.transport = 0.0
-        self.actions_taken_this_month = 0
-        self.actions_remaining = ACTIONS_PER_MONTH
-        self.locked_action = None
+        super()._init_player_stats()
         self.show_help_panel = False
         self.current_tooltip = ""
         self.selected_avatar = AVATARS[0]["emoji"]
@@ -796,24 +1126,9 @@ class FinanceGame:
 
     # ========== DATA SCIENCE HELPER METHODS ==========
     def _save_game_summary(self):
-        if not self.monthly_log:
+        summary = self.game_summary()
+        if summary is None:
             return
-        avg_happiness = sum(m['happiness'] for m in self.monthly_log) / len(self.monthly_log)
-        avg_stress = sum(m['stress'] for m in self.monthly_log) / len(self.monthly_log)
-        summary = {
-            'class': self.selected_class,
-            'education': self.selected_education,
-            'difficulty': self.selected_difficulty,
-            'total_investments': self.total_investments,
-            'total_saved': self.total_saved,
-            'total_debt_paid': self.total_debt_paid,
-            'num_leisure': self.num_leisure,
-            'num_risky': self.num_risky,
-            'had_addiction': int('addict' in self.debuffs),
-            'avg_happiness': avg_happiness,
-            'avg_stress': avg_stress,
-            'final_score': self.calculate_score(),
-        }
         try:
             with open('game_summaries.json', 'r') as f:
                 summaries = json.load(f)
@@ -825,27 +1140,9 @@ class FinanceGame:
 
     def _save_goal_training_data(self):
         """Save early-game features and final goal outcomes for training."""
-        if len(self.monthly_log) < 6:
+        data = self.goal_training_row()
+        if data is None:
             return  # not enough data
-        early = self.monthly_log[:6]
-        avg_hap = sum(m['happiness'] for m in early) / 6
-        avg_str = sum(m['stress'] for m in early) / 6
-
-        # Use the cumulative action totals (they include actions up to month 6)
-        # This is a simplification; ideally we'd have per‑month action counts.
-        data = {
-            'early_avg_happiness': avg_hap,
-            'early_avg_stress': avg_str,
-            'early_total_investments': self.total_investments,
-            'early_total_saved': self.total_saved,
-            'early_total_debt_paid': self.total_debt_paid,
-            'early_num_leisure': self.num_leisure,
-            'early_num_risky': self.num_risky,
-            'goal_networth': self.goals['netWorth']['completed'],
-            'goal_emergency': self.goals['emergencyFund']['completed'],
-            'goal_debtfree': self.goals['debtFree']['completed'],
-            'goal_happiness': self.goals['happiness']['completed'],
-        }
         try:
             with open('goal_training_data.json', 'r') as f:
                 all_data = json.load(f)
@@ -870,9 +1167,8 @@ class FinanceGame:
             return None
 
         # 2. Extract features from the first 6 months
-        early = self.monthly_log[:6]
-        avg_hap = sum(m['happiness'] for m in early) / 6
-        avg_str = sum(m['stress'] for m in early) / 6
+        avg_hap = self.monthly_log.window_mean('happiness', 0, 6)
+        avg_str = self.monthly_log.window_mean('stress', 0, 6)
         
         features = pd.DataFrame([[
             avg_hap,
@@ -918,49 +1214,10 @@ class FinanceGame:
         if not results:
             return
 
-        # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        self.screen.blit(overlay, (0, 0))
-
-        panel_w, panel_h = 500, 350
-        panel_x = (SCREEN_WIDTH - panel_w) // 2
-        panel_y = (SCREEN_HEIGHT - panel_h) // 2
-        pygame.draw.rect(self.screen, COLOR_PANEL, (panel_x, panel_y, panel_w, panel_h), border_radius=15)
-        pygame.draw.rect(self.screen, COLOR_ACCENT, (panel_x, panel_y, panel_w, panel_h), 3, border_radius=15)
-
-        self._draw_text("Goal Completion Odds", self.font_medium, COLOR_PRIMARY, panel_x+panel_w//2, panel_y+30, center=True)
-
-        y = panel_y + 70
-        for goal, prob in results.items():
-            color = COLOR_SUCCESS if prob > 0.7 else COLOR_WARNING if prob > 0.3 else COLOR_DANGER
-            self._draw_text(f"{goal}: {prob*100:.1f}%", self.font_small, color, panel_x+30, y)
-            # progress bar
-            bar_x = panel_x + 200
-            bar_y = y - 5
-            bar_w = 250
-            bar_h = 20
-            pygame.draw.rect(self.screen, COLOR_PANEL_HOVER, (bar_x, bar_y, bar_w, bar_h), border_radius=5)
-            fill_w = int(bar_w * prob)
-            pygame.draw.rect(self.screen, color, (bar_x, bar_y, fill_w, bar_h), border_radius=5)
-            y += 40
+        self.push_modal(GoalPredictionModal(results))
 
-        # Close button
-        close_btn = Button(panel_x+panel_w-60, panel_y+10, 40, 40, "✕", COLOR_DANGER, COLOR_TEXT, "close_pred")
-        close_btn.draw(self.screen, self.font_small)
-        pygame.display.flip()
-
-        # Wait for click
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    if close_btn.rect.collidepoint(event.pos):
-                        waiting = False
-            self.clock.tick(30)
+    def push_modal(self, modal):
+        self.modal_stack.append(modal)
 
     def show_dashboard(self):
         if not self.monthly_log:
@@ -970,9 +1227,15 @@ class FinanceGame:
         def norm(color):
             return tuple(c/255.0 for c in color)
 
-        df = pd.DataFrame(self.monthly_log)
+        df = self.monthly_log.frame()
         df['net_worth'] = df['money'] + df['investments'] + df['emergency_fund'] - df['debt']
 
+        def series(column):
+            # months and values of `column`, downsampled so long games draw as fast as short ones
+            idx = lttb(df['month'], df[column], DASHBOARD_POINTS)
+            return df['month'].values[idx], df[column].values[idx]
+        markers = 'o' if len(df) <= 60 else None
+
         # Custom dark theme
         plt.style.use('dark_background')
         fig, axes = plt.subplots(2, 2, figsize=(12, 9))
@@ -985,10 +1248,6 @@ class FinanceGame:
             'net_worth': norm(COLOR_PRIMARY),
             'happiness': norm(COLOR_SUCCESS),
             'stress': norm(COLOR_DANGER),
-            'cash': norm((0, 255, 150)),      # lime
-            'invest': norm(COLOR_PRIMARY),
-            'emergency': norm(COLOR_WARNING),
-            'debt': norm(COLOR_DANGER)
         }
         panel_bg = norm(COLOR_PANEL)
         panel_hover = norm(COLOR_PANEL_HOVER)
@@ -1000,7 +1259,7 @@ class FinanceGame:
         # 1. Net worth over time
         ax = axes[0,0]
         ax.set_facecolor(panel_bg)
-        ax.plot(df['month'], df['net_worth'], marker='o', color=colors['net_worth'], 
+        ax.plot(*series('net_worth'), marker=markers, color=colors['net_worth'], 
                 linewidth=3, markersize=8)
         ax.set_title('Net Worth Progression', color=accent, fontsize=14)
         ax.set_xlabel('Month', color=text_dim)
@@ -1013,9 +1272,9 @@ class FinanceGame:
         # 2. Happiness vs Stress
         ax = axes[0,1]
         ax.set_facecolor(panel_bg)
-        ax.plot(df['month'], df['happiness'], label='Happiness', color=colors['happiness'],
+        ax.plot(*series('happiness'), label='Happiness', color=colors['happiness'],
                 linewidth=3)
-        ax.plot(df['month'], df['stress'], label='Stress', color=colors['stress'],
+        ax.plot(*series('stress'), label='Stress', color=colors['stress'],
                 linewidth=3)
         ax.set_title('Well‑Being Over Time', color=accent, fontsize=14)
         ax.set_xlabel('Month', color=text_dim)
@@ -1027,23 +1286,19 @@ class FinanceGame:
         for spine in ax.spines.values():
             spine.set_color(border)
 
-        # 3. Final asset composition
+        # 3. Portfolio allocation over time
         ax = axes[1,0]
         ax.set_facecolor(panel_bg)
-        end = df.iloc[-1]
-        labels = ['Cash', 'Investments', 'Emergency', 'Debt (-)']
-        values = [end['money'], end['investments'], end['emergency_fund'], -end['debt']]
-        bar_colors = [colors['cash'], colors['invest'], colors['emergency'], colors['debt']]
-        bars = ax.bar(labels, values, color=bar_colors, edgecolor=border, linewidth=2)
-        ax.set_title('Final Financial Snapshot', color=accent, fontsize=14)
-        ax.tick_params(colors=text_dim, rotation=15)
-        ax.axhline(0, color=border, linewidth=1)
-
-        # Legend
-        from matplotlib.patches import Rectangle
-        legend_handles = [Rectangle((0,0),1,1, color=bar_colors[i], ec=border, linewidth=2) for i in range(len(labels))]
-        ax.legend(legend_handles, labels, loc='upper right', facecolor=panel_bg, labelcolor=text_color, framealpha=0.9)
-
+        idx = lttb(df['month'], df['investments'], DASHBOARD_POINTS)
+        asset_colors = [norm(COLOR_PRIMARY), norm(COLOR_SUCCESS), norm(COLOR_WARNING), norm(COLOR_ACCENT)]
+        ax.stackplot(df['month'].values[idx], *(df[a.key].values[idx] for a in ASSETS),
+                     labels=[a.name for a in ASSETS], colors=asset_colors, alpha=0.85)
+        ax.set_title('Portfolio Allocation', color=accent, fontsize=14)
+        ax.set_xlabel('Month', color=text_dim)
+        ax.set_ylabel('$', color=text_dim)
+        ax.tick_params(colors=text_dim)
+        ax.legend(loc='upper left', facecolor=panel_bg, labelcolor=text_color, framealpha=0.9)
+        ax.grid(True, linestyle='--', alpha=0.3, color=border)
         for spine in ax.spines.values():
             spine.set_color(border)
 
@@ -1051,7 +1306,10 @@ class FinanceGame:
         ax = axes[1,1]
         ax.set_facecolor(panel_bg)
         ax.axis('off')
+        end = df.iloc[-1]
         stats_text = (
+            f"Cash: ${end['money']:,.0f}   Debt: ${end['debt']:,.0f}\n"
+            f"Invested: ${end['investments']:,.0f}   Emergency: ${end['emergency_fund']:,.0f}\n"
             f"Total Invested: ${self.total_investments:,.0f}\n"
             f"Total Saved: ${self.total_saved:,.0f}\n"
             f"Debt Paid: ${self.total_debt_paid:,.0f}\n"
@@ -1059,7 +1317,7 @@ class FinanceGame:
             f"Risky Actions: {self.num_risky}\n"
             f"Had Addiction: {'Yes' if 'addict' in self.debuffs else 'No'}"
         )
-        ax.text(0.1, 0.5, stats_text, transform=ax.transAxes,
+        ax.text(0.1, 0.5, stats_text.replace('$', r'\$'), transform=ax.transAxes,     # '$' would start mathtext
                 fontsize=13, color=text_color, verticalalignment='center',
                 family='monospace', linespacing=1.8,
                 bbox=dict(boxstyle='round,pad=0.5', facecolor=panel_hover, 
@@ -1071,42 +1329,20 @@ class FinanceGame:
         canvas = agg.FigureCanvasAgg(fig)
         canvas.draw()
         buffer, (width, height) = canvas.print_to_buffer()
-        surf = pygame.image.frombuffer(buffer, (width, height), "RGBA")
-
-        # Draw semi‑transparent overlay behind dashboard
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        surf = pygame.image.frombuffer(buffer, (width, height), "RGBA").copy()
 
-        # Blit the dashboard surface
-        dash_x = (SCREEN_WIDTH - width) // 2
-        dash_y = (SCREEN_HEIGHT - height) // 2
-        self.screen.blit(surf, (dash_x, dash_y))
-
-        # ---- CLOSE BUTTON ----
-        close_btn_size = 40
-        close_btn_rect = pygame.Rect(dash_x + width - close_btn_size - 10, dash_y + 10, close_btn_size, close_btn_size)
-        pygame.draw.rect(self.screen, COLOR_DANGER, close_btn_rect, border_radius=8)
-        pygame.draw.rect(self.screen, COLOR_TEXT, close_btn_rect, 2, border_radius=8)
-        self._draw_text("✕", self.font_medium, COLOR_TEXT, close_btn_rect.centerx, close_btn_rect.centery, center=True)
-
-        pygame.display.flip()
-
-        # Wait for close button or ESC key
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                    waiting = False
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    if close_btn_rect.collidepoint(event.pos):
-                        waiting = False
-            self.clock.tick(30)
+        plt.close(fig)
+        self.push_modal(DashboardModal(surf))
     # ===================================================
 
+    def _on_state_change(self, widget, changed):
+        """publish() callback: state `widget` shows has changed."""
+        self._widget_versions[widget] += 1
+        if widget == 'actions':
+            self.need_button_update = True
+        elif widget == 'advisor':
+            self._advisor_context = None
+
     def _toggle_chatbot(self):
         self.show_chatbot = not self.show_chatbot
         self.chatbot_input_active = False
@@ -1118,7 +1354,10 @@ class FinanceGame:
             return
         question = self.chatbot_input_text
         self.chatbot_input_text = ""
-        context = self.chatbot.get_context_from_game(self)
+        self.publish()
+        if self._advisor_context is None:
+            self._advisor_context = self.chatbot.get_context_from_game(self)
+        context = self._advisor_context
         def ask_ai():
             self.chatbot.ask(question, context)
             self.chatbot_has_new_message = True
@@ -1131,6 +1370,20 @@ class FinanceGame:
             'life': 60, 'color': color, 'size': random.randint(2, 4)
         })
 
+    def _effect(self, kind):
+        if self._fast_forward:
+            return
+        if kind in ('income', 'fired'):
+            self._add_particle(random.randint(0, SCREEN_WIDTH), 100, EFFECT_PARTICLES[kind])
+        else:
+            self._add_particle(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, EFFECT_PARTICLES[kind])
+
+    def _on_achievement(self, achievement):
+        if self._fast_forward or achievement.goal is not None:
+            return      # the autopilot summary lists them; goals light up their card instead
+        self.achievement_toasts.append((achievement, pygame.time.get_ticks() + ACHIEVEMENT_TOAST_MS))
+        del self.achievement_toasts[:-ACHIEVEMENT_TOASTS_SHOWN]
+
     def _update_particles(self):
         for p in self.particles[:]:
             p['x'] += p['vx']; p['y'] += p['vy']
@@ -1143,67 +1396,39 @@ class FinanceGame:
             pygame.draw.circle(self.screen, p['color'][:3],
                                (int(p['x']), int(p['y'])), p['size'])
 
-    def _init_goals(self):
-        self.goals = {
-            'netWorth':    {'target': 50000, 'completed': False, 'label': 'Net Worth $50k'},
-            'emergencyFund': {'target': 10000, 'completed': False, 'label': 'Save $10k Fund'},
-            'debtFree':    {'completed': False, 'label': 'Become Debt-Free'},
-            'happiness':   {'target': 70, 'completed': False, 'label': '70+ Happiness'}
-        }
-
-    def _init_configs(self):
-        self.class_configs = {
-            'upper': ClassConfig("Upper Class", 50000, 2500, 800, 400, 0, "No debt - Start with financial freedom", "💼"),
-            'middle': ClassConfig("Middle Class", 15000, 1500, 500, 300, 5000, "Some starting debt - Balanced start", "👔"),
-            'lower':  ClassConfig("Lower Class", 2000, 800, 300, 150, 15000, "Significant debt - Challenging start", "🎒")
-        }
-        self.education_configs = {
-            'polytechnic': EducationConfig("Polytechnic", 0, 3500, "Standard education - No debt"),
-            'university':  EducationConfig("University", 30000, 5000, "Higher earning potential, high debt"),
-            'masters':     EducationConfig("Masters", 50000, 6500, "Max earning potential, massive debt")
-        }
-        self.difficulty_configs = {
-            'easy':   DifficultyConfig("Easy Mode", 0.05, 0.5, "Fewer emergencies, stable markets"),
-            'normal': DifficultyConfig("Normal Mode", 0.10, 1.0, "Balanced challenge"),
-            'hard':   DifficultyConfig("Hard Mode", 0.20, 1.5, "Frequent emergencies, volatile markets")
-        }
-        self.life_choices = {
-            'vacation':     LifeChoice("Vacation", 2500, 15, -10, "leisure"),
-            'fineDining':   LifeChoice("Fine Dining", 500, 8, -3, "leisure"),
-            'staycation':   LifeChoice("Staycation", 800, 10, -5, "leisure"),
-            'themePark':    LifeChoice("Theme Park", 300, 12, -4, "leisure"),
-            'shopping':     LifeChoice("Shopping", 1000, 10, -5, "risky", 0.3, "addict"),
-            'gambling':     LifeChoice("Gambling", 1500, 5, 0, "risky", 0.4, "addict", 0.2, 3000),
-            'clubbing':     LifeChoice("Clubbing", 600, 8, -3, "risky", 0.25, "addict"),
-            'smoking':      LifeChoice("Smoking", 200, 2, -8, "risky", 0.5, "addict"),
-            'vehicle':      LifeChoice("Buy Vehicle", 25000, 20, 0, "utility", one_time=True),
-            'relationship': LifeChoice("Date Night", 500, 15, -5, "utility"),
-            'university':   LifeChoice("University", 30000, 0, 0, "education", one_time=True),
-            'masters':      LifeChoice("Masters", 50000, 0, 0, "education", one_time=True)
-        }
-        self.emergency_events = [
-            EmergencyEvent("Medical Emergency", "You've been diagnosed with a serious health condition requiring immediate treatment.", cost=8000, stress_increase=30),
-            EmergencyEvent("Job Loss", "Your company has downsized and you've been laid off. No income for 3 months.", months_no_income=3, stress_increase=40),
-            EmergencyEvent("Market Crash", "The stock market has crashed! Your investments have lost significant value.", investment_loss=0.4, stress_increase=25),
-            EmergencyEvent("Home Emergency", "Major repairs needed for your living space.", cost=3500, stress_increase=15),
-            EmergencyEvent("Family Emergency", "A family member needs financial assistance urgently.", cost=5000, stress_increase=20)
-        ]
-
     def _init_ui_elements(self):
         self._init_title_buttons()
         self._init_tutorial_buttons()
         self._init_setup_buttons()
         self._init_game_over_buttons()
+        self._init_modal_buttons()
+
+    def _init_modal_buttons(self):
+        help_x, help_y = (SCREEN_WIDTH-900)//2, (SCREEN_HEIGHT-650)//2
+        event_x, event_y = (SCREEN_WIDTH-600)//2, (SCREEN_HEIGHT-450)//2
+        input_x, input_y = (SCREEN_WIDTH-500)//2, (SCREEN_HEIGHT-350)//2
+        self._modal_buttons = {
+            'help_close': Button(help_x+900//2-100, help_y+650-70, 200, 50, "Close", COLOR_PRIMARY, COLOR_BG, gradient=True, icon="✓"),
+            'event_continue': Button(event_x+600//2-100, event_y+450-80, 200, 50, "Continue", COLOR_PRIMARY, COLOR_BG, gradient=True, icon="▶"),
+            'custom_confirm': Button(input_x+50, input_y+350-70, 180, 50, "Confirm", COLOR_SUCCESS, COLOR_BG, gradient=True, icon="✓"),
+            'custom_cancel': Button(input_x+500-230, input_y+350-70, 180, 50, "Cancel", COLOR_PANEL, icon="✗"),
+        }
 
     def _init_title_buttons(self):
         self.cached_buttons[GameState.TITLE] = [
             Button(SCREEN_WIDTH//2-150, 500, 300, 70, "New Game", COLOR_PRIMARY, text_color=COLOR_BG, button_id="new_game", gradient=True),
             Button(SCREEN_WIDTH//2-150, 590, 300, 70, "Skip Tutorial", COLOR_PANEL, text_color=COLOR_TEXT, button_id="skip_tutorial"),
-            Button(SCREEN_WIDTH-150, 20, 130, 50, "Help", COLOR_ACCENT, text_color=COLOR_TEXT, button_id="help_title",)
+            Button(SCREEN_WIDTH-150, 20, 130, 50, "Help", COLOR_ACCENT, text_color=COLOR_TEXT, button_id="help_title",),
+            Button(SCREEN_WIDTH//2-150, 760, 300, 60, "Watch Last Replay", COLOR_PANEL, text_color=COLOR_TEXT, button_id="watch_replay"),
+            Button(SCREEN_WIDTH//2-150, 680, 300, 60, "Resume Game", COLOR_SUCCESS, text_color=COLOR_BG, button_id="resume_game", gradient=True)
         ]
         self.cached_buttons[GameState.TITLE][0].callback = lambda: setattr(self, 'state', GameState.TUTORIAL)
         self.cached_buttons[GameState.TITLE][1].callback = lambda: setattr(self, 'state', GameState.SETUP)
         self.cached_buttons[GameState.TITLE][2].callback = self._toggle_help
+        self.cached_buttons[GameState.TITLE][3].callback = self._watch_last_replay
+        self.cached_buttons[GameState.TITLE][3].visible = bool(list_replays())
+        self.cached_buttons[GameState.TITLE][4].callback = self._resume_game
+        self.cached_buttons[GameState.TITLE][4].visible = self.autosave.exists()
 
     def _init_tutorial_buttons(self):
         panel_rect = pygame.Rect(200, 150, SCREEN_WIDTH-400, 500)
@@ -1242,15 +1467,23 @@ class FinanceGame:
         self.selected_class = None
         self.selected_education = None
         self.selected_difficulty = None
+        self.months_per_game = MONTHS_PER_GAME
+        self.market_tape = None
         self.selected_avatar_index = 0
         self.need_button_update = True
 
     def _init_playing_buttons(self):
         if self.cached_buttons[GameState.PLAYING]:
             return
-        next_btn = Button(0, 0, 200, 80, "NEXT MONTH", COLOR_SUCCESS, text_color=COLOR_BG, button_id="next_month", gradient=True)
+        next_btn = Button(*self._next_month_rect(), "NEXT MONTH", COLOR_SUCCESS, text_color=COLOR_BG, button_id="next_month", gradient=True)
         next_btn.callback = self.next_month
         self.cached_buttons[GameState.PLAYING].append(next_btn)
+        autopilot_btn = Button(*self._autopilot_rect(), f"AUTOPILOT\n{AUTOPILOT_MONTHS} MONTHS", COLOR_ACCENT,
+                               text_color=COLOR_TEXT, button_id="autopilot",
+                               tooltip=f"Play the next {AUTOPILOT_MONTHS} months straight through: your locked action "
+                                       "(if any) runs every month and events are handled automatically.")
+        autopilot_btn.callback = self.autopilot
+        self.cached_buttons[GameState.PLAYING].append(autopilot_btn)
         help_btn = Button(SCREEN_WIDTH-120, 20, 100, 40, "HELP", COLOR_ACCENT, text_color=COLOR_TEXT, button_id="help")
         help_btn.callback = self._toggle_help
         self.cached_buttons[GameState.PLAYING].append(help_btn)
@@ -1263,16 +1496,88 @@ class FinanceGame:
         predict_btn.callback = self._show_goal_predictions
         self.cached_buttons[GameState.PLAYING].append(predict_btn)
         # ========================================
+        for btn in self.cached_buttons[GameState.PLAYING]:
+            self._hit_fixed.insert(btn, btn.rect)
+
+    def _next_month_rect(self):
+        sidebar_w, action_panel_w, header_height = 350, 400, 80
+        main_area_w = SCREEN_WIDTH - sidebar_w - action_panel_w
+        controls_y = header_height + 30 + 45 + 220 + 120
+        return pygame.Rect(sidebar_w + 30 + main_area_w - 60 - 200, controls_y, 200, 90)
+
+    def _autopilot_rect(self):
+        # between the ACTIONS LEFT box and NEXT MONTH
+        next_rect = self._next_month_rect()
+        x = 350 + 30 + 160 + 20
+        return pygame.Rect(x, next_rect.y, next_rect.x - 20 - x, next_rect.height)
+
+    def _action_view_rect(self):
+        header_height = 80
+        action_panel_w = 400
+        sidebar_w = 350
+        main_area_w = SCREEN_WIDTH - sidebar_w - action_panel_w
+        return pygame.Rect(sidebar_w + main_area_w + 10, header_height + 10,
+                           action_panel_w - 20, SCREEN_HEIGHT - header_height - 100)
+
+    def _rebuild_action_hit_index(self):
+        self._hit_actions.clear()
+        for action_id in self._active_action_ids:
+            btn = self._action_buttons[action_id]
+            self._hit_actions.insert(btn, (btn.rect.x, btn.original_y, btn.rect.width, btn.rect.height))
+
+    def _hit_test(self, pos):
+        """Button under `pos` in the playing screen (fixed buttons win over the scroll list)."""
+        btn = self._hit_fixed.query(pos)
+        if btn is not None:
+            return btn if btn.visible else None
+        if self._action_view_rect().collidepoint(pos):
+            return self._hit_actions.query((pos[0], pos[1] + self.scroll_offset))
+        return None
 
     def _update_playing_buttons(self):
+        active_ids = []
+        self._create_action_buttons(active_ids)
+        if self.replay_player is None and not self.finished:
+            # speculative: every enabled action is simulated before the player hovers it
+            self._whatif_key = self.whatif.request(self, self.legal_actions())
+        if active_ids != self._active_action_ids:
+            self._active_action_ids = active_ids
+            self.cached_buttons[GameState.PLAYING] = [
+                btn for btn in self.cached_buttons[GameState.PLAYING]
+                if btn.button_id in FIXED_PLAYING_BUTTONS
+            ] + [self._action_buttons[action_id] for action_id in active_ids]
+            self._action_surface = None
+        self._rebuild_action_hit_index()
+        self._action_dirty.update(active_ids)
+        self.need_button_update = False
+
+    def _reset_action_buttons(self):
+        self._action_buttons = {}
+        self._active_action_ids = []
+        self._hit_actions.clear()
+        self._hovered_button = None
+        self._action_surface = None
         self.cached_buttons[GameState.PLAYING] = [
             btn for btn in self.cached_buttons[GameState.PLAYING]
-            if btn.button_id in ["next_month", "help", "chatbot", "predict"]
+            if btn.button_id in FIXED_PLAYING_BUTTONS
         ]
-        self._create_action_buttons()
-        self.need_button_update = False
 
-    def _create_action_buttons(self):
+    def _sync_action_button(self, action_id, x, y, w, h, label, color, tooltip, enabled):
+        """Reuse the persistent button for `action_id`, only touching what changed."""
+        btn = self._action_buttons.get(action_id)
+        if btn is None:
+            btn = Button(x, y, w, h, label, color, button_id=action_id, tooltip=tooltip)
+            self._action_buttons[action_id] = btn
+        else:
+            btn.update_text(label)
+            btn.rect.update(x, y, w, h)
+            btn.base_color = color
+            btn.tooltip = tooltip
+        btn.enabled = enabled
+        btn.visible = True
+        return btn
+
+    def _create_action_buttons(self, active_ids):
         header_height = 80
         action_panel_w = 400
         sidebar_w = 350
@@ -1282,106 +1587,125 @@ class FinanceGame:
         btn_w = (view_rect.width - 20) // 2
         btn_h = 60
         ay = 10
+        asset = ASSETS[ASSET_INDEX[self.invest_asset]]
+        order_name, order_rule = PAYOFF_ORDER_NAMES[self.payoff_order]
         fin_actions = [
-            ("💰 Invest", 'invest', self.money >= 100, COLOR_PRIMARY, f"Invest in the market | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"),
+            (f"💰 Invest\n{asset.name}", 'invest', self.money >= 100, COLOR_PRIMARY,
+             f"Invest in {asset.name}: {asset.description} (~{asset.annual_return:.1%}/yr, "
+             f"±{asset.annual_volatility:.0%}) | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"),
             ("💵 Save", 'save', self.money >= 100, COLOR_SUCCESS, f"Save to emergency fund | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"),
             ("🏦 Withdraw", 'withdraw', self.emergency_fund > 0, COLOR_WARNING, f"Withdraw from emergency fund | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"),
-            ("💳 Pay Debt", 'pay_debt', self.money >= 100 and self.debt > 0, COLOR_DANGER, f"Pay off debt and reduce stress | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"),
+            (f"💳 Pay Debt\n{order_name}", 'pay_debt', self.money >= 100 and self.debt > 0, COLOR_DANGER,
+             f"Pay off debt, {order_rule}, and reduce stress | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"),
         ]
-        ay = self._create_financial_dropdown_buttons("FINANCIAL ACTIONS", fin_actions, ay, btn_w, btn_h, view_rect)
-        if self.happiness < 80:
+        ay = self._create_financial_dropdown_buttons("FINANCIAL ACTIONS", fin_actions, ay, btn_w, btn_h, view_rect, active_ids)
+        if self.happiness < LEISURE_HAPPINESS_CAP:
             lifestyle_actions = [
-                (f"{c.name}\n${c.cost:,.0f}", lambda k=k: self.take_life_choice(k), self.money >= c.cost, COLOR_PANEL,
+                (f"life_{k}", f"{c.name}\n${c.cost:,.0f}", self.money >= c.cost, COLOR_PANEL,
                  f"😊 {c.name}: +{c.happiness} happiness, {c.stress} stress")
                 for k, c in self.life_choices.items() if c.choice_type == 'leisure'
             ]
             if lifestyle_actions:
-                ay = self._create_section_buttons("LIFESTYLE", lifestyle_actions, ay, btn_w, btn_h, view_rect)
+                ay = self._create_section_buttons("LIFESTYLE", lifestyle_actions, ay, btn_w, btn_h, view_rect, active_ids)
         util_actions = []
         for k, c in self.life_choices.items():
             if c.choice_type in ['utility', 'education']:
                 enabled = self._is_choice_available(k, c)
                 col = COLOR_ACCENT if c.choice_type == 'education' else COLOR_PANEL
                 tooltip = f"{c.name}: +${c.cost:,.0f} investment in your future!" if c.choice_type == 'education' else f"{c.name}"
-                util_actions.append((f"{c.name}\n${c.cost:,.0f}", lambda k=k: self.take_life_choice(k), enabled, col, tooltip))
+                if k == 'vehicle':
+                    tooltip += f" (+${VEHICLE_UPKEEP}/mo upkeep)"
+                util_actions.append((f"life_{k}", f"{c.name}\n${c.cost:,.0f}", enabled, col, tooltip))
         if util_actions:
-            ay = self._create_section_buttons("GROWTH & ASSETS", util_actions, ay, btn_w, btn_h, view_rect)
+            ay = self._create_section_buttons("GROWTH & ASSETS", util_actions, ay, btn_w, btn_h, view_rect, active_ids)
         if self.debuffs:
             health_actions = []
             if 'addict' in self.debuffs:
-                health_actions.append(("Rehab\n$1.5k", self.treat_addiction, self.money >= 1500, COLOR_DANGER, "Treatment for addiction"))
+                health_actions.append(("health_rehab", "Rehab\n$1.5k", self.money >= 1500, COLOR_DANGER, "Treatment for addiction"))
             if 'unhappy' in self.debuffs or 'distracted' in self.debuffs:
-                health_actions.append(("Therapy\n$800", self.seek_therapy, self.money >= 800, COLOR_ACCENT, "Clear debuffs and reduce stress"))
+                health_actions.append(("health_therapy", "Therapy\n$800", self.money >= 800, COLOR_ACCENT, "Clear debuffs and reduce stress"))
             if health_actions:
-                ay = self._create_section_buttons("HEALTH", health_actions, ay, btn_w, btn_h, view_rect)
+                ay = self._create_section_buttons("HEALTH", health_actions, ay, btn_w, btn_h, view_rect, active_ids)
         self.max_scroll = max(0, ay - view_rect.height + 100)
+        self.scroll_offset = min(self.scroll_offset, self.max_scroll)
+        self._action_content_h = view_rect.height + self.max_scroll
 
-    def _is_choice_available(self, choice_key, choice):
-        if self.money < choice.cost: return False
-        if choice_key == 'vehicle' and self.has_vehicle: return False
-        if choice_key == 'university' and self.has_university: return False
-        if choice_key == 'masters' and (self.has_masters or not self.has_university): return False
-        return True
-
-    def _create_section_buttons(self, title, buttons_data, start_y, btn_w, btn_h, view_rect):
+    def _create_section_buttons(self, title, buttons_data, start_y, btn_w, btn_h, view_rect, active_ids):
         ay = start_y + 50
         for i, b_data in enumerate(buttons_data):
-            label, callback, enabled, color, tooltip = b_data
+            action_id, label, enabled, color, tooltip = b_data
             bx_rel = 0 if i % 2 == 0 else btn_w + 15
             by_rel = ay + (i // 2) * (btn_h + 15)
             screen_x = view_rect.x + bx_rel
-            screen_y = view_rect.y + by_rel - self.scroll_offset
             original_y = view_rect.y + by_rel
-            is_locked = self.locked_action and self.locked_action['callback'] == callback
-            display_label = f"{label}" if is_locked else label
-            btn = Button(screen_x, screen_y, btn_w, btn_h, display_label, color,
-                         button_id=f"action_{len(self.cached_buttons[GameState.PLAYING])}",
-                         tooltip=tooltip + "\n[Right-click to lock/unlock for next month]")
+            btn = self._sync_action_button(action_id, screen_x, original_y, btn_w, btn_h, label, color,
+                                           tooltip + "\n[Right-click to lock/unlock for next month]",
+                                           enabled and self.actions_remaining > 0)
             btn.original_y = original_y
-            btn.enabled = enabled and self.actions_remaining > 0
-            btn.callback = callback
-            btn.visible = True
-            btn.lock_data = {'name': label, 'callback': callback}
-            self.cached_buttons[GameState.PLAYING].append(btn)
+            if btn.callback is None:
+                btn.callback = self._action_callback(action_id)
+                btn.lock_data = {'name': label, 'callback': btn.callback, 'id': action_id}
+            active_ids.append(action_id)
         rows = (len(buttons_data) + 1) // 2
         return ay + rows * (btn_h + 15) + 30
 
-    def _create_financial_dropdown_buttons(self, title, buttons_data, start_y, btn_w, btn_h, view_rect):
+    def _create_financial_dropdown_buttons(self, title, buttons_data, start_y, btn_w, btn_h, view_rect, active_ids):
         ay = start_y + 50
         for i, b_data in enumerate(buttons_data):
             label, action_type, enabled, color, tooltip = b_data
             bx_rel = 0 if i % 2 == 0 else btn_w + 15
             by_rel = ay + (i // 2) * (btn_h + 15)
             screen_x = view_rect.x + bx_rel
-            screen_y = view_rect.y + by_rel - self.scroll_offset
             original_y = view_rect.y + by_rel
-            btn = Button(screen_x, screen_y, btn_w, btn_h, label, color,
-                         button_id=f"financial_{action_type}", tooltip=tooltip)
+            action_id = f"financial_{action_type}"
+            btn = self._sync_action_button(action_id, screen_x, original_y, btn_w, btn_h, label, color,
+                                           tooltip, enabled and self.actions_remaining > 0)
             btn.original_y = original_y
-            btn.enabled = enabled and self.actions_remaining > 0
             btn.action_type = action_type
-            btn.visible = True
-            self.cached_buttons[GameState.PLAYING].append(btn)
+            active_ids.append(action_id)
         rows = (len(buttons_data) + 1) // 2
         return ay + rows * (btn_h + 15) + 30
 
-    def _update_button_positions(self):
-        if not self.cached_buttons[GameState.PLAYING]:
-            return
-        header_height = 80
-        action_panel_w = 400
-        sidebar_w = 350
-        main_area_w = SCREEN_WIDTH - sidebar_w - action_panel_w
-        view_rect = pygame.Rect(sidebar_w + main_area_w + 10, header_height + 10,
-                                action_panel_w - 20, SCREEN_HEIGHT - header_height - 100)
-        for btn in self.cached_buttons[GameState.PLAYING]:
-            if btn.button_id not in ["next_month", "help", "chatbot", "predict"]:
-                new_y = btn.original_y - self.scroll_offset
-                btn.rect.y = new_y
-                btn.visible = (new_y + btn.rect.height > view_rect.y and new_y < view_rect.bottom)
+    def _action_screen_rect(self, btn):
+        """Where an action-list button currently appears on screen."""
+        return btn.rect.move(0, -self.scroll_offset)
+
+    def _draw_action_list(self, view_rect):
+        """
+        Blit the visible slice of the off-screen action list.
+
+        The list is rendered once into a content surface the height of the whole
+        list; afterwards only buttons whose look changed (hover, enabled, label)
+        are repainted, and scrolling is a single sub-rect blit.
+        """
+        if self._action_surface is None or self._action_surface.get_height() != self._action_content_h:
+            self._action_surface = pygame.Surface((view_rect.width, max(1, self._action_content_h)))
+            self._action_surface.fill((20, 30, 50))
+            title = self.font_small.render("AVAILABLE ACTIONS", True, COLOR_PRIMARY)
+            self._action_surface.blit(title, (10, 10))
+            self._action_render_keys = {}
+            self._action_dirty = set(self._active_action_ids)
+        origin = view_rect.topleft
+        for action_id in self._action_dirty:
+            btn = self._action_buttons.get(action_id)
+            if btn is None or action_id not in self._active_action_ids:
+                continue
+            key = (btn.text, btn.enabled, btn.hover, btn.base_color, btn.rect.topleft, btn.rect.size)
+            if self._action_render_keys.get(action_id) == key:
+                continue
+            self._action_render_keys[action_id] = key
+            local = btn.rect.move(-origin[0], -origin[1])
+            self._action_surface.fill((20, 30, 50), (local.x - 2, local.y - 6, local.width + 10, local.height + 14))
+            btn.draw(self._action_surface, self.font_tiny, origin)
+        self._action_dirty.clear()
+        self.screen.blit(self._action_surface, origin,
+                         area=(0, self.scroll_offset, view_rect.width, view_rect.height))
 
     def _load_high_score(self):
+        if self.leaderboard is not None and self.leaderboard.count:
+            return self.leaderboard.best()
         try:
+            # highscore.json predates the leaderboard; it is read, never written
             if os.path.exists('highscore.json'):
                 with open('highscore.json', 'r') as f:
                     return json.load(f).get('high_score', 0)
@@ -1389,60 +1713,22 @@ class FinanceGame:
             pass
         return 0
 
-    def _save_high_score(self):
-        try:
-            with open('highscore.json', 'w') as f:
-                json.dump({'high_score': self.high_score}, f)
-        except Exception:
-            pass
-
     def _toggle_help(self):
         self.show_help_panel = not self.show_help_panel
         self.help_scroll_offset = 0
 
-    def start_game(self):
-        if not all([self.selected_class, self.selected_education, self.selected_difficulty]):
+    def start_game(self, seed=None):
+        if not super().start_game(seed):
             return
-        cc = self.class_configs[self.selected_class]
-        ec = self.education_configs[self.selected_education]
-        self.money = cc.starting_money
-        self.monthly_income = ec.income
-        self.debt = cc.debt + ec.cost
-        self.rent = cc.rent
-        self.groceries = cc.groceries
-        self.transport = cc.transport
-        self.investments = 0
-        self.emergency_fund = 0
-        self.happiness = STARTING_HAPPINESS
-        self.stress = 0
-        self.current_month = 0
-        self.debuffs = []
-        self.months_no_income = 0
-        self.has_vehicle = False
-        self.current_education_level = self.selected_education
-        self.has_university = self.selected_education in ['university', 'masters']
-        self.has_masters = self.selected_education == 'masters'
-        self.game_message = "Welcome to your financial journey! Good luck."
         face, acc_data = self.avatar_creator.get_avatar_composition()
         self.selected_avatar = face
         self.selected_avatar_acc = acc_data
         self.selected_avatar_bg = self.avatar_creator.get_bg_color()
-        self.actions_taken_this_month = 0
-        self.actions_remaining = ACTIONS_PER_MONTH
-        self.locked_action = None
-        for goal in self.goals.values():
-            goal['completed'] = False
-
-        # Reset data science counters
-        self.monthly_log = []
-        self.total_investments = 0
-        self.total_saved = 0
-        self.total_debt_paid = 0
-        self.num_leisure = 0
-        self.num_risky = 0
-
+        if self.replay_player is None:
+            self.recorder = Replay.for_game(self)
+            self.autosave.begin(self)
         self._init_playing_buttons()
-        self.need_button_update = True
+        self._reset_action_buttons()
         self.state = GameState.PLAYING
 
     def _tut_prev(self):
@@ -1459,223 +1745,6 @@ class FinanceGame:
         self.state = GameState.SETUP
         self.tutorial_step = 0
 
-    def next_month(self):
-        if self.current_month >= MONTHS_PER_GAME:
-            self.end_game(True)
-            return
-        messages = []
-        self._add_particle(SCREEN_WIDTH//2, SCREEN_HEIGHT//2, COLOR_SUCCESS)
-        if self.locked_action:
-            messages.append(f"🔒 Auto: {self.locked_action['name']}")
-            self.locked_action['callback']()
-        messages.extend(self._process_income())
-        self._process_expenses()
-        if self.debt > 0: self.debt *= 1.00417
-        if self.investments > 0: self._process_investments()
-        if self.emergency_fund > 0: self.emergency_fund *= 1.00167
-        self._update_wellbeing(messages)
-        self._check_random_events()
-
-        # Append monthly snapshot before incrementing month
-        snapshot = {
-            'month': self.current_month,
-            'money': self.money,
-            'debt': self.debt,
-            'investments': self.investments,
-            'emergency_fund': self.emergency_fund,
-            'happiness': self.happiness,
-            'stress': self.stress,
-        }
-        self.monthly_log.append(snapshot)
-
-        self.current_month += 1
-        self.actions_taken_this_month = 0
-        self.actions_remaining = ACTIONS_PER_MONTH
-        self.game_message = " | ".join(messages) if messages else f"Month {self.current_month} complete."
-        self.check_goals()
-        self.need_button_update = True
-        if self.money < -10000:
-            self.end_game(False, "Bankrupt! Debt exceeded $10,000 limit.")
-
-    def _process_income(self):
-        messages = []
-        if self.months_no_income == 0:
-            income = self.monthly_income
-            if 'distracted' in self.debuffs:
-                income *= 0.8
-                messages.append("Distracted: -20% income")
-                if random.random() < 0.1:
-                    self.months_no_income = 2
-                    messages.append("Fired due to performance!")
-                    self.stress += 30
-                    self._add_particle(random.randint(0, SCREEN_WIDTH), 100, COLOR_DANGER)
-            self.money += income
-            self._add_particle(random.randint(0, SCREEN_WIDTH), 100, COLOR_SUCCESS)
-        else:
-            self.months_no_income -= 1
-            messages.append(f"No income ({self.months_no_income} months left)")
-        return messages
-
-    def _process_expenses(self):
-        self.money -= self.rent + self.groceries + self.transport
-
-    def _process_investments(self):
-        diff = self.difficulty_configs[self.selected_difficulty]
-        monthly_return = (random.random() * 0.25 - 0.10) / 12 * diff.market_volatility
-        self.investments *= (1 + monthly_return)
-
-    def _update_wellbeing(self, messages):
-        self.stress = max(0, self.stress - 2)
-        dti = self.debt / (self.monthly_income * 12) if self.monthly_income > 0 else 0
-        if dti > 0.5: self.stress += 5
-        if self.emergency_fund < self.monthly_income * 3: self.stress += 2
-        self.happiness = max(0, self.happiness - 3)
-        if 'unhappy' in self.debuffs: messages.append("You are unhappy!")
-        if self.stress >= BURNOUT_STRESS or self.happiness <= BURNOUT_HAPPINESS: self._trigger_burnout()
-        self.stress = min(100, self.stress)
-        self.happiness = min(100, self.happiness)
-
-    def _trigger_burnout(self):
-        self.trigger_event(EmergencyEvent("🔥 BURNOUT!", "You've reached your breaking point. Forced medical leave.", cost=2000, months_no_income=2))
-        self.stress = 50
-        if 'unhappy' not in self.debuffs: self.debuffs.append('unhappy')
-
-    def _check_random_events(self):
-        diff = self.difficulty_configs[self.selected_difficulty]
-        if random.random() < diff.emergency_chance:
-            self.trigger_event(random.choice(self.emergency_events))
-        debuff_chance = 0.5 - (self.happiness / 100) * 0.4
-        if random.random() < debuff_chance and 'distracted' not in self.debuffs:
-            self.debuffs.append('distracted')
-            self.stress += 10
-
-    def trigger_event(self, event):
-        self.current_event = event
-        self.show_event_modal = True
-
-    def handle_event_close(self):
-        if self.current_event:
-            if self.current_event.cost > 0:
-                self.money -= self.current_event.cost
-                self._add_particle(SCREEN_WIDTH//2, SCREEN_HEIGHT//2, COLOR_DANGER)
-            if self.current_event.stress_increase > 0:
-                self.stress = min(100, self.stress + self.current_event.stress_increase)
-            if self.current_event.months_no_income > 0:
-                self.months_no_income = self.current_event.months_no_income
-            if self.current_event.investment_loss > 0:
-                self.investments *= (1 - self.current_event.investment_loss)
-        self.show_event_modal = False
-        self.current_event = None
-        self.need_button_update = True
-
-    def take_life_choice(self, choice_key):
-        if self.actions_remaining <= 0:
-            self.game_message = f"⚠️ No actions left! ({self.actions_taken_this_month}/{ACTIONS_PER_MONTH})"
-            return
-        choice = self.life_choices[choice_key]
-        if not self._validate_life_choice(choice_key, choice): return
-        self.money -= choice.cost
-        self.actions_taken_this_month += 1
-        self.actions_remaining -= 1
-        if choice.happiness > 0:
-            self._add_particle(self.screen.get_width()//2, self.screen.get_height()//2, COLOR_SUCCESS)
-
-        # Update counters for statistics
-        if choice.choice_type == 'leisure':
-            self.num_leisure += 1
-        elif choice.choice_type == 'risky':
-            self.num_risky += 1
-
-        if choice.choice_type == 'education':
-            self._handle_education_upgrade(choice_key, choice)
-            return
-        self.happiness = min(100, self.happiness + choice.happiness)
-        self.stress = max(0, self.stress + choice.stress)
-        if choice.choice_type == 'risky':
-            if self._handle_risky_choice(choice_key, choice): return
-        if choice_key == 'vehicle': self.has_vehicle = True
-        self.game_message = f"{choice.name}: Happiness +{choice.happiness:.0f} | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
-        self.need_button_update = True
-
-    def _validate_life_choice(self, choice_key, choice):
-        if choice.one_time and choice_key == 'vehicle' and self.has_vehicle:
-            self.game_message = "You already own a vehicle!"; return False
-        if choice_key == 'university' and self.has_university:
-            self.game_message = "You already have a degree!"; return False
-        if choice_key == 'masters':
-            if self.has_masters: self.game_message = "Already have a master's!"; return False
-            if not self.has_university: self.game_message = "Need University degree first!"; return False
-        if self.money < choice.cost: self.game_message = "Not enough money!"; return False
-        return True
-
-    def _handle_education_upgrade(self, choice_key, choice):
-        if choice_key == 'university':
-            self.monthly_income += 1500; self.has_university = True; self.current_education_level = 'university'
-            self.debt += choice.cost; self.money += choice.cost
-            self.happiness = min(100, self.happiness + 10); self.stress = min(100, self.stress + 15)
-            self.game_message = "🎓 Degree Earned! Income +$1500/mo (Added to debt)"
-        elif choice_key == 'masters':
-            self.monthly_income += 1000; self.has_masters = True; self.current_education_level = 'masters'
-            self.debt += choice.cost; self.money += choice.cost
-            self.happiness = min(100, self.happiness + 15); self.stress = min(100, self.stress + 20)
-            self.game_message = "🎓 Masters Earned! Income +$1000/mo (Added to debt)"
-        self.need_button_update = True
-
-    def _handle_risky_choice(self, choice_key, choice):
-        if choice_key == 'gambling' and random.random() < choice.win_chance:
-            self.money += choice.win_amount
-            self.game_message = f"You won ${choice.win_amount:.0f}!"
-            self._add_particle(self.screen.get_width()//2, self.screen.get_height()//2, COLOR_WARNING)
-            self.need_button_update = True; return True
-        if choice.debuff_chance > 0 and random.random() < choice.debuff_chance:
-            if choice.debuff not in self.debuffs:
-                self.debuffs.append(choice.debuff)
-                self.game_message = f"Addicted to {choice.name}!"
-                self._add_particle(self.screen.get_width()//2, self.screen.get_height()//2, COLOR_DANGER)
-                self.need_button_update = True; return True
-        return False
-
-    def invest_money(self, amount):
-        if self.actions_remaining <= 0: self.game_message = f"No actions left!"; return
-        if self.money >= amount:
-            self.money -= amount; self.investments += amount
-            self.total_investments += amount   # for statistics
-            self.actions_taken_this_month += 1; self.actions_remaining -= 1
-            self.game_message = f"Invested ${amount:.0f} | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
-            self._add_particle(self.screen.get_width()//2, self.screen.get_height()//2, COLOR_PRIMARY)
-            self.need_button_update = True
-
-    def withdraw_investment(self, amount):
-        if self.actions_remaining <= 0: self.game_message = f"⚠️ No actions left!"; return
-        withdrawal = min(amount, self.investments)
-        if withdrawal > 0:
-            self.investments -= withdrawal; self.money += withdrawal
-            self.actions_taken_this_month += 1; self.actions_remaining -= 1
-            self.game_message = f"Withdrew ${withdrawal:.0f} | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
-            self.need_button_update = True
-        else:
-            self.game_message = "No investments!"
-
-    def add_to_emergency_fund(self, amount):
-        if self.actions_remaining <= 0: self.game_message = f"⚠️ No actions left!"; return
-        if self.money >= amount:
-            self.money -= amount; self.emergency_fund += amount
-            self.total_saved += amount   # for statistics
-            self.actions_taken_this_month += 1; self.actions_remaining -= 1
-            self.game_message = f"Saved ${amount:.0f} | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
-            self.need_button_update = True
-
-    def pay_off_debt(self, amount):
-        if self.actions_remaining <= 0: self.game_message = f"No actions left!"; return
-        payment = min(amount, self.debt, self.money)
-        if payment > 0:
-            self.money -= payment; self.debt -= payment; self.stress = max(0, self.stress - 5)
-            self.total_debt_paid += payment   # for statistics
-            self.actions_taken_this_month += 1; self.actions_remaining -= 1
-            self.game_message = f"💳 Paid ${payment:.0f} debt | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
-            self._add_particle(self.screen.get_width()//2, self.screen.get_height()//2, COLOR_SUCCESS)
-            self.need_button_update = True
-
     def close_dropdown(self):
         self.active_dropdown = None; self.dropdown_hover = False
 
@@ -1684,32 +1753,9 @@ class FinanceGame:
         self.custom_input_text = ""; self.close_dropdown()
 
     def execute_financial_action(self, action_type, amount):
-        if action_type == 'invest':
-            self.invest_money(amount)
-        elif action_type == 'save':
-            if self.money >= amount:
-                self.money -= amount; self.emergency_fund += amount
-                self.total_saved += amount   # for statistics
-                self.actions_taken_this_month += 1; self.actions_remaining -= 1
-                self.game_message = f"💵 Saved ${amount:.0f} | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
-                self.need_button_update = True
-            else:
-                self.game_message = "Not enough money"
-        elif action_type == 'withdraw':
-            self._withdraw_emergency(amount)
-        elif action_type == 'pay_debt':
-            self.pay_off_debt(amount)
+        super().execute_financial_action(action_type, amount)
         self.close_dropdown()
 
-    def _withdraw_emergency(self, amount):
-        if self.actions_remaining <= 0: self.game_message = f"No actions left!"; return
-        withdrawal = min(amount, self.emergency_fund)
-        if withdrawal > 0:
-            self.emergency_fund -= withdrawal; self.money += withdrawal
-            self.actions_taken_this_month += 1; self.actions_remaining -= 1
-            self.game_message = f"Withdrew ${withdrawal:.0f} | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
-            self.need_button_update = True
-
     def handle_custom_input_submit(self):
         try:
             amount = float(self.custom_input_text)
@@ -1720,76 +1766,134 @@ class FinanceGame:
         except ValueError:
             self.game_message = "Invalid amount"
 
-    def treat_addiction(self):
-        if self.actions_remaining <= 0: self.game_message = f"No actions left!"; return
-        if self.money < 1500: self.game_message = "Need $1500 for treatment"; return
-        self.money -= 1500; self.actions_taken_this_month += 1; self.actions_remaining -= 1
-        if random.random() < self.happiness / 100:
-            self.debuffs = [d for d in self.debuffs if d != 'addict']
-            self.happiness = min(100, self.happiness + 10)
-            self.game_message = f"Addiction cured! | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
-            self._add_particle(self.screen.get_width()//2, self.screen.get_height()//2, COLOR_SUCCESS)
-        else:
-            self.game_message = f"Treatment failed. | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
-        self.need_button_update = True
-
-    def seek_therapy(self):
-        if self.actions_remaining <= 0: self.game_message = f"No actions left!"; return
-        if self.money < 800: self.game_message = "Need $800 for therapy"; return
-        self.money -= 800
-        self.debuffs = [d for d in self.debuffs if d not in ['unhappy', 'distracted']]
-        self.stress = max(0, self.stress - 20); self.happiness = min(100, self.happiness + 15)
-        self.actions_taken_this_month += 1; self.actions_remaining -= 1
-        self.game_message = f"Therapy successful! | Actions: {self.actions_remaining}/{ACTIONS_PER_MONTH}"
-        self._add_particle(self.screen.get_width()//2, self.screen.get_height()//2, COLOR_ACCENT)
-        self.need_button_update = True
-
-    def check_goals(self):
-        nw = self.money + self.investments + self.emergency_fund - self.debt
-        if nw >= self.goals['netWorth']['target']: self.goals['netWorth']['completed'] = True
-        if self.emergency_fund >= self.goals['emergencyFund']['target']: self.goals['emergencyFund']['completed'] = True
-        if self.debt <= 0: self.goals['debtFree']['completed'] = True
-        if self.happiness >= self.goals['happiness']['target']: self.goals['happiness']['completed'] = True
-
-    def calculate_score(self):
-        nw = self.money + self.investments + self.emergency_fund - self.debt
-        goal_bonus = sum(1 for g in self.goals.values() if g['completed']) * 5000
-        return max(0, int(nw + goal_bonus + self.happiness * 100 + self.current_month * 500))
+    def next_month(self):
+        super().next_month()
+        if self.state == GameState.PLAYING and self.replay_player is None and not self._fast_forward:
+            self.autosave.append(self)
 
-    def end_game(self, completed, reason=''):
-        score = self.calculate_score()
+    def autopilot(self, months=AUTOPILOT_MONTHS):
+        """Play `months` months back to back without drawing them, then show what happened."""
+        if self.replay_player is not None or self.finished:
+            return
+        self.close_dropdown()
+        self._fast_forward = True
+        try:
+            summary = policies.fast_forward(self, months, self.autopilot_policy)
+        finally:
+            self._fast_forward = False
+        if self.state == GameState.PLAYING:
+            self.autosave.append(self)      # one record for the whole run
+        self.push_modal(AutopilotSummaryModal(summary))
+
+    def _on_game_over(self, completed, score):
+        self.state = GameState.GAME_OVER
+        self.new_high_score = False
+        if self.replay_player is not None:
+            return  # watching a recording: nothing new to save
+        self.autosave.discard()
+        self.cached_buttons[GameState.TITLE][4].visible = False
+        if self.leaderboard is not None:
+            try:
+                self.leaderboard.add(entry_for(self, self.selected_avatar, self.recorder))
+            except OSError as e:
+                print(f"Could not record the score on the leaderboard: {e}")
         if score > self.high_score:
             self.high_score = score
-            self._save_high_score()
-        self.game_message = reason or ('Game completed!' if completed else 'Game over!')
+            self.new_high_score = True
         self._save_game_summary()          # save for optional later use
         self._save_goal_training_data()    # save for goal prediction training
-        self.state = GameState.GAME_OVER
+        if self.recorder is not None:
+            save_replay(self.recorder)
+            self.recorder = None
+            self.cached_buttons[GameState.TITLE][3].visible = True
+
+    # ========== SAVE / RESUME ==========
+    def snapshot(self):
+        state = super().snapshot()
+        state['avatar'] = [self.selected_avatar, list(self.selected_avatar_acc), list(self.selected_avatar_bg)]
+        return state
+
+    def restore(self, state, monthly_log=()):
+        super().restore(state, monthly_log)
+        face, (acc_emoji, acc_label, offsets), bg = state['avatar']
+        self.selected_avatar = face
+        self.selected_avatar_acc = (acc_emoji, acc_label, tuple(offsets))
+        self.selected_avatar_bg = tuple(bg)
+
+    def _resume_game(self):
+        saved = load_autosave(self.autosave.path)
+        if saved is None:
+            self.cached_buttons[GameState.TITLE][4].visible = False
+            return
+        state, monthly_log, ops = saved
+        try:
+            self.restore(state, monthly_log)
+        except OSError as e:                # played on a market tape that is gone
+            print(f"Resume failed: {e}")
+            self.cached_buttons[GameState.TITLE][4].visible = False
+            return
+        self.recorder = Replay.for_game(self)
+        self.recorder.ops = ops
+        self.autosave.begin(self)           # compact the deltas into a fresh base
+        self.scroll_offset = 0
+        self._init_playing_buttons()
+        self._reset_action_buttons()
+        self.state = GameState.PLAYING
 
-    def _draw_text(self, text, font, color, x, y, center=False, shadow=False, glow=False):
+    # ========== REPLAYS ==========
+    def _watch_last_replay(self):
+        paths = list_replays()
+        if not paths:
+            return
+        try:
+            self.replay_player = ReplayPlayer(self, load_replay(paths[-1]))
+        except (OSError, ValueError) as e:
+            print(f"Replay failed: {e}")
+
+    def _update_replay(self, events):
+        """Advance the replay being watched; returns the events the screens may still see."""
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.replay_player = None; self.state = GameState.TITLE
+                    return []
+                if event.key in (pygame.K_UP, pygame.K_RIGHT): self.replay_player.faster()
+                elif event.key in (pygame.K_DOWN, pygame.K_LEFT): self.replay_player.slower()
+        if not self.replay_player.advance(self.clock.get_time()):
+            self.replay_player = None
+            if self.state == GameState.PLAYING:
+                self.state = GameState.TITLE
+            return events
+        return [e for e in events if e.type == pygame.MOUSEMOTION]
+
+    def _draw_replay_banner(self):
+        text = f"▶ REPLAY  {self.replay_player.speed}x   ↑/↓ speed · Esc to stop"
+        surf = self._render_cached(text, self.font_small, COLOR_BG)
+        rect = surf.get_rect(midbottom=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 12)).inflate(30, 12)
+        pygame.draw.rect(self.screen, COLOR_WARNING, rect, border_radius=10)
+        self.screen.blit(surf, surf.get_rect(center=rect.center))
+
+    def _draw_text(self, text, font, color, x, y, center=False, shadow=False, glow=False, surface=None):
+        surface = surface or self.screen
         if shadow:
             ss = font.render(text, True, (0, 0, 0))
             sr = ss.get_rect()
             sr.topleft = (x+3, y+3) if not center else (x+3-ss.get_width()//2, y+3-ss.get_height()//2)
-            self.screen.blit(ss, sr)
+            surface.blit(ss, sr)
         if glow:
             for _ in range(1, 4):
                 gs = font.render(text, True, color[:3])
                 gr = gs.get_rect(center=(x, y)) if center else gs.get_rect(topleft=(x, y))
-                self.screen.blit(gs, gr)
+                surface.blit(gs, gr)
         ts = font.render(text, True, color)
         tr = ts.get_rect(center=(x, y)) if center else ts.get_rect(topleft=(x, y))
-        self.screen.blit(ts, tr)
+        surface.blit(ts, tr)
 
     def _draw_progress_bar(self, x, y, width, height, percentage, color, bg_color=COLOR_PANEL, glow=False):
-        for i in range(height):
-            pygame.draw.line(self.screen, bg_color, (x, y+i), (x+width, y+i))
+        self.screen.blit(get_gradient_sprite(width, height, bg_color, bg_color), (x, y))
         fw = int(width * max(0, min(100, percentage)) / 100)
         if fw > 0:
-            for i in range(height):
-                ratio = i / height
-                fc = (int(color[0]*(1-ratio*0.3)), int(color[1]*(1-ratio*0.3)), int(color[2]*(1-ratio*0.3)))
-                pygame.draw.line(self.screen, fc, (x, y+i), (x+fw, y+i))
+            self.screen.blit(get_bar_sprite(width, height, color), (x, y), area=(0, 0, fw, height))
         pygame.draw.rect(self.screen, COLOR_BORDER, (x, y, width, height), 1, border_radius=height//2)
 
     def _draw_gradient_background(self):
@@ -1801,40 +1905,88 @@ class FinanceGame:
             pygame.draw.line(self.screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
 
     def _wrap_text(self, text, font, max_width):
-        words = text.split()
-        lines, current_line = [], []
-        for word in words:
-            current_line.append(word)
-            if font.size(' '.join(current_line))[0] > max_width:
-                current_line.pop()
-                if current_line: lines.append(' '.join(current_line))
-                current_line = [word]
-        if current_line: lines.append(' '.join(current_line))
-        return lines
+        return wrap_text(text, font, max_width)
+
+    def _cached_layer(self, name, key, builder):
+        """Return the pre-rendered layer `name`, rebuilding it only when `key` changes."""
+        cached = self._modal_layers.get(name)
+        if cached is None or cached[0] != key:
+            cached = (key, builder())
+            self._modal_layers[name] = cached
+        return cached[1]
+
+    def _render_cached(self, text, font, color):
+        """Text surface for a fixed modal label, rendered once."""
+        key = (text, id(font), color)
+        surf = self._label_cache.get(key)
+        if surf is None:
+            surf = font.render(text, True, color)
+            self._label_cache[key] = surf
+        return surf
+
+    def _avatar_modal_rect(self):
+        mw, mh = 820, 700
+        return pygame.Rect((SCREEN_WIDTH - mw) // 2, (SCREEN_HEIGHT - mh) // 2, mw, mh)
+
+    def _avatar_builder_rows(self, content_y):
+        """Y positions of each row in the builder tab (labels and the rows under them)."""
+        tile, gap, swatch = 54, 8, 36
+        rows = {}
+        row_y = content_y + 5
+        rows['face_label'] = row_y; row_y += 24
+        rows['face_tiles'] = row_y
+        row_y += (len(AVATAR_FACES) + 9) // 10 * (tile + gap) + 14
+        rows['acc_label'] = row_y; row_y += 24
+        rows['acc_tiles'] = row_y
+        row_y += (len(AVATAR_ACCESSORIES) + 9) // 10 * (tile + gap) + 14
+        rows['bg_label'] = row_y; row_y += 24
+        rows['bg_swatches'] = row_y
+        row_y += swatch + 20
+        rows['custom_label'] = row_y; row_y += 24
+        rows['custom_input'] = row_y
+        return rows
+
+    def _build_avatar_creator_layer(self, tab):
+        """Modal chrome, tabs and section headings for the given tab."""
+        modal = self._avatar_modal_rect()
+        mw, mh = modal.size
+        layer = pygame.Surface((mw, mh), pygame.SRCALPHA)
+        pygame.draw.rect(layer, (12, 20, 35), (0, 0, mw, mh), border_radius=24)
+        pygame.draw.rect(layer, COLOR_ACCENT, (0, 0, mw, mh), 3, border_radius=24)
+        pygame.draw.rect(layer, COLOR_PANEL, (0, 0, mw, 64), border_top_left_radius=24, border_top_right_radius=24)
+        self._draw_text("✨ CUSTOM AVATAR CREATOR", self.font_medium, COLOR_ACCENT, mw // 2, 32, center=True, glow=True, surface=layer)
+        tab_font = get_font("Arial", 17, bold=True)
+        for i, (tab_id, tab_label) in enumerate([('builder', 'Build Your Own'), ('quick', 'Quick Pick')]):
+            tab_rect = pygame.Rect(30 + i * 390, 76, 370, 40)
+            is_active = tab == tab_id
+            pygame.draw.rect(layer, COLOR_ACCENT if is_active else COLOR_PANEL_HOVER, tab_rect, border_radius=10)
+            pygame.draw.rect(layer, COLOR_ACCENT if is_active else COLOR_BORDER, tab_rect, 2, border_radius=10)
+            ls = tab_font.render(tab_label, True, COLOR_BG if is_active else COLOR_TEXT)
+            layer.blit(ls, ls.get_rect(center=tab_rect.center))
+        content_y = 76 + 52
+        if tab == 'builder':
+            rows = self._avatar_builder_rows(content_y)
+            self._draw_text("FACE", self.font_tiny, COLOR_ACCENT, 20, rows['face_label'], surface=layer)
+            self._draw_text("ACCESSORY / OVERLAY", self.font_tiny, COLOR_ACCENT, 20, rows['acc_label'], surface=layer)
+            self._draw_text("AVATAR BACKGROUND COLOR", self.font_tiny, COLOR_ACCENT, 20, rows['bg_label'], surface=layer)
+            self._draw_text("OR TYPE YOUR OWN EMOJI (overrides selections above):", self.font_tiny, COLOR_WARNING, 20, rows['custom_label'], surface=layer)
+        else:
+            self._draw_text("CHOOSE A PRESET AVATAR", self.font_small, COLOR_ACCENT, 30, content_y + 18 - 8, surface=layer)
+        prev_x, prev_y, prev_w, prev_h = mw - 185, content_y + 10, 165, 190
+        pygame.draw.rect(layer, COLOR_PANEL, (prev_x, prev_y, prev_w, prev_h), border_radius=18)
+        pygame.draw.rect(layer, COLOR_ACCENT, (prev_x, prev_y, prev_w, prev_h), 2, border_radius=18)
+        return layer
 
     def _draw_avatar_creator_modal(self, events):
         ac = self.avatar_creator
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        self.screen.blit(overlay, (0, 0))
-        mw, mh = 820, 700
-        mx = (SCREEN_WIDTH - mw) // 2
-        my = (SCREEN_HEIGHT - mh) // 2
-        pygame.draw.rect(self.screen, (12, 20, 35), (mx, my, mw, mh), border_radius=24)
-        pygame.draw.rect(self.screen, COLOR_ACCENT, (mx, my, mw, mh), 3, border_radius=24)
-        pygame.draw.rect(self.screen, COLOR_PANEL, (mx, my, mw, 64), border_top_left_radius=24, border_top_right_radius=24)
-        self._draw_text("✨ CUSTOM AVATAR CREATOR", self.font_medium, COLOR_ACCENT, mx + mw // 2, my + 32, center=True, glow=True)
+        self.screen.blit(get_dim_overlay(200), (0, 0))
+        modal = self._avatar_modal_rect()
+        mx, my, mw, mh = modal
+        self.screen.blit(self._cached_layer('avatar_creator', ac.tab,
+                                            lambda: self._build_avatar_creator_layer(ac.tab)), modal)
         tab_y = my + 76
-        for i, (tab_id, tab_label) in enumerate([('builder', 'Build Your Own'), ('quick', 'Quick Pick')]):
-            tx = mx + 30 + i * 390
-            tab_rect = pygame.Rect(tx, tab_y, 370, 40)
-            is_active = ac.tab == tab_id
-            bg = COLOR_ACCENT if is_active else COLOR_PANEL_HOVER
-            pygame.draw.rect(self.screen, bg, tab_rect, border_radius=10)
-            pygame.draw.rect(self.screen, COLOR_ACCENT if is_active else COLOR_BORDER, tab_rect, 2, border_radius=10)
-            lf = pygame.font.SysFont("Arial", 17, bold=True)
-            ls = lf.render(tab_label, True, COLOR_BG if is_active else COLOR_TEXT)
-            self.screen.blit(ls, ls.get_rect(center=tab_rect.center))
+        for i, tab_id in enumerate(['builder', 'quick']):
+            tab_rect = pygame.Rect(mx + 30 + i * 390, tab_y, 370, 40)
             for event in events:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     if tab_rect.collidepoint(event.pos):
@@ -1849,15 +2001,12 @@ class FinanceGame:
         prev_x = mx + mw - 185
         prev_y = content_y + 10
         prev_w, prev_h = 165, 190
-        pygame.draw.rect(self.screen, COLOR_PANEL, (prev_x, prev_y, prev_w, prev_h), border_radius=18)
         bg_col = ac.get_bg_color()
         pygame.draw.rect(self.screen, bg_col, (prev_x + 4, prev_y + 4, prev_w - 8, prev_h - 8), border_radius=14)
-        face, acc_data = ac.get_avatar_composition()
-        draw_composite_avatar(self.screen, face, acc_data, prev_x + prev_w // 2, prev_y + 80, 64)
-        lf2 = pygame.font.SysFont("Arial", 13, bold=True)
-        self.screen.blit(lf2.render("PREVIEW", True, COLOR_TEXT_DIM),
-                         lf2.render("PREVIEW", True, COLOR_TEXT_DIM).get_rect(center=(prev_x + prev_w // 2, prev_y + prev_h - 18)))
-        pygame.draw.rect(self.screen, COLOR_ACCENT, (prev_x, prev_y, prev_w, prev_h), 2, border_radius=18)
+        surf, (cx, cy) = ac.get_sprite(64)
+        self.screen.blit(surf, (prev_x + prev_w // 2 - cx, prev_y + 80 - cy))
+        preview_label = self._render_cached("PREVIEW", get_font("Arial", 13, bold=True), COLOR_TEXT_DIM)
+        self.screen.blit(preview_label, preview_label.get_rect(center=(prev_x + prev_w // 2, prev_y + prev_h - 18)))
         btn_y = my + mh - 68
         confirm_rect = pygame.Rect(mx + mw // 2 - 230, btn_y, 210, 48)
         cancel_rect  = pygame.Rect(mx + mw // 2 + 20,  btn_y, 210, 48)
@@ -1867,9 +2016,11 @@ class FinanceGame:
         pygame.draw.rect(self.screen, COLOR_PANEL_HOVER if not x_hov else (60, 70, 90), cancel_rect, border_radius=12)
         pygame.draw.rect(self.screen, COLOR_SUCCESS, confirm_rect, 2, border_radius=12)
         pygame.draw.rect(self.screen, COLOR_BORDER, cancel_rect, 2, border_radius=12)
-        cf = pygame.font.SysFont("Arial", 18, bold=True)
-        self.screen.blit(cf.render("✓  Use This Avatar", True, COLOR_BG), cf.render("✓  Use This Avatar", True, COLOR_BG).get_rect(center=confirm_rect.center))
-        self.screen.blit(cf.render("✗  Cancel", True, COLOR_TEXT), cf.render("✗  Cancel", True, COLOR_TEXT).get_rect(center=cancel_rect.center))
+        cf = get_font("Arial", 18, bold=True)
+        confirm_label = self._render_cached("✓  Use This Avatar", cf, COLOR_BG)
+        cancel_label = self._render_cached("✗  Cancel", cf, COLOR_TEXT)
+        self.screen.blit(confirm_label, confirm_label.get_rect(center=confirm_rect.center))
+        self.screen.blit(cancel_label, cancel_label.get_rect(center=cancel_rect.center))
         for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if confirm_rect.collidepoint(event.pos):
@@ -1880,11 +2031,11 @@ class FinanceGame:
 
     def _draw_avatar_builder_tab(self, mx, my, mw, mh, content_y, ac, events, mouse_pos):
         section_x = mx + 20
-        row_y = content_y + 5
-        self._draw_text("FACE", self.font_tiny, COLOR_ACCENT, section_x, row_y)
-        row_y += 24
+        rows = self._avatar_builder_rows(content_y - my)
         tile = 54
         gap  = 8
+        atlas = get_emoji_atlas(26)
+        row_y = my + rows['face_tiles']
         for i, (em, label) in enumerate(AVATAR_FACES):
             cols = 10
             col = i % cols
@@ -1904,17 +2055,12 @@ class FinanceGame:
             else:
                 pygame.draw.rect(self.screen, (25, 38, 58), tr, border_radius=10)
             pygame.draw.rect(self.screen, (COLOR_PRIMARY if is_sel else (COLOR_ACCENT if is_hov else COLOR_BORDER)), tr, 2, border_radius=10)
-            ef = pygame.font.SysFont("Segoe UI Emoji", 26)
-            es = ef.render(em, True, COLOR_TEXT)
+            es = atlas[em]
             self.screen.blit(es, es.get_rect(center=tr.center))
             for event in events:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and tr.collidepoint(event.pos):
-                    ac.selected_face_idx = i
-                    ac.custom_emoji_text = ""
-        rows_face = (len(AVATAR_FACES) + 9) // 10
-        row_y += rows_face * (tile + gap) + 14
-        self._draw_text("ACCESSORY / OVERLAY", self.font_tiny, COLOR_ACCENT, section_x, row_y)
-        row_y += 24
+                    ac.select_face(i)
+        row_y = my + rows['acc_tiles']
         for i, (em, label, _) in enumerate(AVATAR_ACCESSORIES):
             cols = 10
             col = i % cols
@@ -1931,18 +2077,12 @@ class FinanceGame:
             else:
                 pygame.draw.rect(self.screen, (25, 38, 58), tr, border_radius=10)
             pygame.draw.rect(self.screen, (COLOR_ACCENT if is_sel else (COLOR_PRIMARY if is_hov else COLOR_BORDER)), tr, 2, border_radius=10)
-            ef = pygame.font.SysFont("Segoe UI Emoji", 26)
-            disp = em if em else "∅"
-            es = ef.render(disp, True, COLOR_TEXT)
+            es = atlas[em if em else "∅"]
             self.screen.blit(es, es.get_rect(center=tr.center))
             for event in events:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and tr.collidepoint(event.pos):
-                    ac.selected_acc_idx = i
-                    ac.custom_emoji_text = ""
-        rows_acc = (len(AVATAR_ACCESSORIES) + 9) // 10
-        row_y += rows_acc * (tile + gap) + 14
-        self._draw_text("AVATAR BACKGROUND COLOR", self.font_tiny, COLOR_ACCENT, section_x, row_y)
-        row_y += 24
+                    ac.select_accessory(i)
+        row_y = my + rows['bg_swatches']
         swatch = 36
         for i, (col, name) in enumerate(AVATAR_BG_COLORS):
             sx = section_x + i * (swatch + 6)
@@ -1956,10 +2096,8 @@ class FinanceGame:
                 pygame.draw.rect(self.screen, COLOR_TEXT, sr, 2, border_radius=8)
             for event in events:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and sr.collidepoint(event.pos):
-                    ac.selected_bg_idx = i
-        row_y += swatch + 20
-        self._draw_text("OR TYPE YOUR OWN EMOJI (overrides selections above):", self.font_tiny, COLOR_WARNING, section_x, row_y)
-        row_y += 24
+                    ac.select_bg(i)
+        row_y = my + rows['custom_input']
         input_rect = pygame.Rect(section_x, row_y, 260, 44)
         is_active = ac.custom_emoji_input_active
         pygame.draw.rect(self.screen, COLOR_PANEL, input_rect, border_radius=10)
@@ -1967,35 +2105,35 @@ class FinanceGame:
         disp_text = ac.custom_emoji_text if ac.custom_emoji_text else "e.g. 🦄 or 🤖"
         cursor = "|" if (is_active and pygame.time.get_ticks() % 1000 < 500) else " "
         txt_col = COLOR_TEXT if ac.custom_emoji_text else COLOR_TEXT_DIM
-        ef2 = pygame.font.SysFont("Segoe UI Emoji", 22)
-        rendered = ef2.render((ac.custom_emoji_text + cursor) if is_active else disp_text, True, txt_col)
+        ef2 = get_font("Segoe UI Emoji", 22)
+        rendered = self._cached_layer('avatar_custom_text', ((ac.custom_emoji_text + cursor) if is_active else disp_text, txt_col),
+                                      lambda: ef2.render((ac.custom_emoji_text + cursor) if is_active else disp_text, True, txt_col))
         self.screen.blit(rendered, (input_rect.x + 10, input_rect.y + 10))
         clr_rect = pygame.Rect(input_rect.right + 10, row_y + 4, 70, 36)
         clr_hov = clr_rect.collidepoint(mouse_pos)
         pygame.draw.rect(self.screen, (COLOR_DANGER if clr_hov else COLOR_PANEL_HOVER), clr_rect, border_radius=8)
         pygame.draw.rect(self.screen, COLOR_DANGER, clr_rect, 1, border_radius=8)
-        cf2 = pygame.font.SysFont("Arial", 14, bold=True)
-        self.screen.blit(cf2.render("Clear", True, COLOR_TEXT), cf2.render("Clear", True, COLOR_TEXT).get_rect(center=clr_rect.center))
+        clear_label = self._render_cached("Clear", get_font("Arial", 14, bold=True), COLOR_TEXT)
+        self.screen.blit(clear_label, clear_label.get_rect(center=clr_rect.center))
         for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if input_rect.collidepoint(event.pos):
                     ac.custom_emoji_input_active = True
                 elif clr_rect.collidepoint(event.pos):
-                    ac.custom_emoji_text = ""
-                    ac.custom_emoji_input_active = False
+                    ac.reset_custom()
                 else:
                     ac.custom_emoji_input_active = False
             if event.type == pygame.KEYDOWN and ac.custom_emoji_input_active:
                 if event.key == pygame.K_BACKSPACE:
                     if ac.custom_emoji_text:
-                        ac.custom_emoji_text = ac.custom_emoji_text[:-1]
+                        ac.set_custom_emoji(ac.custom_emoji_text[:-1])
                 elif event.key == pygame.K_ESCAPE:
                     ac.custom_emoji_input_active = False
                 elif event.key == pygame.K_RETURN:
                     ac.custom_emoji_input_active = False
                 else:
                     if len(ac.custom_emoji_text) < 6:
-                        ac.custom_emoji_text += event.unicode
+                        ac.set_custom_emoji(ac.custom_emoji_text + event.unicode)
 
     def _draw_avatar_quickpick_tab(self, mx, my, mw, mh, content_y, ac, events, mouse_pos):
         section_x = mx + 20
@@ -2003,7 +2141,8 @@ class FinanceGame:
         tile_gap  = 14
         cols = 6
         start_y = content_y + 18
-        self._draw_text("CHOOSE A PRESET AVATAR", self.font_small, COLOR_ACCENT, section_x + 10, start_y - 8)
+        atlas = get_emoji_atlas(34)
+        lf = get_font("Arial", 11, bold=True)
         for i, av in enumerate(AVATARS):
             col = i % cols
             row = i // cols
@@ -2023,17 +2162,14 @@ class FinanceGame:
                 pygame.draw.rect(self.screen, (28, 42, 62), tile_rect, border_radius=12)
             border_col = COLOR_PRIMARY if is_selected else (COLOR_ACCENT if is_hovered else COLOR_BORDER)
             pygame.draw.rect(self.screen, border_col, tile_rect, 2 if not is_selected else 3, border_radius=12)
-            ef = pygame.font.SysFont("Segoe UI Emoji", 34)
-            es = ef.render(av["emoji"], True, COLOR_TEXT)
+            es = atlas[av["emoji"]]
             self.screen.blit(es, es.get_rect(center=(tx + tile_size // 2, ty + tile_size // 2 - 8)))
-            lf = pygame.font.SysFont("Arial", 11, bold=True)
-            ls = lf.render(av["label"], True, COLOR_BG if is_selected else COLOR_TEXT_DIM)
+            ls = self._render_cached(av["label"], lf, COLOR_BG if is_selected else COLOR_TEXT_DIM)
             self.screen.blit(ls, ls.get_rect(center=(tx + tile_size // 2, ty + tile_size - 10)))
             for event in events:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     if tile_rect.collidepoint(event.pos):
-                        ac.custom_emoji_text = av["emoji"]
-                        ac.selected_face_idx = i
+                        ac.select_face(i, av["emoji"])
                         self._add_particle(tx + tile_size // 2, ty + tile_size // 2, COLOR_ACCENT)
 
     def _draw_setup(self, events):
@@ -2064,12 +2200,8 @@ class FinanceGame:
         pygame.draw.rect(self.screen, COLOR_PANEL, (panel_x, row_y, panel_w, panel_h), border_radius=16)
         pygame.draw.rect(self.screen, COLOR_ACCENT, (panel_x, row_y, panel_w, panel_h), 2, border_radius=16)
         self._draw_text("YOUR AVATAR", self.font_small, COLOR_ACCENT, panel_x + 22, row_y + 14)
-        face, acc_data = self.avatar_creator.get_avatar_composition()
-        bg_col = self.avatar_creator.get_bg_color()
-        cx, cy = panel_x + 58, row_y + 75
-        pygame.draw.circle(self.screen, bg_col, (cx, cy), 35)
-        pygame.draw.circle(self.screen, COLOR_ACCENT, (cx, cy), 37, 2)
-        draw_composite_avatar(self.screen, face, acc_data, cx, cy, 36)
+        surf, (ox, oy) = self.avatar_creator.get_sprite(36, bg_radius=35, ring_color=COLOR_ACCENT)
+        self.screen.blit(surf, (panel_x + 58 - ox, row_y + 75 - oy))
         desc_f = pygame.font.SysFont("Arial", 15)
         desc_s = desc_f.render(f"Click 'Customise Avatar' to personalise your character", True, COLOR_TEXT_DIM)
         self.screen.blit(desc_s, (panel_x + 115, row_y + 60))
@@ -2109,12 +2241,32 @@ class FinanceGame:
             pygame.draw.rect(self.screen, COLOR_PANEL, (SCREEN_WIDTH//2-200, 400, 400, 60), border_radius=15)
             pygame.draw.rect(self.screen, COLOR_WARNING, (SCREEN_WIDTH//2-200, 400, 400, 60), 2, border_radius=15)
             self._draw_text(f"High Score: {self.high_score:,}", self.font_medium, COLOR_WARNING, SCREEN_WIDTH//2, 430, center=True)
+        if self.leaderboard is not None and self.leaderboard.count:
+            panel = self._cached_layer('top_scores', self.leaderboard.count, self._build_top_scores_layer)
+            self.screen.blit(panel, (60, 480))
         for btn in self.cached_buttons[GameState.TITLE]:
             btn.draw(self.screen, self.font_medium)
         for event in events:
             for btn in self.cached_buttons[GameState.TITLE]:
                 btn.handle_event(event)
 
+    def _build_top_scores_layer(self):
+        """The title screen's best games; rebuilt only when a game is added to the leaderboard."""
+        w, row_h = 400, 34
+        surf = pygame.Surface((w, 70 + TITLE_TOP_SCORES * row_h), pygame.SRCALPHA)
+        pygame.draw.rect(surf, COLOR_PANEL, surf.get_rect(), border_radius=15)
+        pygame.draw.rect(surf, COLOR_BORDER, surf.get_rect(), 2, border_radius=15)
+        self._draw_text("TOP SCORES", self.font_small, COLOR_ACCENT, w//2, 22, center=True, surface=surf)
+        y = 50
+        for i, entry in enumerate(self.leaderboard.top(TITLE_TOP_SCORES), 1):
+            color = COLOR_WARNING if i == 1 else COLOR_TEXT
+            self._draw_text(f"{i}. {entry['player'] or ''}", self.font_tiny, color, 20, y, surface=surf)
+            self._draw_text(f"{entry['score']:,}", self.font_tiny, color, 70, y, surface=surf)
+            self._draw_text(f"{entry['class']} · {entry['education']} · {entry['difficulty']}",
+                            self.font_tiny, COLOR_TEXT_DIM, 160, y, surface=surf)
+            y += row_h
+        return surf
+
     def _draw_tutorial(self, events):
         self._draw_gradient_background()
         tutorials = [
@@ -2194,14 +2346,45 @@ class FinanceGame:
                         self.selected_difficulty = key
                         self._add_particle(event.pos[0], event.pos[1], COLOR_PRIMARY)
             y += 125
+        self._draw_text("GAME LENGTH", self.font_small, COLOR_ACCENT, x + width//2, y + 10, center=True)
+        y += 40
+        btn_w = (width - 20) // len(GAME_LENGTHS)
+        for i, (label, months) in enumerate(GAME_LENGTHS.items()):
+            selected = self.months_per_game == months
+            btn = Button(x + i * (btn_w + 10), y, btn_w, 55, label, COLOR_PRIMARY if selected else COLOR_PANEL,
+                         COLOR_BG if selected else COLOR_TEXT, button_id=f"length_{months}",
+                         tooltip=f"{months} months")
+            btn.draw(self.screen, self.font_small)
+            for event in events:
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    if btn.rect.collidepoint(event.pos):
+                        self.months_per_game = months
+                        self._add_particle(event.pos[0], event.pos[1], COLOR_PRIMARY)
+        if market_tape.available():
+            self._draw_market_toggle(x, y + 65, width, events)
+
+    def _draw_market_toggle(self, x, y, width, events):
+        historical = self.market_tape is not None
+        label = "MARKET: HISTORICAL" if historical else "MARKET: RANDOM"
+        btn = Button(x, y, width, 45, label, COLOR_PRIMARY if historical else COLOR_PANEL,
+                     COLOR_BG if historical else COLOR_TEXT, button_id="market_tape",
+                     tooltip=f"Historical: investment returns replay real index history from {market_tape.DEFAULT_TAPE_PATH}")
+        btn.draw(self.screen, self.font_small)
+        for event in events:
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and btn.rect.collidepoint(event.pos):
+                try:
+                    self.market_tape = None if historical else market_tape.open_tape()
+                except (OSError, ValueError) as e:
+                    print(f"Market tape failed: {e}")
+                self._add_particle(event.pos[0], event.pos[1], COLOR_PRIMARY)
 
     def _draw_playing(self, events):
         self._draw_gradient_background()
         self._update_particles()
         self._draw_particles()
+        self.publish()
         if self.need_button_update:
             self._update_playing_buttons()
-        self._update_button_positions()
         header_height = 80
         sidebar_w = 350
         action_panel_w = 400
@@ -2210,6 +2393,7 @@ class FinanceGame:
         self._draw_playing_sidebar(sidebar_w, header_height)
         self._draw_playing_main(sidebar_w, main_area_w, header_height)
         self._draw_playing_actions(action_panel_w, header_height)
+        self._draw_achievement_toasts(sidebar_w, main_area_w, header_height)
         draw_chatbot_icon(self.screen, 80, SCREEN_HEIGHT-80,
                           self.chatbot.is_thinking, self.chatbot_has_new_message)
 
@@ -2259,40 +2443,46 @@ class FinanceGame:
                     self._toggle_chatbot()
 
         for event in events:
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
-                for btn in self.cached_buttons[GameState.PLAYING]:
-                    if btn.visible and btn.rect.collidepoint(event.pos) and hasattr(btn, 'lock_data') and btn.lock_data:
-                        if self.locked_action and self.locked_action['callback'] == btn.lock_data['callback']:
-                            self.locked_action = None; self.game_message = "Action unlocked"
-                        else:
-                            self.locked_action = btn.lock_data; self.game_message = f"Locked: {btn.lock_data['name']}"
-                        self.need_button_update = True; break
-            for btn in self.cached_buttons[GameState.PLAYING]:
-                if btn.button_id in ["next_month", "help", "chatbot"]: btn.handle_event(event)
-            for btn in self.cached_buttons[GameState.PLAYING]:
-                if btn.button_id not in ["next_month", "help", "chatbot"]: btn.handle_event(event)
-        mouse_pos = pygame.mouse.get_pos()
-        for btn in self.cached_buttons[GameState.PLAYING]:
-            if btn.visible: btn.hover = btn.rect.collidepoint(mouse_pos)
+            if event.type != pygame.MOUSEBUTTONDOWN:
+                continue
+            self.publish()      # an earlier click this frame may have changed the panel
+            if self.need_button_update:
+                self._update_playing_buttons()
+            btn = self._hit_test(event.pos)
+            if btn is None:
+                continue
+            if event.button == 3 and btn.lock_data:
+                if self.locked_action and self.locked_action['id'] == btn.lock_data['id']:
+                    self.lock_action(None); self.game_message = "Action unlocked"
+                else:
+                    self.lock_action(btn.lock_data['id'], btn.lock_data['name'])
+                    self.game_message = f"Locked: {btn.lock_data['name']}"
+            elif event.button == 1 and btn.enabled and btn.callback:
+                btn.callback()
+        self._update_hover(pygame.mouse.get_pos())
+
+    def _update_hover(self, mouse_pos):
+        hovered = self._hit_test(mouse_pos)
+        if hovered is not self._hovered_button:
+            if self._hovered_button is not None:
+                self._hovered_button.hover = False
+                self._action_dirty.add(self._hovered_button.button_id)
+            self._hovered_button = hovered
+            if hovered is not None:
+                self._action_dirty.add(hovered.button_id)
+        if hovered is not None:
+            hovered.hover = True
 
     def _draw_playing_header(self):
         header_height = 80
         pygame.draw.rect(self.screen, COLOR_PANEL, (0, 0, SCREEN_WIDTH, header_height))
         pygame.draw.line(self.screen, COLOR_BORDER, (0, header_height), (SCREEN_WIDTH, header_height), 1)
-        nw = self.money + self.investments + self.emergency_fund - self.debt
         bg_col = getattr(self, 'selected_avatar_bg', COLOR_PRIMARY)
-        pygame.draw.circle(self.screen, bg_col, (90, 40), 25)
-        pygame.draw.circle(self.screen, COLOR_ACCENT, (90, 40), 27, 2)
         acc_data = getattr(self, 'selected_avatar_acc', AVATAR_ACCESSORIES[0])
-        draw_composite_avatar(self.screen, self.selected_avatar, acc_data, 90, 40, 28)
+        draw_composite_avatar(self.screen, self.selected_avatar, acc_data, 90, 40, 28,
+                              bg_color=bg_col, bg_radius=25, ring_color=COLOR_ACCENT)
         self._draw_text("FINANCE QUEST", self.font_large, COLOR_PRIMARY, 150, 15)
-        self._draw_text("MONTH", self.font_tiny, COLOR_TEXT_DIM, 550, 15)
-        mc = COLOR_SUCCESS if self.current_month < MONTHS_PER_GAME*0.5 else COLOR_WARNING if self.current_month < MONTHS_PER_GAME*0.8 else COLOR_DANGER
-        self._draw_text(f"{self.current_month}/{MONTHS_PER_GAME}", self.font_medium, mc, 550, 35)
-        self._draw_text("CASH", self.font_tiny, COLOR_TEXT_DIM, 750, 15)
-        self._draw_text(f"${self.money:,.0f}", self.font_medium, COLOR_SUCCESS if self.money > 0 else COLOR_DANGER, 750, 35)
-        self._draw_text("NET WORTH", self.font_tiny, COLOR_TEXT_DIM, 950, 15)
-        self._draw_text(f"${nw:,.0f}", self.font_medium, COLOR_PRIMARY if nw > 0 else COLOR_WARNING, 950, 35)
+        self.screen.blit(self._cached_layer('header', self._widget_versions['header'], self._build_header_stats), (550, 0))
         for btn in self.cached_buttons[GameState.PLAYING]:
             if btn.button_id == "help":
                 btn.rect.x = SCREEN_WIDTH-120; btn.rect.y = 20; btn.rect.width = 100; btn.rect.height = 40
@@ -2302,6 +2492,19 @@ class FinanceGame:
                 btn.rect.x = SCREEN_WIDTH-230; btn.rect.y = 20; btn.rect.width = 100; btn.rect.height = 40
                 btn.draw(self.screen, self.font_small); break
 
+    def _build_header_stats(self):
+        """Month, cash and net worth; rebuilt only when one of them changes."""
+        surf = pygame.Surface((500, 80), pygame.SRCALPHA)
+        nw = self.net_worth
+        self._draw_text("MONTH", self.font_tiny, COLOR_TEXT_DIM, 0, 15, surface=surf)
+        mc = COLOR_SUCCESS if self.current_month < self.months_per_game*0.5 else COLOR_WARNING if self.current_month < self.months_per_game*0.8 else COLOR_DANGER
+        self._draw_text(f"{self.current_month}/{self.months_per_game}", self.font_medium, mc, 0, 35, surface=surf)
+        self._draw_text("CASH", self.font_tiny, COLOR_TEXT_DIM, 200, 15, surface=surf)
+        self._draw_text(f"${self.money:,.0f}", self.font_medium, COLOR_SUCCESS if self.money > 0 else COLOR_DANGER, 200, 35, surface=surf)
+        self._draw_text("NET WORTH", self.font_tiny, COLOR_TEXT_DIM, 400, 15, surface=surf)
+        self._draw_text(f"${nw:,.0f}", self.font_medium, COLOR_PRIMARY if nw > 0 else COLOR_WARNING, 400, 35, surface=surf)
+        return surf
+
     def _draw_playing_sidebar(self, sidebar_w, header_height):
         pygame.draw.rect(self.screen, (15, 25, 40), (0, header_height, sidebar_w, SCREEN_HEIGHT-header_height-100))
         pygame.draw.line(self.screen, COLOR_PRIMARY, (sidebar_w, header_height), (sidebar_w, SCREEN_HEIGHT-100), 2)
@@ -2319,8 +2522,10 @@ class FinanceGame:
         self._draw_text("FINANCES", self.font_small, COLOR_ACCENT, p, sy); sy += 35
         for label, val, col in [
             ("Income", f"+${self.monthly_income:,.0f}", COLOR_SUCCESS),
-            ("Expenses", f"-${(self.rent+self.groceries+self.transport):,.0f}", COLOR_DANGER),
+            ("Expenses", f"-${(self.rent+self.groceries+self.transport+self.has_vehicle*VEHICLE_UPKEEP):,.0f}", COLOR_DANGER),
+            ("Loan Payments", f"-${self.loans.minimum_payment():,.0f}", COLOR_DANGER),
             ("Debt", f"${self.debt:,.0f}", COLOR_DANGER),
+            ("Debt-Free", self._debt_free_label(), COLOR_TEXT),
             ("Investments", f"${self.investments:,.0f}", COLOR_PRIMARY),
             ("Emergency", f"${self.emergency_fund:,.0f}", COLOR_WARNING),
         ]:
@@ -2337,25 +2542,54 @@ class FinanceGame:
             self._draw_text("Active Effects:", self.font_small, COLOR_DANGER, p, sy); sy += 30
             for d in self.debuffs:
                 pygame.draw.rect(self.screen, COLOR_DANGER, (p, sy, 140, 28), border_radius=6)
-                self._draw_text(d.upper(), self.font_tiny, COLOR_BG, p+10, sy+6)
+                due = self.timeline.due_month(f"debuff:{d}")
+                label = d.upper() if due is None else f"{d.upper()}  {due - self.current_month}MO"
+                self._draw_text(label, self.font_tiny, COLOR_BG, p+10, sy+6)
                 sy += 35
 
-    def _draw_playing_main(self, sidebar_w, main_area_w, header_height):
-        mx = sidebar_w + 30
-        my = header_height + 30
-        self._draw_text("ACTIVE GOALS", self.font_medium, COLOR_PRIMARY, mx, my, glow=True)
-        my += 45
+    def _build_goals_layer(self, main_area_w):
+        """The four goal cards; rebuilt only when a goal is completed."""
         goal_w = (main_area_w - 80) // 2
         goal_h = 80
+        surf = pygame.Surface((2 * goal_w + 30, 2 * goal_h + 20), pygame.SRCALPHA)
         for i, goal in enumerate(self.goals.values()):
-            gx = mx if i % 2 == 0 else mx + goal_w + 30
-            gy = my + (i // 2) * (goal_h + 20)
+            gx = 0 if i % 2 == 0 else goal_w + 30
+            gy = (i // 2) * (goal_h + 20)
             gc = COLOR_SUCCESS if goal['completed'] else COLOR_PANEL
             gb = COLOR_SUCCESS if goal['completed'] else COLOR_BORDER
-            pygame.draw.rect(self.screen, gc, (gx, gy, goal_w, goal_h), border_radius=12)
-            pygame.draw.rect(self.screen, gb, (gx, gy, goal_w, goal_h), 3, border_radius=12)
+            pygame.draw.rect(surf, gc, (gx, gy, goal_w, goal_h), border_radius=12)
+            pygame.draw.rect(surf, gb, (gx, gy, goal_w, goal_h), 3, border_radius=12)
             self._draw_text(f"{'✓' if goal['completed'] else '○'} {goal['label']}", self.font_small,
-                            COLOR_BG if goal['completed'] else COLOR_TEXT, gx+15, gy+30)
+                            COLOR_BG if goal['completed'] else COLOR_TEXT, gx+15, gy+30, surface=surf)
+        return surf
+
+    def _draw_achievement_toasts(self, sidebar_w, main_area_w, header_height):
+        now = pygame.time.get_ticks()
+        self.achievement_toasts = [t for t in self.achievement_toasts if t[1] > now]
+        w, h = 360, 56
+        x = sidebar_w + (main_area_w - w) // 2
+        y = header_height + 10
+        for achievement, _ in reversed(self.achievement_toasts):
+            pygame.draw.rect(self.screen, COLOR_PANEL, (x, y, w, h), border_radius=12)
+            pygame.draw.rect(self.screen, COLOR_WARNING, (x, y, w, h), 2, border_radius=12)
+            self._draw_text(f"🏅 {achievement.name}", self.font_small, COLOR_WARNING, x+15, y+6)
+            self._draw_text(achievement.description, self.font_tiny, COLOR_TEXT_DIM, x+15, y+32)
+            y += h + 8
+
+    def _debt_free_label(self):
+        """When minimum payments alone clear the debt, from the loans' cached schedules."""
+        if self.debt <= 0:
+            return "Now"
+        month = self.loans.paid_off_month(self.current_month)
+        return "Never" if month == math.inf else f"Month {month}"
+
+    def _draw_playing_main(self, sidebar_w, main_area_w, header_height):
+        mx = sidebar_w + 30
+        my = header_height + 30
+        self._draw_text("ACTIVE GOALS", self.font_medium, COLOR_PRIMARY, mx, my, glow=True)
+        my += 45
+        self.screen.blit(self._cached_layer('goals', (main_area_w, self._widget_versions['goals']),
+                                            lambda: self._build_goals_layer(main_area_w)), (mx, my))
         msg_y = my + 220
         msg_rect = pygame.Rect(mx, msg_y, main_area_w-60, 100)
         pygame.draw.rect(self.screen, COLOR_PANEL, msg_rect, border_radius=15)
@@ -2379,68 +2613,78 @@ class FinanceGame:
                 btn.rect.width = nb_w; btn.rect.height = nb_h
                 btn.original_y = controls_y
                 btn.update_text("NEXT MONTH")
-                btn.draw(self.screen, self.font_medium); break
+                btn.draw(self.screen, self.font_medium)
+            elif btn.button_id == "autopilot":
+                btn.draw(self.screen, self.font_small)
 
     def _draw_playing_actions(self, action_panel_w, header_height):
         action_rect = pygame.Rect(SCREEN_WIDTH-action_panel_w, header_height, action_panel_w, SCREEN_HEIGHT-header_height-100)
         pygame.draw.rect(self.screen, (20, 30, 50), action_rect)
         pygame.draw.line(self.screen, COLOR_PRIMARY, (action_rect.x, header_height), (action_rect.x, SCREEN_HEIGHT-100), 2)
-        self._draw_text("AVAILABLE ACTIONS", self.font_small, COLOR_PRIMARY, action_rect.x+20, header_height+20)
         if self.active_dropdown:
             mouse_pos = pygame.mouse.get_pos()
             mouse_over_button = mouse_over_dropdown = False
-            for btn in self.cached_buttons[GameState.PLAYING]:
-                if hasattr(btn, 'action_type') and btn.action_type == self.active_dropdown:
-                    if btn.rect.collidepoint(mouse_pos):
-                        mouse_over_button = True; self.dropdown_last_hover_time = pygame.time.get_ticks()
-                    opt_w, opt_h = 100, 45
-                    dw = opt_w * 4 + 20; dh = opt_h + 15
-                    dx = btn.rect.x
-                    if btn.action_type in ['save', 'invest']:
-                        dy = btn.rect.y - dh - 5
-                    else:
-                        dy = btn.rect.y + btn.rect.height + 5
-                    if dx + dw > SCREEN_WIDTH: dx = SCREEN_WIDTH - dw - 10
-                    if dy < 0: dy = btn.rect.y + btn.rect.height + 5
-                    if dy + dh > SCREEN_HEIGHT - 100: dy = btn.rect.y - dh - 5
-                    dr = pygame.Rect(dx, dy, dw, dh)
-                    if dr.collidepoint(mouse_pos):
-                        mouse_over_dropdown = True; self.dropdown_last_hover_time = pygame.time.get_ticks()
-                    break
+            btn = self._action_buttons.get(f"financial_{self.active_dropdown}")
+            if btn is not None:
+                if btn is self._hovered_button:
+                    mouse_over_button = True; self.dropdown_last_hover_time = pygame.time.get_ticks()
+                if self._dropdown_rect(btn).collidepoint(mouse_pos):
+                    mouse_over_dropdown = True; self.dropdown_last_hover_time = pygame.time.get_ticks()
             self.dropdown_hover = mouse_over_dropdown
             if not mouse_over_button and not mouse_over_dropdown:
                 if pygame.time.get_ticks() - self.dropdown_last_hover_time > self.dropdown_stay_duration:
                     self.close_dropdown()
+        hovered = self._hovered_button
+        if hovered is not None and hovered.action_type and hovered.visible and hovered.enabled:
+            if self.active_dropdown != hovered.action_type:
+                self.active_dropdown = hovered.action_type
+                self.dropdown_last_hover_time = pygame.time.get_ticks()
         for btn in self.cached_buttons[GameState.PLAYING]:
-            if hasattr(btn, 'action_type') and btn.visible and btn.enabled:
-                if btn.rect.collidepoint(pygame.mouse.get_pos()):
-                    if self.active_dropdown != btn.action_type:
-                        self.active_dropdown = btn.action_type
-                        self.dropdown_last_hover_time = pygame.time.get_ticks()
-        for btn in self.cached_buttons[GameState.PLAYING]:
-            if btn.button_id not in ["next_month", "help", "chatbot"]:
+            if btn.button_id == "predict":
                 btn.draw(self.screen, self.font_tiny)
+        self._draw_action_list(self._action_view_rect())
         if self.active_dropdown:
-            for btn in self.cached_buttons[GameState.PLAYING]:
-                if hasattr(btn, 'action_type') and btn.action_type == self.active_dropdown:
-                    self.draw_financial_dropdown(self.screen, btn); break
-        for btn in self.cached_buttons[GameState.PLAYING]:
-            if btn.button_id not in ["next_month", "help", "chatbot"]:
-                btn.draw_tooltip(self.screen, self.font_tiny)
-
-    def _draw_help_panel(self, events):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)); overlay.set_alpha(220); overlay.fill((0,0,0))
-        self.screen.blit(overlay, (0, 0))
+            btn = self._action_buttons.get(f"financial_{self.active_dropdown}")
+            if btn is not None:
+                self.draw_financial_dropdown(self.screen, btn)
+        if hovered is not None and hovered.button_id not in ["next_month", "help", "chatbot"]:
+            hovered.draw_tooltip(self.screen, self.font_tiny, self._whatif_text(hovered))
+
+    def _whatif_text(self, button):
+        """Tooltip lines with the background what-if rollouts for an action button."""
+        if self._whatif_key is None or self.replay_player is not None:
+            return ""
+        if button.action_type:
+            moves = [(f"{button.action_type}:{a}", f"${a // 1000}k" if a >= 1000 else f"${a}")
+                     for a in DROPDOWN_AMOUNTS[button.action_type]]
+        elif button.button_id.startswith(('life_', 'health_')):
+            moves = [(button.button_id, None)]
+        else:
+            return ""
+        baseline = self.whatif.result(self._whatif_key, 'end')
+        parts = []
+        for move, label in moves:
+            r = self.whatif.result(self._whatif_key, move)
+            if r is None:
+                continue
+            delta = f" ({r['score'] - baseline['score']:+,.0f})" if baseline else ""
+            parts.append(f"{label}: ~{r['score']:,.0f}{delta}" if label else f"~{r['score']:,.0f} pts{delta}")
+        if not parts:
+            return "What-if: simulating..." if self.whatif.enabled else ""
+        text = "What-if final score (vs. ending the month): " + " | ".join(parts)
+        if len(moves) == 1:
+            r = self.whatif.result(self._whatif_key, moves[0][0])
+            text += "\nGoal chances: " + ", ".join(
+                f"{self.goals[k]['label']} {p:.0%}" for k, p in r['goals'].items())
+        return text
+
+    def _build_help_layer(self):
+        """Help panel chrome plus the full-height guide content, rendered once."""
         pw, ph = 900, 650
-        px = (SCREEN_WIDTH-pw)//2; py = (SCREEN_HEIGHT-ph)//2
-        for event in events:
-            if event.type == pygame.MOUSEWHEEL and self.show_help_panel:
-                self.help_scroll_offset = max(0, min(self.help_scroll_offset - event.y*30, self.help_max_scroll))
-        content_h = 800
-        cs = pygame.Surface((pw-40, content_h), pygame.SRCALPHA); cs.fill((0,0,0,0))
-        pygame.draw.rect(self.screen, COLOR_BG, (px, py, pw, ph), border_radius=20)
-        pygame.draw.rect(self.screen, COLOR_PRIMARY, (px, py, pw, ph), 4, border_radius=20)
-        self._draw_text("GAME GUIDE", self.font_large, COLOR_PRIMARY, px+pw//2, py+40, center=True, glow=True)
+        panel = pygame.Surface((pw, ph), pygame.SRCALPHA)
+        pygame.draw.rect(panel, COLOR_BG, (0, 0, pw, ph), border_radius=20)
+        pygame.draw.rect(panel, COLOR_PRIMARY, (0, 0, pw, ph), 4, border_radius=20)
+        self._draw_text("GAME GUIDE", self.font_large, COLOR_PRIMARY, pw//2, 40, center=True, glow=True, surface=panel)
         sections = [
             ("Goal", "Complete 24 months with high net worth and happiness!"),
             ("Actions", f"You have {ACTIONS_PER_MONTH} actions per month. Right-click to lock actions for next month."),
@@ -2454,90 +2698,123 @@ class FinanceGame:
             ("Scoring", "Final score = Net Worth + Goal Bonuses + Happiness × 100 + Months × 500"),
         ]
         sh = sum(35 + len(s[1].split('\n'))*25 + 15 for s in sections)
-        self.help_max_scroll = max(0, sh - (ph - 150))
-        y = 20 - self.help_scroll_offset
-        for title, content in sections:
-            if y + 30 > 0 and y < content_h:
-                cs.blit(self.font_small.render(title, True, COLOR_ACCENT), (30, y)); y += 35
-                for line in content.split('\n'):
-                    if y + 20 > 0 and y < content_h:
-                        cs.blit(self.font_tiny.render(line, True, COLOR_TEXT), (55, y))
-                    y += 25
-                y += 15
-            else:
-                y += 35 + len(content.split('\n'))*25 + 15
-        self.screen.blit(cs, (px+20, py+100), area=(0, self.help_scroll_offset, pw-40, ph-150))
+        content = pygame.Surface((pw-40, max(sh + 20, ph-150)), pygame.SRCALPHA)
+        y = 20
+        for title, text in sections:
+            content.blit(self.font_small.render(title, True, COLOR_ACCENT), (30, y)); y += 35
+            for line in text.split('\n'):
+                content.blit(self.font_tiny.render(line, True, COLOR_TEXT), (55, y))
+                y += 25
+            y += 15
+        return panel, content, max(0, sh - (ph - 150))
+
+    def _draw_help_panel(self, events):
+        self.screen.blit(get_dim_overlay(220), (0, 0))
+        pw, ph = 900, 650
+        px = (SCREEN_WIDTH-pw)//2; py = (SCREEN_HEIGHT-ph)//2
+        panel, content, self.help_max_scroll = self._cached_layer('help', None, self._build_help_layer)
+        for event in events:
+            if event.type == pygame.MOUSEWHEEL and self.show_help_panel:
+                self.help_scroll_offset = max(0, min(self.help_scroll_offset - event.y*30, self.help_max_scroll))
+        self.screen.blit(panel, (px, py))
+        self.screen.blit(content, (px+20, py+100), area=(0, self.help_scroll_offset, pw-40, ph-150))
         if self.help_max_scroll > 0:
-            sbh = (ph-150)*(ph-150)/content_h
+            sbh = (ph-150)*(ph-150)/content.get_height()
             sby = py+100 + (self.help_scroll_offset/self.help_max_scroll)*((ph-150)-sbh)
             pygame.draw.rect(self.screen, COLOR_PANEL_HOVER, (px+pw-20, py+100, 8, ph-150), border_radius=4)
             pygame.draw.rect(self.screen, COLOR_PRIMARY, (px+pw-20, sby, 8, sbh), border_radius=4)
-        close_btn = Button(px+pw//2-100, py+ph-70, 200, 50, "Close", COLOR_PRIMARY, COLOR_BG, gradient=True, icon="✓")
-        close_btn.callback = self._toggle_help
+        close_btn = self._modal_buttons['help_close']
         close_btn.hover = close_btn.rect.collidepoint(pygame.mouse.get_pos())
         close_btn.draw(self.screen, self.font_medium)
         for event in events:
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and close_btn.hover:
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and close_btn.rect.collidepoint(event.pos):
                 self._toggle_help(); break
 
+    def _build_event_layer(self, event):
+        w, h = 600, 450
+        layer = pygame.Surface((w, h), pygame.SRCALPHA)
+        pygame.draw.rect(layer, COLOR_PANEL, (0, 0, w, h), border_radius=20)
+        pygame.draw.rect(layer, COLOR_ACCENT, (0, 0, w, h), 4, border_radius=20)
+        self._draw_text(event.name, self.font_large, COLOR_ACCENT, w//2, 50, center=True, glow=True, surface=layer)
+        ty = 130
+        for line in self._wrap_text(event.description, self.font_medium, w-80):
+            self._draw_text(line, self.font_medium, COLOR_TEXT, w//2, ty, center=True, surface=layer); ty += 40
+        iy = ty + 30
+        if event.cost > 0:
+            self._draw_text(f"Cost: -${event.cost:,.0f}", self.font_medium, COLOR_DANGER, w//2, iy, center=True, surface=layer); iy += 35
+        if event.stress_increase > 0:
+            self._draw_text(f"Stress: +{event.stress_increase}%", self.font_medium, COLOR_DANGER, w//2, iy, center=True, surface=layer)
+        return layer
+
     def _draw_event_modal(self, events):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)); overlay.set_alpha(200); overlay.fill((0,0,0))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(get_dim_overlay(200), (0, 0))
         w, h = 600, 450
         x, y = (SCREEN_WIDTH-w)//2, (SCREEN_HEIGHT-h)//2
-        pygame.draw.rect(self.screen, COLOR_PANEL, (x, y, w, h), border_radius=20)
-        pygame.draw.rect(self.screen, COLOR_ACCENT, (x, y, w, h), 4, border_radius=20)
-        self._draw_text(self.current_event.name, self.font_large, COLOR_ACCENT, x+w//2, y+50, center=True, glow=True)
-        ty = y + 130
-        for line in self._wrap_text(self.current_event.description, self.font_medium, w-80):
-            self._draw_text(line, self.font_medium, COLOR_TEXT, x+w//2, ty, center=True); ty += 40
-        iy = ty + 30
-        if self.current_event.cost > 0:
-            self._draw_text(f"Cost: -${self.current_event.cost:,.0f}", self.font_medium, COLOR_DANGER, x+w//2, iy, center=True); iy += 35
-        if self.current_event.stress_increase > 0:
-            self._draw_text(f"Stress: +{self.current_event.stress_increase}%", self.font_medium, COLOR_DANGER, x+w//2, iy, center=True)
-        cont_btn = Button(x+w//2-100, y+h-80, 200, 50, "Continue", COLOR_PRIMARY, COLOR_BG, gradient=True, icon="▶")
-        cont_btn.callback = self.handle_event_close
+        event_obj = self.current_event
+        self.screen.blit(self._cached_layer('event', event_obj, lambda: self._build_event_layer(event_obj)), (x, y))
+        cont_btn = self._modal_buttons['event_continue']
         cont_btn.hover = cont_btn.rect.collidepoint(pygame.mouse.get_pos())
         cont_btn.draw(self.screen, self.font_medium)
         for event in events:
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and cont_btn.hover:
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and cont_btn.rect.collidepoint(event.pos):
                 self.handle_event_close()
+                break
 
-    def draw_financial_dropdown(self, screen, button):
-        if not hasattr(button, 'action_type'): return
-        at = button.action_type
+    def _dropdown_rect(self, button):
         opt_w, opt_h = 100, 45
         dw = opt_w * 4 + 20; dh = opt_h + 15
-        dx = button.rect.x
-        dy = (button.rect.y - dh - 5) if at in ['invest', 'save'] else (button.rect.y + button.rect.height + 5)
+        if button.action_type in ('invest', 'pay_debt'):
+            dh += opt_h     # asset / payoff order picker row
+        br = self._action_screen_rect(button)
+        dx = br.x
+        dy = (br.y - dh - 5) if button.action_type in ['invest', 'save'] else (br.y + br.height + 5)
         if dx + dw > SCREEN_WIDTH: dx = SCREEN_WIDTH - dw - 10
-        if dy < 0: dy = button.rect.y + button.rect.height + 5
-        if dy + dh > SCREEN_HEIGHT - 100: dy = button.rect.y - dh - 5
-        dr = pygame.Rect(dx, dy, dw, dh)
+        if dy < 80: dy = br.y + br.height + 5        # never over the header
+        if dy + dh > SCREEN_HEIGHT - 100: dy = br.y - dh - 5
+        return pygame.Rect(dx, dy, dw, dh)
+
+    def draw_financial_dropdown(self, screen, button):
+        if not button.action_type: return
+        at = button.action_type
+        opt_w, opt_h = 100, 45
+        dr = self._dropdown_rect(button)
+        dx, dy = dr.topleft
         mouse_pos = pygame.mouse.get_pos()
         self.dropdown_hover = dr.collidepoint(mouse_pos)
-        if self.dropdown_hover or button.rect.collidepoint(mouse_pos):
+        if self.dropdown_hover or button is self._hovered_button:
             self.dropdown_last_hover_time = pygame.time.get_ticks()
-        for i in range(dr.height):
-            ratio = i / dr.height
-            c = (int(COLOR_PANEL[0]*(1-ratio*0.3)), int(COLOR_PANEL[1]*(1-ratio*0.3)), int(COLOR_PANEL[2]*(1-ratio*0.3)))
-            pygame.draw.line(screen, c, (dr.x, dr.y+i), (dr.x+dr.width, dr.y+i))
+        screen.blit(get_bar_sprite(dr.width, dr.height, COLOR_PANEL), dr.topleft)
         pygame.draw.rect(screen, COLOR_PRIMARY, dr, 2, border_radius=8)
-        amounts = {'save': [(100,"$100"),(500,"$500"),(1000,"$1k"),(None,"Custom")],
-                   'invest': [(1000,"$1k"),(5000,"$5k"),(10000,"$10k"),(None,"Custom")],
-                   'withdraw': [(500,"$500"),(1000,"$1k"),(5000,"$5k"),(None,"Custom")],
-                   'pay_debt': [(1000,"$1k"),(5000,"$5k"),(10000,"$10k"),(None,"Custom")]
-                   }.get(at, [(1000,"$1k"),(3000,"$3k"),(5000,"$5k"),(None,"Custom")])
+        if at == 'invest':
+            # which asset the amounts below buy
+            for idx, asset in enumerate(ASSETS):
+                tr = pygame.Rect(dx+5+idx*opt_w, dy+5, opt_w-5, opt_h-5)
+                selected = asset.key == self.invest_asset
+                th = tr.collidepoint(mouse_pos)
+                pygame.draw.rect(screen, COLOR_ACCENT if selected else (COLOR_PANEL_HOVER if th else COLOR_PANEL), tr, border_radius=5)
+                ts = self.font_tiny.render(asset.name, True, COLOR_BG if selected else COLOR_TEXT)
+                screen.blit(ts, ts.get_rect(center=tr.center))
+                if th and not selected and pygame.mouse.get_pressed()[0]:
+                    self.set_invest_asset(asset.key)
+            dy += opt_h
+        elif at == 'pay_debt':
+            # which loans the amounts below pay off first
+            for idx, order in enumerate(PAYOFF_ORDERS):
+                tr = pygame.Rect(dx+5+idx*2*opt_w, dy+5, 2*opt_w-5, opt_h-5)
+                selected = order == self.payoff_order
+                th = tr.collidepoint(mouse_pos)
+                pygame.draw.rect(screen, COLOR_ACCENT if selected else (COLOR_PANEL_HOVER if th else COLOR_PANEL), tr, border_radius=5)
+                name, rule = PAYOFF_ORDER_NAMES[order]
+                ts = self.font_tiny.render(f"{name}: {rule}", True, COLOR_BG if selected else COLOR_TEXT)
+                screen.blit(ts, ts.get_rect(center=tr.center))
+                if th and not selected and pygame.mouse.get_pressed()[0]:
+                    self.set_payoff_order(order)
+            dy += opt_h
+        amounts = [(a, f"${a // 1000}k" if a >= 1000 else f"${a}") for a in DROPDOWN_AMOUNTS[at]] + [(None, "Custom")]
         for idx, (amount, label) in enumerate(amounts):
             or_ = pygame.Rect(dx+5+idx*opt_w, dy+5, opt_w-5, opt_h-5)
             oh = or_.collidepoint(mouse_pos)
-            affordable = True
-            if amount is not None:
-                if at == 'save' and self.money < amount: affordable = False
-                elif at == 'invest' and self.money < amount: affordable = False
-                elif at == 'withdraw' and self.emergency_fund < amount: affordable = False
-                elif at == 'pay_debt' and (self.money < amount or self.debt < amount): affordable = False
+            affordable = amount is None or self._can_afford_financial(at, amount)
             bg = (40,45,55) if not affordable else (COLOR_PRIMARY if oh else COLOR_PANEL_HOVER)
             tc = (80,85,95) if not affordable else (COLOR_BG if oh else COLOR_TEXT)
             pygame.draw.rect(screen, bg, or_, border_radius=5)
@@ -2549,25 +2826,35 @@ class FinanceGame:
                 return True
         return False
 
-    def _draw_custom_input_modal(self, events):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)); overlay.set_alpha(200); overlay.fill((0,0,0))
-        self.screen.blit(overlay, (0, 0))
+    def _build_custom_input_layer(self, input_type):
         w, h = 500, 350
-        x, y = (SCREEN_WIDTH-w)//2, (SCREEN_HEIGHT-h)//2
-        pygame.draw.rect(self.screen, COLOR_BG, (x, y, w, h), border_radius=20)
-        pygame.draw.rect(self.screen, COLOR_PRIMARY, (x, y, w, h), 4, border_radius=20)
+        layer = pygame.Surface((w, h), pygame.SRCALPHA)
+        pygame.draw.rect(layer, COLOR_BG, (0, 0, w, h), border_radius=20)
+        pygame.draw.rect(layer, COLOR_PRIMARY, (0, 0, w, h), 4, border_radius=20)
         titles = {'invest': '💰 Invest Custom Amount', 'save': '💵 Save Custom Amount',
                   'withdraw': '🏦 Withdraw Custom Amount', 'pay_debt': '💳 Pay Debt Custom Amount'}
-        self._draw_text(titles.get(self.custom_input_type, 'Enter Amount'), self.font_large, COLOR_PRIMARY, x+w//2, y+40, center=True, glow=True)
-        self._draw_text("Enter amount (Max: $100,000)", self.font_small, COLOR_TEXT_DIM, x+w//2, y+100, center=True)
+        self._draw_text(titles.get(input_type, 'Enter Amount'), self.font_large, COLOR_PRIMARY, w//2, 40, center=True, glow=True, surface=layer)
+        self._draw_text("Enter amount (Max: $100,000)", self.font_small, COLOR_TEXT_DIM, w//2, 100, center=True, surface=layer)
+        ir = pygame.Rect(50, 150, w-100, 60)
+        pygame.draw.rect(layer, COLOR_PANEL, ir, border_radius=10)
+        pygame.draw.rect(layer, COLOR_PRIMARY, ir, 3, border_radius=10)
+        return layer
+
+    def _draw_custom_input_modal(self, events):
+        self.screen.blit(get_dim_overlay(200), (0, 0))
+        w, h = 500, 350
+        x, y = (SCREEN_WIDTH-w)//2, (SCREEN_HEIGHT-h)//2
+        input_type = self.custom_input_type
+        self.screen.blit(self._cached_layer('custom_input', input_type,
+                                            lambda: self._build_custom_input_layer(input_type)), (x, y))
         ir = pygame.Rect(x+50, y+150, w-100, 60)
-        pygame.draw.rect(self.screen, COLOR_PANEL, ir, border_radius=10)
-        pygame.draw.rect(self.screen, COLOR_PRIMARY, ir, 3, border_radius=10)
         dt = "$" + self.custom_input_text if self.custom_input_text else "$0"
-        ts = self.font_medium.render(dt, True, COLOR_TEXT)
+        ts = self._cached_layer('custom_input_text', dt, lambda: self.font_medium.render(dt, True, COLOR_TEXT))
         self.screen.blit(ts, ts.get_rect(center=ir.center))
-        cb = Button(x+50, y+h-70, 180, 50, "Confirm", COLOR_SUCCESS, COLOR_BG, gradient=True, icon="✓")
-        xb = Button(x+w-230, y+h-70, 180, 50, "Cancel", COLOR_PANEL, icon="✗")
+        cb = self._modal_buttons['custom_confirm']
+        xb = self._modal_buttons['custom_cancel']
+        mouse_pos = pygame.mouse.get_pos()
+        cb.hover = cb.rect.collidepoint(mouse_pos); xb.hover = xb.rect.collidepoint(mouse_pos)
         cb.draw(self.screen, self.font_medium); xb.draw(self.screen, self.font_medium)
         for event in events:
             if event.type == pygame.KEYDOWN:
@@ -2576,36 +2863,35 @@ class FinanceGame:
                 elif event.key == pygame.K_BACKSPACE: self.custom_input_text = self.custom_input_text[:-1]
                 elif event.unicode.isdigit() or event.unicode == '.':
                     if len(self.custom_input_text) < 10: self.custom_input_text += event.unicode
-            mouse_pos = pygame.mouse.get_pos()
-            cb.hover = cb.rect.collidepoint(mouse_pos); xb.hover = xb.rect.collidepoint(mouse_pos)
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if cb.hover: self.handle_custom_input_submit()
-                elif xb.hover: self.show_custom_input = False; self.custom_input_text = ""
+                if cb.rect.collidepoint(event.pos): self.handle_custom_input_submit()
+                elif xb.rect.collidepoint(event.pos): self.show_custom_input = False; self.custom_input_text = ""
 
     def _draw_game_over(self, events):
         self._draw_gradient_background()
         pygame.draw.rect(self.screen, COLOR_PANEL, (SCREEN_WIDTH//2-450, 80, 900, 750), border_radius=30)
         pygame.draw.rect(self.screen, COLOR_PRIMARY, (SCREEN_WIDTH//2-450, 80, 900, 750), 4, border_radius=30)
         score = self.calculate_score()
-        is_hs = score > self.high_score
+        is_hs = self.new_high_score
         self._draw_text("🏆 NEW HIGH SCORE! 🏆" if is_hs else "GAME OVER",
                         self.font_xl, COLOR_WARNING if is_hs else COLOR_TEXT,
                         SCREEN_WIDTH//2, 150, center=True, shadow=True, glow=True)
         self._draw_text(f"Final Score: {score:,}", self.font_large, COLOR_PRIMARY, SCREEN_WIDTH//2, 240, center=True)
         if is_hs:
             self._draw_text("Congratulations! You've set a new record!", self.font_medium, COLOR_SUCCESS, SCREEN_WIDTH//2, 310, center=True)
-        sy = 380
+        sy = 370
         for label, val in [
-            ("Net Worth", f"${(self.money+self.investments+self.emergency_fund-self.debt):,.0f}"),
+            ("Net Worth", f"${self.net_worth:,.0f}"),
             ("Happiness", f"{self.happiness:.0f}%"),
             ("Goals Met", f"{sum(1 for g in self.goals.values() if g['completed'])}/4"),
+            ("Achievements", f"{len(self.achievements.unlocked)}/{len(self.achievements.catalog)}"),
             ("Months", f"{self.current_month}")
         ]:
             self._draw_text(label, self.font_medium, COLOR_TEXT_DIM, SCREEN_WIDTH//2-150, sy)
             self._draw_text(val, self.font_medium, COLOR_TEXT, SCREEN_WIDTH//2+150, sy)
-            sy += 60
+            sy += 50
         if self.game_message:
-            self._draw_text(self.game_message, self.font_medium, COLOR_DANGER, SCREEN_WIDTH//2, 600, center=True)
+            self._draw_text(self.game_message, self.font_medium, COLOR_DANGER, SCREEN_WIDTH//2, 630, center=True)
         for btn in self.cached_buttons[GameState.GAME_OVER]:
             btn.draw(self.screen, self.font_medium)
         for event in events:
@@ -2619,10 +2905,18 @@ class FinanceGame:
             for event in events:
                 if event.type == pygame.QUIT:
                     running = False
+            if self.replay_player is not None:
+                events = self._update_replay(events)
+            if self.modal_stack:
+                # the top modal owns input; everything underneath keeps animating
+                top = self.modal_stack[-1]
+                for event in events:
+                    top.handle_event(self, event)
+                events = []
+            for event in events:
                 if self.state == GameState.PLAYING and not self.show_event_modal:
                     if event.type == pygame.MOUSEWHEEL:
                         self.scroll_offset = max(0, min(self.scroll_offset - event.y*30, self.max_scroll))
-                        self._update_button_positions()
                         self.close_dropdown()
             self.screen.fill(COLOR_BG)
             if self.state == GameState.TITLE: self._draw_title(events)
@@ -2635,8 +2929,15 @@ class FinanceGame:
             if self.show_custom_input: self._draw_custom_input_modal(events)
             if self.avatar_creator.visible:
                 self._draw_avatar_creator_modal(events)
+            self.modal_stack = [m for m in self.modal_stack if not m.closed]
+            for modal in self.modal_stack:
+                modal.draw(self, self.screen)
+            if self.replay_player is not None:
+                self._draw_replay_banner()
             pygame.display.flip()
             self.clock.tick(FPS)
+        self.autosave.flush()
+        self.whatif.shutdown()
         pygame.quit()
         sys.exit()
 
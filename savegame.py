@@ -0,0 +1,156 @@
+"""
+Crash-safe autosave for a FinanceQuest game in progress.
+
+The autosave file is a sequence of records, each
+
+    u32 length   u32 crc32   zlib(json payload)
+
+The first record is a full snapshot ("base"); every month after that only a
+"delta" record is appended: the snapshot fields that changed, the new
+monthly_log rows and the replay ops recorded since the last save. A month
+therefore costs the same to save in month 24 as in month 1. The base is
+written to a temp file and renamed into place, deltas are appended and
+fsync'd, and a torn or corrupt trailing record is ignored on load, so a crash
+at any point leaves a resumable file.
+
+Encoding and all file I/O happen on a background writer thread; the game
+thread only builds the (small) delta dict. A delta is only meaningful on top
+of every delta before it, so once a write fails the writer drops the deltas
+still queued and the next append() starts over with a fresh base.
+"""
+import json
+import os
+import queue
+import struct
+import threading
+import zlib
+
+AUTOSAVE_PATH = "autosave.fqs"
+_HEADER = struct.Struct('<II')
+
+
+def _pack_record(payload):
+    body = zlib.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+    return _HEADER.pack(len(body), zlib.crc32(body)) + body
+
+
+def _read_records(data):
+    pos = 0
+    while pos + _HEADER.size <= len(data):
+        length, crc = _HEADER.unpack_from(data, pos)
+        body = data[pos + _HEADER.size:pos + _HEADER.size + length]
+        if len(body) < length or zlib.crc32(body) != crc:
+            return  # torn write from a crash: everything before it is intact
+        yield json.loads(zlib.decompress(body))
+        pos += _HEADER.size + length
+
+
+def load_autosave(path=AUTOSAVE_PATH):
+    """Rebuild (state, monthly_log, replay_ops) from an autosave file, or None."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    state = None
+    monthly_log, ops = [], []
+    for record in _read_records(data):
+        if record['type'] == 'base':
+            state = record['state']
+            monthly_log, ops = record['log'], record['ops']
+        elif state is not None:
+            state.update(record['set'])
+            monthly_log += record['log']
+            ops += record['ops']
+    if state is None:
+        return None
+    return state, monthly_log, [tuple(op) for op in ops]
+
+
+class Autosave:
+    """Writes a game's base snapshot once, then one delta record per month."""
+
+    def __init__(self, path=AUTOSAVE_PATH):
+        self.path = path
+        self._queue = queue.Queue()
+        self._thread = None
+        self._last = {}
+        self._log_len = 0
+        self._ops_len = 0
+        self._broken = False        # a write failed: deltas are useless until the next base is written
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def begin(self, sim):
+        """Start a fresh autosave (new game or just resumed) with a full snapshot."""
+        state = sim.snapshot()
+        ops = list(sim.recorder.ops) if sim.recorder is not None else []
+        self._last = state
+        self._log_len = len(sim.monthly_log)
+        self._ops_len = len(ops)
+        self._submit(self._write_base, {'type': 'base', 'state': state, 'log': sim.monthly_log.rows(), 'ops': ops})
+
+    def append(self, sim):
+        """Save the month just played; only what changed since the last save is written."""
+        if self._broken:
+            self.begin(sim)
+            return
+        state = sim.snapshot()
+        changed = {k: v for k, v in state.items() if self._last.get(k) != v}
+        ops = sim.recorder.ops[self._ops_len:] if sim.recorder is not None else []
+        record = {'type': 'delta', 'set': changed, 'log': sim.monthly_log.rows(self._log_len), 'ops': list(ops)}
+        self._last = state
+        self._log_len = len(sim.monthly_log)
+        self._ops_len += len(ops)
+        self._submit(self._append, record)
+
+    def discard(self):
+        self._last = {}
+        self._submit(self._remove, None)
+
+    def flush(self):
+        """Block until every queued write has hit the disk."""
+        if self._thread is not None:
+            self._queue.join()
+
+    # ---------- writer thread ----------
+    def _submit(self, job, record):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._queue.put((job, record))
+
+    def _run(self):
+        while True:
+            job, record = self._queue.get()
+            try:
+                if job == self._append and self._broken:
+                    continue        # the file is missing an earlier delta
+                job(record)
+                if job == self._write_base:
+                    self._broken = False
+            except Exception as e:      # never let the writer die: flush() would wait on it forever
+                print(f"Autosave failed: {e}")
+                if job != self._remove:
+                    self._broken = True
+            finally:
+                self._queue.task_done()
+
+    def _write_base(self, record):
+        tmp = self.path + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(_pack_record(record))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def _append(self, record):
+        with open(self.path, 'ab') as f:
+            f.write(_pack_record(record))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _remove(self, _):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,145 @@
+"""
+Observable game state: tracked fields, memoized derived values and change
+notifications.
+
+A Store subclass declares which attributes are tracked and which values are
+derived from them:
+
+    class Game(Store):
+        money = tracked()
+        debt = tracked()
+
+        @derived('money', 'debt')
+        def net_worth(self):
+            return self.money - self.debt
+
+Tracked fields live in the instance __dict__ as usual, so reading one costs
+nothing extra; tracked is a set-only descriptor that sees every assignment.
+A derived value is computed on first read and kept in the instance __dict__
+too (like functools.cached_property) until a field it depends on, directly
+or through another derived value, is assigned. State mutated in place (an
+array, a list, a ledger) is announced with touch(name).
+
+Subscribers name the fields and derived values they show. Changes are
+batched: publish() hands each subscriber, once, the set of its names that
+changed since the last publish(), so a UI calls it once per frame and only
+the widgets whose state moved redraw. With nobody subscribed nothing is
+recorded, and headless simulations pay for invalidation only.
+"""
+
+
+class tracked:
+    """A plain attribute whose assignments invalidate derived values and notify subscribers."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __set__(self, obj, value):
+        # Store.touch, inlined: this runs on every assignment
+        name = self.name
+        memo = obj.__dict__
+        memo[name] = value
+        dropped = obj._invalidates.get(name, ())
+        for key in dropped:
+            memo.pop(key, None)
+        changes = obj._changes
+        if changes is not None:
+            changes.add(name)
+            changes.update(dropped)
+
+
+class derived:
+    """Read-only value computed from `deps` and memoized until one of them changes."""
+
+    def __init__(self, *deps):
+        self.deps = deps
+
+    def __call__(self, fget):
+        self.fget = fget
+        self.__doc__ = fget.__doc__
+        return self
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.name] = self.fget(obj)
+        return value
+
+    def setter(self, fset):
+        """Also accept assignments, routed to `fset` (which must touch what it changes)."""
+        return _settable(self.deps, self.fget, fset)
+
+
+class _settable(derived):
+    # a data descriptor: reads come through __get__, which serves the memo by hand
+    def __init__(self, deps, fget, fset):
+        super().__init__(*deps)
+        self(fget)
+        self.fset = fset
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        memo = obj.__dict__
+        try:
+            return memo[self.name]
+        except KeyError:
+            value = memo[self.name] = self.fget(obj)
+            return value
+
+    def __set__(self, obj, value):
+        self.fset(obj, value)
+
+
+class Store:
+    _invalidates = {}       # name -> derived values to drop when it changes, built per class
+    _changes = None         # names changed since the last publish(); None while nobody subscribes
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        users = {}
+        for klass in reversed(cls.__mro__):
+            for name, attr in vars(klass).items():
+                if isinstance(attr, derived):
+                    for dep in attr.deps:
+                        users.setdefault(dep, set()).add(name)
+
+        def closure(name, seen):
+            for user in users.get(name, ()):
+                if user not in seen:
+                    seen.add(user)
+                    closure(user, seen)
+            return seen
+
+        cls._invalidates = {name: tuple(closure(name, set())) for name in users}
+
+    def touch(self, name):
+        """`name` changed (assigned, or mutated in place)."""
+        memo = self.__dict__
+        dropped = self._invalidates.get(name, ())
+        for key in dropped:
+            memo.pop(key, None)
+        if self._changes is not None:
+            self._changes.add(name)
+            self._changes.update(dropped)
+
+    def subscribe(self, names, callback):
+        """Call `callback(changed)` at publish() whenever any of `names` changed."""
+        if self._changes is None:
+            self._changes = set()
+            self._subscribers = []
+        self._subscribers.append((frozenset(names), callback))
+
+    def publish(self):
+        """Deliver the changes batched since the last call."""
+        changes = self._changes
+        if not changes:
+            return
+        self._changes = set()
+        for names, callback in self._subscribers:
+            hit = names & changes
+            if hit:
+                callback(hit)
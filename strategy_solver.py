@@ -0,0 +1,450 @@
+"""
+Offline strategy solver for FinanceQuest.
+
+For every class / education / difficulty setup the solver searches the game's
+own decision space (FinanceSimulation.legal_actions: life choices, health
+actions, the financial dropdown presets and ending the month) with Monte Carlo
+tree search and reports how well the resulting policy scores under
+calculate_score().
+
+Search details:
+  - the default policy is a HeuristicPolicy whose strategy knobs (happiness
+    target, emergency-fund size, save vs invest, education upgrade) are first
+    tuned on the setup by grid search;
+  - states are discretized (month, actions left, half-octave money / debt /
+    investment / fund buckets, happiness and stress deciles, debuffs, flags,
+    goals) and used as transposition-table keys, so paths reaching the same
+    situation share statistics;
+  - every iteration plays one full game on a fresh seed (chance is sampled,
+    not enumerated), follows UCB1 with progressive widening inside the table,
+    expands one new state and finishes with the default policy; each game is
+    scored against the default policy on the same seed (common random
+    numbers), which removes most of the event and market noise;
+  - the learned policy overrides the default only where an alternative is
+    better with confidence, so it never plays worse than the tuned heuristic
+    by more than noise.
+
+Setups are solved in parallel, one process each, and every result is cached in
+solver_cache/ under a fingerprint of the rules and search parameters, so a
+re-run only solves what changed.
+
+    python strategy_solver.py solve                     all 27 setups
+    python strategy_solver.py solve middle university normal -n 50000
+    python strategy_solver.py benchmark replays/        player vs solver, same seed
+"""
+import argparse
+import hashlib
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+
+from finance_sim import (FinanceSimulation, CLASS_CONFIGS, EDUCATION_CONFIGS, DIFFICULTY_CONFIGS,
+                         LIFE_CHOICES, EMERGENCY_EVENTS, DROPDOWN_AMOUNTS, LEISURE_HAPPINESS_CAP, MONTHS_PER_GAME,
+                         ACTIONS_PER_MONTH, RULES_VERSION)
+
+CACHE_DIR = "solver_cache"
+DEFAULT_ITERATIONS = 10000
+EVAL_GAMES = 500
+EVAL_SEED_BASE = 1 << 31        # evaluation seeds never overlap the search seeds
+TUNE_GAMES = 200               # games per PARAM_GRID candidate when tuning the default policy
+SEED_POOL = 1024               # search seeds; the default policy's score on each is its games' baseline
+UCB_C = 0.7
+MIN_VISITS = 8                  # visits before an action's statistics are trusted
+MAX_DECISIONS_PER_MONTH = ACTIONS_PER_MONTH + 1
+
+
+# ============================================================
+# STATE ABSTRACTION
+# ============================================================
+
+def _bucket(x):
+    """Signed half-octave bucket of a dollar amount (0 for under $250)."""
+    b = int(2 * math.log2(1 + abs(x) / 250))
+    return b if x >= 0 else -b
+
+
+def state_key(sim):
+    return (sim.current_month, sim.actions_remaining,
+            _bucket(sim.money), _bucket(sim.debt), _bucket(sim.investments), _bucket(sim.emergency_fund),
+            int(sim.happiness) // 10, int(sim.stress) // 10, sim.months_no_income, tuple(sorted(sim.debuffs)),
+            sim.has_vehicle, sim.has_university, sim.has_masters,
+            tuple(g['completed'] for g in sim.goals.values()))
+
+
+# ============================================================
+# POLICIES
+# ============================================================
+
+def _largest(legal, action_type, limit=float('inf')):
+    """Largest preset of `action_type` that is legal and at most `limit`."""
+    for amount in sorted(DROPDOWN_AMOUNTS[action_type], reverse=True):
+        move = f"{action_type}:{amount}"
+        if amount <= limit and move in legal:
+            return move
+    return None
+
+
+class HeuristicPolicy:
+    """
+    Rule-of-thumb play with a few strategy knobs: treat debuffs, keep
+    happiness at `happiness_target` with the best-value leisure, optionally
+    buy the education upgrade, build a `fund_months` emergency fund, clear
+    debt, then put the surplus into `surplus` ('save' or 'invest'), always
+    keeping a month of expenses in cash. The solver tunes the knobs per setup.
+    """
+    PARAM_GRID = {
+        'happiness_target': (50, 65, LEISURE_HAPPINESS_CAP),
+        'fund_months': (3, 6, 12),
+        'surplus': ('save', 'invest'),
+        'upgrade': (False, True),
+    }
+
+    def __init__(self, happiness_target=LEISURE_HAPPINESS_CAP, fund_months=3, surplus='save', upgrade=False):
+        self.params = {'happiness_target': happiness_target, 'fund_months': fund_months,
+                       'surplus': surplus, 'upgrade': upgrade}
+        self.happiness_target = happiness_target
+        self.fund_months = fund_months
+        self.surplus = surplus
+        self.upgrade = upgrade
+
+    @classmethod
+    def grid(cls):
+        keys = list(cls.PARAM_GRID)
+        for values in itertools.product(*(cls.PARAM_GRID[k] for k in keys)):
+            yield cls(**dict(zip(keys, values)))
+
+    def __call__(self, sim, legal):
+        if 'health_therapy' in legal: return 'health_therapy'
+        if 'health_rehab' in legal: return 'health_rehab'
+        if sim.happiness < self.happiness_target:
+            leisure = [k for k in legal if k.startswith('life_') and LIFE_CHOICES[k[5:]].choice_type == 'leisure']
+            if leisure:
+                return max(leisure, key=lambda k: LIFE_CHOICES[k[5:]].happiness / max(LIFE_CHOICES[k[5:]].cost, 1))
+        if self.upgrade:
+            for move in ('life_university', 'life_masters'):
+                if move in legal: return move
+        expenses = sim.rent + sim.groceries + sim.transport
+        spare = sim.money - expenses
+        if sim.emergency_fund < self.fund_months * expenses:
+            move = _largest(legal, 'save', spare)
+            if move: return move
+        if sim.debt > 0:
+            move = _largest(legal, 'pay_debt', spare)
+            if move: return move
+        return _largest(legal, self.surplus, spare) or 'end'
+
+
+heuristic_action = HeuristicPolicy()
+
+
+def _play_month_prefix(sim):
+    """Acknowledge a pending event and return the moves open now."""
+    if sim.show_event_modal:
+        sim.handle_event_close()
+    return sim.legal_actions()
+
+
+def play_game(sim, choose, months=None):
+    """
+    Drive a started game to the end with `choose(sim, legal) -> action`;
+    returns the final score. With `months`, stop after that many more months
+    and return the score at that point.
+    """
+    decisions = 0
+    month = sim.current_month
+    stop = month + months if months is not None else None
+    while not sim.finished and month != stop:
+        legal = _play_month_prefix(sim)
+        action = choose(sim, legal) if decisions < MAX_DECISIONS_PER_MONTH else 'end'
+        sim.apply_action(action)
+        decisions += 1
+        if sim.current_month != month:
+            month, decisions = sim.current_month, 0
+    return sim.calculate_score()
+
+
+class TablePolicy:
+    """Plays the solver's action in states it found a better one for; `default` everywhere else."""
+
+    def __init__(self, table, default=heuristic_action):
+        self.table = table          # {state_key: action}
+        self.default = default
+
+    def __call__(self, sim, legal):
+        action = self.table.get(state_key(sim))
+        return action if action in legal else self.default(sim, legal)
+
+
+# ============================================================
+# SEARCH
+# ============================================================
+
+def _new_game(setup, seed):
+    sim = FinanceSimulation()
+    sim.selected_class, sim.selected_education, sim.selected_difficulty = setup
+    sim.start_game(seed)
+    return sim
+
+
+class _Node:
+    __slots__ = ('visits', 'order', 'stats')
+
+    def __init__(self, sim, legal, rng, default):
+        self.visits = 0
+        first = default(sim, legal)
+        rest = [a for a in legal if a != first]
+        rng.shuffle(rest)
+        self.order = [first] + rest     # progressive widening admits actions in this order
+        self.stats = {}                 # action -> [visits, total gain, total squared gain]
+
+
+class Solver:
+    """UCT over the discretized state space of one setup, with a transposition table."""
+
+    def __init__(self, setup, default=heuristic_action, seed=0):
+        self.setup = setup
+        self.default = default
+        self.rng = random.Random(seed)
+        self.table = {}
+        self.seeds = [self.rng.getrandbits(32) for _ in range(SEED_POOL)]
+        self.baselines = {}
+        self.lo, self.hi = float('inf'), float('-inf')
+
+    def _baseline(self, seed):
+        if seed not in self.baselines:
+            self.baselines[seed] = play_game(_new_game(self.setup, seed), self.default)
+        return self.baselines[seed]
+
+    def _select(self, node, legal):
+        node.order += [a for a in legal if a not in node.order]   # states sharing a key can differ slightly
+        width = 1 + int(math.sqrt(node.visits))
+        candidates = [a for a in node.order if a in legal][:width]
+        for action in candidates:
+            if action not in node.stats:
+                return action
+        scale = max(self.hi - self.lo, 1.0)
+        log_n = math.log(node.visits + 1)
+
+        def ucb(action):
+            n, total, _ = node.stats[action]
+            return (total / n - self.lo) / scale + UCB_C * math.sqrt(log_n / n)
+        return max(candidates, key=ucb)
+
+    def iterate(self):
+        seed = self.rng.choice(self.seeds)
+        sim = _new_game(self.setup, seed)
+        path = []
+        expanded = False
+        decisions, month = 0, 0
+        while not sim.finished:
+            legal = _play_month_prefix(sim)
+            if decisions >= MAX_DECISIONS_PER_MONTH:
+                action = 'end'
+            elif expanded:
+                action = self.default(sim, legal)
+            else:
+                key = state_key(sim)
+                node = self.table.get(key)
+                if node is None:
+                    node = self.table[key] = _Node(sim, legal, self.rng, self.default)
+                    expanded = True
+                action = self._select(node, legal)
+                path.append((node, action))
+            sim.apply_action(action)
+            decisions += 1
+            if sim.current_month != month:
+                month, decisions = sim.current_month, 0
+        score = sim.calculate_score()
+        # common random numbers: judge the game against the default policy on the same market and events
+        gain = score - self._baseline(seed)
+        self.lo, self.hi = min(self.lo, gain), max(self.hi, gain)
+        for node, action in path:
+            node.visits += 1
+            stat = node.stats.setdefault(action, [0, 0.0, 0.0])
+            stat[0] += 1
+            stat[1] += gain
+            stat[2] += gain * gain
+        return score
+
+    def run(self, iterations):
+        for _ in range(iterations):
+            self.iterate()
+        return self
+
+    def policy_table(self):
+        """
+        {state_key: action} for states where some action beats the default
+        policy's choice with confidence (its mean gain minus two standard
+        errors still exceeds the default's mean); elsewhere the default plays.
+        """
+        table = {}
+        for key, node in self.table.items():
+            default = node.stats.get(node.order[0])
+            bar = default[1] / default[0] if default and default[0] >= MIN_VISITS else 0.0
+            best, best_lcb = None, bar
+            for action, (n, total, total_sq) in node.stats.items():
+                if n < MIN_VISITS or action == node.order[0]:
+                    continue
+                mean = total / n
+                lcb = mean - 2 * math.sqrt(max(total_sq / n - mean * mean, 0.0) / n)
+                if lcb > best_lcb:
+                    best, best_lcb = action, lcb
+            if best is not None:
+                table[key] = best
+        return table
+
+
+# ============================================================
+# EVALUATION AND CACHE
+# ============================================================
+
+def evaluate(setup, choose, games=EVAL_GAMES):
+    """Mean score of `choose` over the fixed evaluation seeds, with a 95% confidence half-width."""
+    scores = [play_game(_new_game(setup, EVAL_SEED_BASE + i), choose) for i in range(games)]
+    mean = sum(scores) / len(scores)
+    sd = math.sqrt(sum((s - mean) ** 2 for s in scores) / max(len(scores) - 1, 1))
+    return {'mean': mean, 'ci95': 1.96 * sd / math.sqrt(len(scores)), 'min': min(scores), 'max': max(scores)}
+
+
+def tune_heuristic(setup, seeds):
+    """The HeuristicPolicy from PARAM_GRID with the best mean score, every candidate playing the same seeds."""
+    def mean_score(policy):
+        return sum(play_game(_new_game(setup, seed), policy) for seed in seeds) / len(seeds)
+    return max(HeuristicPolicy.grid(), key=mean_score)
+
+
+def rules_fingerprint(iterations):
+    """Changes whenever the rules, balance tables or search parameters change, invalidating cached results."""
+    parts = (RULES_VERSION, CLASS_CONFIGS, EDUCATION_CONFIGS, DIFFICULTY_CONFIGS, LIFE_CHOICES, EMERGENCY_EVENTS,
+             DROPDOWN_AMOUNTS, MONTHS_PER_GAME, ACTIONS_PER_MONTH, iterations, UCB_C, MIN_VISITS, EVAL_GAMES, TUNE_GAMES, SEED_POOL,
+             HeuristicPolicy.PARAM_GRID)
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def _cache_path(setup):
+    return os.path.join(CACHE_DIR, "_".join(setup) + ".pkl")
+
+
+def load_result(setup, iterations=DEFAULT_ITERATIONS):
+    """Cached result for `setup` if it was solved under the current rules, else None."""
+    try:
+        result = joblib.load(_cache_path(setup))
+        fingerprint = result.get('fingerprint')
+    except Exception:       # missing, truncated, or pickled by code that has since changed: a cache miss
+        return None
+    return result if fingerprint == rules_fingerprint(iterations) else None
+
+
+def solve_setup(setup, iterations=DEFAULT_ITERATIONS, force=False):
+    """Solve one setup (or load it from the cache); returns the result dict."""
+    setup = tuple(setup)
+    if not force:
+        cached = load_result(setup, iterations)
+        if cached is not None:
+            return cached
+    start = time.perf_counter()
+    solver = Solver(setup, seed=int(hashlib.sha1("_".join(setup).encode()).hexdigest()[:8], 16))
+    solver.default = tune_heuristic(setup, solver.seeds[:TUNE_GAMES])
+    solver.run(iterations)
+    table = solver.policy_table()
+    root = solver.table[state_key(_new_game(setup, 0))]
+    result = {
+        'fingerprint': rules_fingerprint(iterations),
+        'setup': setup,
+        'iterations': iterations,
+        'states': len(solver.table),
+        'params': solver.default.params,
+        'policy': table,
+        'opening': sorted(((total / n, n, a) for a, (n, total, _) in root.stats.items()), reverse=True)[:5],
+        'solver': evaluate(setup, TablePolicy(table, solver.default)),
+        'heuristic': evaluate(setup, heuristic_action),
+        'seconds': time.perf_counter() - start,
+    }
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = _cache_path(setup) + ".tmp"
+    joblib.dump(result, tmp, compress=3)
+    os.replace(tmp, _cache_path(setup))
+    return result
+
+
+def all_setups():
+    return [(c, e, d) for c in CLASS_CONFIGS for e in EDUCATION_CONFIGS for d in DIFFICULTY_CONFIGS]
+
+
+def solve_all(setups, iterations=DEFAULT_ITERATIONS, workers=None, force=False):
+    """Solve setups in parallel, one worker process per setup; yields results as they finish."""
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [pool.submit(solve_setup, setup, iterations, force) for setup in setups]
+        for future in futures:
+            yield future.result()
+
+
+def solver_policy(setup, iterations=DEFAULT_ITERATIONS):
+    """`choose(sim, legal)` for `setup`, solving it first if it is not cached."""
+    result = solve_setup(setup, iterations)
+    return TablePolicy(result['policy'], HeuristicPolicy(**result['params']))
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+def _print_result(r):
+    s, h, p = r['solver'], r['heuristic'], r['params']
+    strategy = f"happy {p['happiness_target']} fund {p['fund_months']}mo {p['surplus']}" + (" +edu" if p['upgrade'] else "")
+    print(f"{'/'.join(r['setup']):28} solver {s['mean']:8,.0f} ±{s['ci95']:5,.0f}  "
+          f"heuristic {h['mean']:8,.0f} ±{h['ci95']:5,.0f}  {strategy:32} "
+          f"overrides {len(r['policy']):4}  {r['seconds']:5.1f}s")
+
+
+def _benchmark_replays(paths, iterations):
+    from replay import list_replays, load_replay, replay_steps
+
+    for path in list_replays(*paths):
+        replay = load_replay(path)
+        if replay.final_score is None:
+            continue
+        setup = (replay.player_class, replay.education, replay.difficulty)
+        # same seed, length and market tape as the player: identical market and
+        # events up to the first differing decision (the ops themselves are not applied)
+        sim = FinanceSimulation()
+        try:
+            replay_steps(sim, replay)
+        except (OSError, ValueError) as e:      # its market tape is missing or was rebuilt
+            print(f"{os.path.basename(path)}: skipped ({e})")
+            continue
+        solver_score = play_game(sim, solver_policy(setup, iterations))
+        print(f"{os.path.basename(path)}: player {replay.final_score:,}  solver {solver_score:,}  "
+              f"({replay.final_score / max(solver_score, 1):.0%} of solver)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search near-optimal FinanceQuest strategies.")
+    parser.add_argument('command', choices=['solve', 'benchmark'])
+    parser.add_argument('args', nargs='*', help="solve: class education difficulty; benchmark: replay paths")
+    parser.add_argument('-n', '--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('-j', '--workers', type=int, help="worker processes (default: all cores)")
+    parser.add_argument('--force', action='store_true', help="ignore cached results")
+    args = parser.parse_args(argv)
+
+    if args.command == 'benchmark':
+        _benchmark_replays(args.args, args.iterations)
+        return 0
+    if args.args and len(args.args) != 3:
+        parser.error("solve takes no setup or exactly: class education difficulty")
+    setups = [tuple(args.args)] if args.args else all_setups()
+    start = time.perf_counter()
+    for result in solve_all(setups, args.iterations, args.workers, args.force):
+        _print_result(result)
+    print(f"Solved {len(setups)} setups in {time.perf_counter() - start:.1f}s (cache: {CACHE_DIR}/)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
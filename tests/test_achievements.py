@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+
+import pytest
+
+from achievements import Achievement, AchievementEngine
+from finance_sim import FinanceSimulation
+from policies import RandomPolicy, RuleOfThumbPolicy, play_policy
+
+
+def _counting(catalog):
+    """`catalog` with each rule's test wrapped to count its calls in the returned dict."""
+    calls = {}
+
+    def wrap(rule):
+        def test(sim):
+            calls[rule.key] = calls.get(rule.key, 0) + 1
+            return rule.test(sim)
+        return Achievement(rule.key, rule.name, rule.description, rule.reads, test, rule.months, rule.at_end, rule.goal)
+    return [wrap(rule) for rule in catalog], calls
+
+
+CATALOG = [
+    Achievement('rich', "Rich", "", ('money',), lambda s: s.money >= 100),
+    Achievement('calm', "Calm", "", ('stress',), lambda s: s.stress <= 20),
+    Achievement('steady', "Steady", "", ('money',), lambda s: s.money > 0, months=3),
+    Achievement('saver', "Saver", "", ('money',), lambda s: s.money > 0, at_end=True),
+]
+
+
+@pytest.fixture
+def engine():
+    catalog, calls = _counting(CATALOG)
+    return AchievementEngine(catalog), calls
+
+
+def _month(sim, engine, month, **fields):
+    sim.current_month = month
+    vars(sim).update(fields)
+    return [rule.key for rule in engine.update(sim)]
+
+
+def test_only_rules_watching_a_changed_field_are_tested(engine):
+    engine, calls = engine
+    sim = SimpleNamespace(money=10, stress=50, current_month=0)
+    assert _month(sim, engine, 0) == []
+    assert calls == {'rich': 1, 'calm': 1, 'steady': 1}     # first update: everything is new
+    calls.clear()
+    _month(sim, engine, 1, stress=40)
+    assert calls == {'calm': 1, 'steady': 1}                # streaks also watch the month
+    calls.clear()
+    assert _month(sim, engine, 2, money=150) == ['rich', 'steady']
+    assert calls == {'rich': 1, 'steady': 1}
+    calls.clear()
+    _month(sim, engine, 3, money=200)
+    assert calls == {}                                      # unlocked rules are not re-tested
+
+
+def test_streak_resets_when_its_test_fails(engine):
+    engine, _ = engine
+    sim = SimpleNamespace(money=10, stress=50, current_month=0)
+    _month(sim, engine, 0)
+    _month(sim, engine, 1)
+    _month(sim, engine, 2, money=-5)
+    assert engine.streaks['steady'] == 0
+    _month(sim, engine, 3, money=5)
+    _month(sim, engine, 4)
+    assert 'steady' not in engine.unlocked
+    assert _month(sim, engine, 5) == ['steady']
+    assert engine.unlocked['steady'] == 5
+
+
+def test_at_end_rules_are_judged_only_by_finish(engine):
+    engine, calls = engine
+    sim = SimpleNamespace(money=10, stress=50, current_month=0)
+    _month(sim, engine, 0)
+    assert 'saver' not in calls
+    assert [rule.key for rule in engine.finish(sim)] == ['saver']
+
+
+def test_state_round_trip_keeps_streaks(engine):
+    engine, _ = engine
+    sim = SimpleNamespace(money=10, stress=50, current_month=0)
+    _month(sim, engine, 0)
+    _month(sim, engine, 1, stress=10)
+    resumed = AchievementEngine(engine.catalog)
+    resumed.load(engine.state())
+    assert (resumed.unlocked, resumed.streaks) == ({'calm': 1}, {'steady': 2})
+    assert _month(sim, resumed, 2) == ['steady']
+
+
+class _EveryRule(AchievementEngine):
+    """Re-tests every rule at every month end: what the watcher index must agree with."""
+
+    def update(self, sim):
+        return self._evaluate(sim, [i for i, rule in enumerate(self.catalog) if not rule.at_end])
+
+
+@pytest.mark.parametrize('policy', [RandomPolicy, RuleOfThumbPolicy])
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_indexed_rules_unlock_like_testing_every_rule(policy, seed):
+    sim = FinanceSimulation()
+    sim.selected_class, sim.selected_education, sim.selected_difficulty = 'lower', 'polytechnic', 'easy'
+    sim.start_game(seed)
+    shadow = _EveryRule()
+    update, finish = sim.achievements.update, sim.achievements.finish
+    sim.achievements.update = lambda s: (shadow.update(s), update(s))[1]
+    sim.achievements.finish = lambda s: (shadow.finish(s), finish(s))[1]
+    play_policy(sim, policy())
+    assert sim.achievements.unlocked == shadow.unlocked
+    assert sim.achievements.unlocked
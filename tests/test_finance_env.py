@@ -0,0 +1,144 @@
+"""VectorEnv re-implements the game rules over arrays; these check it still follows FinanceSimulation."""
+import numpy as np
+import pytest
+
+import loans
+from finance_env import END_ACTION, ENV_ACTIONS, FinanceQuestEnv, VectorEnv
+
+SETUPS = (('middle', 'university', 'normal'), ('lower', 'polytechnic', 'hard'), ('upper', 'masters', 'easy'))
+_SLOT_KEYS = [slot for slot, _ in loans.LOAN_SLOTS]
+
+
+def _copy_into(venv, sim):
+    """Put game 0 of `venv` in the state `sim` is in."""
+    venv.money[0], venv.emergency_fund[0], venv.holdings[0] = sim.money, sim.emergency_fund, sim.holdings
+    venv.loan_balances[0] = venv.loan_payments[0] = 0
+    for loan in sim.loans:
+        j = _SLOT_KEYS.index(loan.slot)
+        venv.loan_balances[0, j], venv.loan_payments[0, j] = loan.balance, loan.payment
+    venv.happiness[0], venv.stress[0], venv.income[0] = sim.happiness, sim.stress, sim.monthly_income
+    venv.month[0], venv.actions_remaining[0] = sim.current_month, sim.actions_remaining
+    venv.months_no_income[0] = sim.months_no_income
+    venv.has_vehicle[0], venv.has_university[0], venv.has_masters[0] = sim.has_vehicle, sim.has_university, sim.has_masters
+    venv.addict[0], venv.unhappy[0], venv.distracted[0] = (name in sim.debuffs for name in ('addict', 'unhappy', 'distracted'))
+    venv.distracted_until[0] = sim.timeline.due_month('debuff:distracted') or 0
+    venv.unhappy_until[0] = sim.timeline.due_month('debuff:unhappy') or 0
+    venv.goals[0] = [sim.goals[key]['completed'] for key in ('netWorth', 'emergencyFund', 'debtFree', 'happiness')]
+    venv.event[0] = -1
+    venv.score = venv._calculate_score()
+
+
+@pytest.mark.parametrize('setup', SETUPS)
+def test_actions_match_step_for_step(setup):
+    """From the same state both offer the same moves, and an action within the month has the same outcome."""
+    rng = np.random.default_rng(0)
+    env, venv = FinanceQuestEnv(*setup), VectorEnv(1, *setup, seed=0)
+    env.reset(seed=1)
+    venv.reset()
+    for game in range(15):
+        if game:
+            env.reset()
+        done = False
+        while not done:
+            _copy_into(venv, env.sim)
+            mask = env.action_masks()
+            assert (venv.action_masks()[0] == mask).all(), env.sim.current_month
+            action = int(rng.choice(np.flatnonzero(mask)))
+            obs, reward, done, _, _ = env.step(action)
+            if ENV_ACTIONS[action] not in ('end', 'health_rehab'):     # rehab's outcome is random
+                vobs, vreward, _, _, _ = venv.step(np.array([action]))
+                assert vobs[0] == pytest.approx(obs, abs=1e-3), ENV_ACTIONS[action]
+                assert vreward[0] == pytest.approx(reward, abs=1e-3), ENV_ACTIONS[action]
+
+
+class _Calm:
+    """Stands in for both games' random sources: no event, debuff or firing ever happens and markets return their mean."""
+
+    def seed(self, seed):
+        pass
+
+    def random(self, size=None):
+        return 0.999 if size is None else np.full(size, 0.999)
+
+    def gauss(self, mu, sigma):
+        return mu
+
+    def standard_normal(self, size):
+        return np.zeros(size)
+
+
+@pytest.mark.parametrize('setup', SETUPS)
+def test_month_end_matches_without_randomness(setup):
+    """With chance taken out, ending a month from the same state gives the same state in both."""
+    rng = np.random.default_rng(2)
+    env, venv = FinanceQuestEnv(*setup), VectorEnv(1, *setup, seed=0)
+    env.sim.rng = venv.rng = _Calm()
+    venv.reset()
+    ended = 0
+    for _ in range(10):
+        env.reset()
+        done = False
+        while not done:
+            mask = env.action_masks()
+            action = int(rng.choice(np.flatnonzero(mask))) if rng.random() < 0.7 else END_ACTION
+            if ENV_ACTIONS[action] == 'end':
+                _copy_into(venv, env.sim)
+            obs, reward, done, _, _ = env.step(action)
+            if ENV_ACTIONS[action] == 'end' and not done:
+                vobs, vreward, _, _, _ = venv.step(np.array([END_ACTION]))
+                assert vobs[0] == pytest.approx(obs, abs=1e-3), env.sim.current_month
+                assert vreward[0] == pytest.approx(reward, abs=1e-3), env.sim.current_month
+                ended += 1
+    assert ended > 100
+
+
+def _scalar_games(setup, games, choose):
+    """(ended before the last month, final score) for `games` games played with `choose(mask)`."""
+    env = FinanceQuestEnv(*setup)
+    env.reset(seed=0)
+    bankrupt, scores = [], []
+    for game in range(games):
+        if game:
+            env.reset()
+        done = False
+        while not done:
+            month = env.sim.current_month
+            _, _, done, _, info = env.step(choose(env.action_masks()))
+        bankrupt.append(month < env.months_per_game)
+        scores.append(info['final_score'])
+    return np.array(bankrupt), np.array(scores)
+
+
+def _vector_games(setup, games, choose):
+    venv = VectorEnv(games, *setup, seed=1)
+    venv.reset()
+    bankrupt, scores = np.zeros(games, dtype=bool), np.full(games, np.nan)
+    while np.isnan(scores).any():
+        month = venv.month.copy()
+        _, _, terminated, _, info = venv.step(choose(venv.action_masks()))
+        first = terminated & np.isnan(scores)
+        if first.any():
+            scores[first] = info['final_score'][first]
+            bankrupt[first] = month[first] < venv.months_per_game
+    return bankrupt, scores
+
+
+def _agree(a, b, sigmas=4):
+    """Means of samples `a` and `b` within `sigmas` standard errors of each other."""
+    se = np.sqrt(a.var() / len(a) + b.var() / len(b))
+    return abs(a.mean() - b.mean()) <= sigmas * se + 1e-9
+
+
+@pytest.mark.parametrize('setup', SETUPS[:2])
+def test_idle_bankruptcy_rate_matches(setup):
+    bankrupt, _ = _scalar_games(setup, 800, lambda mask: END_ACTION)
+    vbankrupt, _ = _vector_games(setup, 20000, lambda masks: np.full(len(masks), END_ACTION))
+    assert _agree(bankrupt, vbankrupt), (bankrupt.mean(), vbankrupt.mean())
+
+
+def test_random_policy_score_matches():
+    setup = SETUPS[0]
+    rng = np.random.default_rng(5)
+    _, scores = _scalar_games(setup, 400, lambda mask: int(rng.choice(np.flatnonzero(mask))))
+    _, vscores = _vector_games(setup, 20000, lambda masks: (rng.random(masks.shape) * masks).argmax(axis=1))
+    assert _agree(scores, vscores), (scores.mean(), vscores.mean())
@@ -0,0 +1,150 @@
+import os
+import random
+
+import pytest
+
+from finance_sim import FinanceSimulation
+from leaderboard import TOP_K, Leaderboard, _HEADER, entry_for, main, verify_entry
+from policies import RandomPolicy, play_policy
+from replay import Replay
+
+
+def _entry(i, rng):
+    return {'score': rng.randrange(100_000), 'player': None, 'class': rng.choice(('lower', 'middle')),
+            'education': 'university', 'difficulty': rng.choice(('easy', 'hard')), 'months': 24, 'month': 24,
+            'goals': 0, 'achievements': 0, 'seed': i, 'played_at': '2026-01-01 12:00', 'replay': None}
+
+
+@pytest.fixture
+def board(tmp_path):
+    rng = random.Random(0)
+    entries = [_entry(i, rng) for i in range(50)]
+    lb = Leaderboard(str(tmp_path / "t.fql"))
+    lb.add_many(entries)
+    return lb, entries
+
+
+def _offsets(path):
+    """Start offset of every record in the log."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    offsets, pos = [], 0
+    while pos < len(data):
+        offsets.append(pos)
+        length, _ = _HEADER.unpack_from(data, pos)
+        pos += _HEADER.size + length
+    return offsets, data
+
+
+def _checkpoint(lb):
+    return os.path.splitext(lb.path)[0] + '.fqi'
+
+
+def test_top_matches_sorted_entries(board):
+    lb, entries = board
+    best = sorted(entries, key=lambda e: e['score'], reverse=True)[:lb.top_k]
+    assert [e['score'] for e in lb.top()] == [e['score'] for e in best]
+    hard = sorted((e['score'] for e in entries if e['class'] == 'lower' and e['difficulty'] == 'hard'), reverse=True)
+    assert [e['score'] for e in lb.top(None, 'lower', None, 'hard')] == hard[:lb.top_k]
+    reopened = Leaderboard(lb.path)
+    assert reopened.count == len(entries)
+    assert reopened.top() == lb.top()
+
+
+def test_flipped_byte_breaks_the_chain(board):
+    lb, entries = board
+    offsets, data = _offsets(lb.path)
+    data = bytearray(data)
+    data[offsets[20] + _HEADER.size + 3] ^= 1
+    with open(lb.path, 'wb') as f:
+        f.write(data)
+
+    # the checkpoint still covers the edited record; a full read of the chain catches it
+    assert Leaderboard(lb.path).count == len(entries)
+    assert list(lb.entries()) == entries[:20]
+
+    os.remove(_checkpoint(lb))
+    rebuilt = Leaderboard(lb.path)
+    assert rebuilt.count == 20
+    assert rebuilt.rejected == len(data) - offsets[20]
+    assert all(e['seed'] < 20 for e in rebuilt.top())
+
+
+def test_dropped_record_breaks_the_chain(board):
+    lb, entries = board
+    offsets, data = _offsets(lb.path)
+    with open(lb.path, 'wb') as f:
+        f.write(data[:offsets[30]] + data[offsets[31]:])
+
+    assert list(lb.entries()) == entries[:30]
+    # the log no longer ends where the checkpoint says: it is rebuilt from the log
+    rebuilt = Leaderboard(lb.path)
+    assert rebuilt.count == 30
+    assert rebuilt.rejected == len(data) - offsets[31]
+
+
+def test_torn_tail_is_cut_off(board):
+    lb, entries = board
+    with open(lb.path, 'ab') as f:
+        f.write(_HEADER.pack(100, bytes(32)) + b'{"sco')
+
+    reopened = Leaderboard(lb.path)
+    assert reopened.count == len(entries)
+    assert reopened.rejected == 0
+    assert list(reopened.entries()) == entries
+
+    extra = _entry(99, random.Random(1))
+    reopened.add(extra)
+    assert list(reopened.entries()) == entries + [extra]
+    assert len(_offsets(lb.path)[0]) == len(entries) + 1     # the torn bytes are gone
+
+    os.remove(_checkpoint(lb))
+    assert Leaderboard(lb.path).count == len(entries) + 1
+
+
+def test_failed_write_leaves_the_board_unchanged(board, monkeypatch):
+    lb, entries = board
+    rng = random.Random(1)
+    before = lb.top(), lb.count
+
+    def fail(fd):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, 'fsync', fail)
+    with pytest.raises(OSError):
+        lb.add_many([_entry(100 + i, rng) for i in range(5)])
+    monkeypatch.undo()
+    assert (lb.top(), lb.count) == before
+
+    more = [_entry(200 + i, rng) for i in range(5)]
+    lb.add_many(more)                       # cuts off the unsynced records first
+    assert list(lb.entries()) == entries + more
+    os.remove(_checkpoint(lb))
+    rebuilt = Leaderboard(lb.path)
+    assert rebuilt.count == lb.count == 55 and rebuilt.top() == lb.top() and rebuilt.rejected == 0
+
+
+def test_verify_entry_rejects_a_forged_score():
+    sim = FinanceSimulation()
+    sim.selected_class, sim.selected_education, sim.selected_difficulty = 'middle', 'university', 'normal'
+    sim.start_game(1234)
+    replay = sim.recorder = Replay.for_game(sim)
+    play_policy(sim, RandomPolicy())
+    entry = entry_for(sim, replay=replay)
+    assert verify_entry(entry, replay)
+
+    forged = Replay(replay.seed, replay.player_class, replay.education, replay.difficulty, list(replay.ops),
+                    replay.final_score + 1000, replay.months_per_game)
+    assert not verify_entry(entry, forged)                  # not the replay the entry was recorded with
+    assert not verify_entry({**entry_for(sim, replay=forged), 'score': forged.final_score}, forged)
+
+
+def test_cli_top_reuses_the_checkpoint(board, monkeypatch, capsys):
+    lb, entries = board
+    loads = []
+    load = Leaderboard._load_checkpoint
+    monkeypatch.setattr(Leaderboard, '_load_checkpoint', lambda self: loads.append(load(self)) or loads[-1])
+    assert main(['--file', lb.path, 'top', '-k', '3']) == 0
+    assert loads == [True]
+    assert len(capsys.readouterr().out.splitlines()) == 3
+    with pytest.raises(SystemExit):
+        main(['--file', lb.path, 'top', '-k', str(TOP_K + 1)])
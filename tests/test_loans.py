@@ -0,0 +1,119 @@
+import math
+
+import pytest
+
+from finance_sim import FinanceSimulation
+from loans import LOAN_TYPES, Loan, LoanLedger
+
+
+def _ledger(*loans):
+    ledger = LoanLedger()
+    for slot, kind, principal in loans:
+        ledger.open(slot, kind, principal)
+    return ledger
+
+
+def _iterate(ledger):
+    """Balances at the start of each month and the payments made, by calling accrue() until clear."""
+    ledger = LoanLedger.from_state(ledger.state())
+    balances, paid = [ledger.total], 0.0
+    while ledger.total > 0:
+        paid += ledger.accrue()
+        balances.append(ledger.total)
+    return balances, paid
+
+
+LEDGERS = {
+    'personal': (('personal', 'personal', 8000),),
+    'student': (('education', 'student', 25000),),
+    'both': (('personal', 'personal', 8000), ('education', 'student', 25000), ('masters', 'student', 12000)),
+}
+
+
+@pytest.mark.parametrize('loans', LEDGERS.values(), ids=LEDGERS.keys())
+@pytest.mark.parametrize('prepaid', (0, 6000))
+def test_closed_forms_match_accrue(loans, prepaid):
+    ledger = _ledger(*loans)
+    now = 0
+    for _ in range(7):      # some months on minimum payments first
+        ledger.accrue()
+        now += 1
+    ledger.prepay(prepaid, 'snowball')
+
+    balances, paid = _iterate(ledger)
+    assert ledger.paid_off_month(now) == now + len(balances) - 1
+    for k, balance in enumerate(balances):
+        assert ledger.balance_at(now + k, now) == pytest.approx(balance, abs=1e-6)
+    assert ledger.balance_at(now + len(balances) + 12, now) == 0.0
+    assert ledger.interest_left(now) == pytest.approx(paid - ledger.total, abs=1e-6)
+
+
+def test_loan_pays_off_on_its_term():
+    for kind, loan_type in LOAN_TYPES.items():
+        ledger = _ledger(('personal', kind, 10000))
+        assert ledger.paid_off_month(0) == loan_type.term_months
+        assert len(_iterate(ledger)[0]) - 1 == loan_type.term_months
+
+
+def test_payment_too_small_never_pays_off():
+    loan = Loan('personal', 'personal', 10000, payment=10)
+    ledger = LoanLedger([loan])
+    assert ledger.paid_off_month(0) == math.inf
+    assert ledger.interest_left(0) == math.inf
+
+
+def test_avalanche_pays_highest_rate_first():
+    ledger = _ledger(('personal', 'personal', 3000), ('education', 'student', 1000))
+    assert ledger.prepay(1500, 'avalanche') == 1500
+    assert [(loan.kind, loan.balance) for loan in ledger] == [('personal', 1500), ('student', 1000)]
+
+
+def test_snowball_pays_smallest_balance_first():
+    ledger = _ledger(('personal', 'personal', 3000), ('education', 'student', 1000))
+    assert ledger.prepay(1500, 'snowball') == 1500
+    assert [(loan.kind, loan.balance) for loan in ledger] == [('personal', 2500)]
+
+
+def test_avalanche_costs_less_interest_than_snowball():
+    loans = (('personal', 'personal', 9000), ('education', 'student', 4000))
+    avalanche, snowball = _ledger(*loans), _ledger(*loans)
+    avalanche.prepay(4000, 'avalanche')
+    snowball.prepay(4000, 'snowball')
+    assert avalanche.interest_left(0) < snowball.interest_left(0)
+    assert len(snowball) < len(avalanche)
+
+
+def test_prepay_more_than_owed_applies_only_the_debt():
+    ledger = _ledger(('personal', 'personal', 3000), ('education', 'student', 1000))
+    assert ledger.prepay(10000) == pytest.approx(4000)
+    assert len(ledger) == 0 and ledger.total == 0
+
+
+def test_scale_keeps_each_loans_share():
+    ledger = _ledger(('personal', 'personal', 3000), ('education', 'student', 1000))
+    payments = [loan.payment for loan in ledger]
+    ledger.scale(2000)
+    assert ledger.total == pytest.approx(2000)
+    assert [loan.balance for loan in ledger] == pytest.approx([1500, 500])
+    assert [loan.payment for loan in ledger] == payments
+    assert ledger.balance_at(1, 0) == pytest.approx(_iterate(ledger)[0][1])
+
+
+def test_scale_of_empty_ledger_opens_a_student_loan():
+    ledger = LoanLedger()
+    ledger.scale(5000)
+    assert [(loan.slot, loan.kind, loan.balance) for loan in ledger] == [('education', 'student', 5000)]
+
+
+def test_restore_of_autosave_from_before_the_ledger():
+    sim = FinanceSimulation()
+    sim.selected_class, sim.selected_education, sim.selected_difficulty = 'middle', 'university', 'normal'
+    sim.start_game(7)
+    state = sim.snapshot()
+    del state['loans']
+    state['debt'] = 12345.0
+
+    resumed = FinanceSimulation()
+    resumed.restore(state)
+    assert resumed.debt == pytest.approx(12345.0)
+    assert sum(loan.balance for loan in resumed.loans) == pytest.approx(12345.0)
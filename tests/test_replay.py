@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+
+from finance_sim import (FinanceSimulation, ACTION_IDS, CLASS_CONFIGS, DIFFICULTY_CONFIGS, EDUCATION_CONFIGS,
+                         FINANCIAL_ACTIONS)
+from loans import PAYOFF_ORDERS
+import market_tape
+from portfolio import ASSET_KEYS
+from replay import Replay, decode_replay, encode_replay, load_replay, run_replay, save_replay
+
+
+def play_random_month(sim, bot):
+    """One month of erratic play touching every kind of recorded decision, legal or not."""
+    if sim.show_event_modal and bot.random() < 0.8:
+        sim.handle_event_close()
+    for _ in range(bot.randint(0, 4)):
+        r = bot.random()
+        if r < 0.1:
+            sim.set_payoff_order(bot.choice(PAYOFF_ORDERS))
+            sim.set_invest_asset(bot.choice(ASSET_KEYS))
+        elif r < 0.4:
+            sim._action_callback(bot.choice(ACTION_IDS))()
+        else:
+            sim.execute_financial_action(bot.choice(FINANCIAL_ACTIONS), bot.choice([100, 500, 1000, 5000, 1234.56, 0.1]))
+    if bot.random() < 0.3:
+        sim.lock_action(bot.choice(ACTION_IDS[:-2]) if bot.random() < 0.7 else None)
+    sim.next_month()
+
+
+def _recorded_game(game, tape=None):
+    bot = random.Random(game)
+    sim = FinanceSimulation()
+    sim.selected_class = bot.choice(list(CLASS_CONFIGS))
+    sim.selected_education = bot.choice(list(EDUCATION_CONFIGS))
+    sim.selected_difficulty = bot.choice(list(DIFFICULTY_CONFIGS))
+    sim.market_tape = tape
+    sim.start_game(bot.getrandbits(32))
+    sim.recorder = Replay.for_game(sim)
+    while not sim.finished:
+        play_random_month(sim, bot)
+    return sim, sim.recorder
+
+
+@pytest.mark.parametrize('game', range(40))
+def test_replay_reproduces_the_game(game):
+    sim, replay = _recorded_game(game)
+    assert replay.final_score == sim.calculate_score()
+
+    rerun = run_replay(decode_replay(encode_replay(replay)))
+    assert rerun.finished
+    assert rerun.calculate_score() == replay.final_score
+    assert rerun.monthly_log == sim.monthly_log
+    assert rerun.snapshot() == sim.snapshot()
+
+
+def test_replay_file_round_trip(tmp_path):
+    _, replay = _recorded_game(0)
+    loaded = load_replay(save_replay(replay, str(tmp_path)))
+    assert encode_replay(loaded) == encode_replay(replay)
+    assert run_replay(loaded).calculate_score() == replay.final_score
+
+
+def test_replay_on_a_market_tape(tmp_path):
+    path = str(tmp_path / "tape.fqt")
+    market_tape.write_tape(path, np.random.default_rng(0).normal(0.007, 0.045, 600), 192601)
+    sim, replay = _recorded_game(1, market_tape.open_tape(path))
+    assert replay.market_tape is not None
+    rerun = run_replay(decode_replay(encode_replay(replay)))
+    assert rerun.calculate_score() == replay.final_score
+    assert rerun.monthly_log == sim.monthly_log
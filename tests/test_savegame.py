@@ -0,0 +1,154 @@
+import copy
+import json
+import os
+import random
+import threading
+
+import pytest
+
+import savegame
+from finance_sim import FinanceSimulation
+from replay import Replay, run_replay
+from savegame import Autosave, load_autosave
+from test_replay import play_random_month
+
+
+def _game(trial):
+    sim = FinanceSimulation()
+    sim.selected_class, sim.selected_education, sim.selected_difficulty = random.Random(trial).choice(
+        [('lower', 'masters', 'hard'), ('middle', 'university', 'normal'), ('upper', 'polytechnic', 'easy')])
+    sim.start_game(trial)
+    sim.recorder = Replay.for_game(sim)
+    return sim
+
+
+def _play_on(sim, bot):
+    while not sim.finished:
+        play_random_month(sim, bot)
+
+
+def _resume(state, monthly_log, ops):
+    sim = FinanceSimulation()
+    sim.restore(state, monthly_log)
+    sim.recorder = Replay.for_game(sim)
+    sim.recorder.ops = list(ops)
+    return sim
+
+
+@pytest.mark.parametrize('trial', range(30))
+def test_restored_snapshot_plays_on_identically(trial):
+    sim, bot = _game(trial), random.Random(trial)
+    for _ in range(random.Random(-trial).randint(1, 20)):
+        play_random_month(sim, bot)
+        if sim.finished:
+            return
+    state = json.loads(json.dumps(sim.snapshot()))      # as written to disk
+    resumed = _resume(state, sim.monthly_log.rows(), sim.recorder.ops)
+    assert resumed.snapshot() == sim.snapshot()
+
+    resumed_bot = copy.deepcopy(bot)
+    _play_on(sim, bot)
+    _play_on(resumed, resumed_bot)
+    assert resumed.monthly_log == sim.monthly_log
+    assert resumed.calculate_score() == sim.calculate_score()
+    assert resumed.achievements.unlocked == sim.achievements.unlocked
+    # the resumed recording is still one replay of the whole game
+    assert run_replay(resumed.recorder).calculate_score() == sim.calculate_score()
+
+
+def _autosaved_game(path, months):
+    sim, bot = _game(5), random.Random(5)
+    autosave = Autosave(path)
+    autosave.begin(sim)
+    states = [sim.snapshot()]
+    for _ in range(months):
+        play_random_month(sim, bot)
+        autosave.append(sim)
+        states.append(sim.snapshot())
+    autosave.flush()
+    return sim, states
+
+
+def test_autosave_deltas_rebuild_the_latest_state(tmp_path):
+    path = str(tmp_path / "autosave.fqs")
+    sim, _ = _autosaved_game(path, 8)
+    state, monthly_log, ops = load_autosave(path)
+    resumed = _resume(state, monthly_log, ops)
+    assert resumed.snapshot() == sim.snapshot()
+    assert resumed.monthly_log == sim.monthly_log
+    assert ops == sim.recorder.ops
+
+
+def test_torn_autosave_falls_back_to_the_previous_month(tmp_path):
+    path = str(tmp_path / "autosave.fqs")
+    _, states = _autosaved_game(path, 8)
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-7])
+    state, monthly_log, _ = load_autosave(path)
+    assert state == json.loads(json.dumps(states[-2]))
+    assert len(monthly_log) == 7
+
+
+def test_discarded_autosave_is_gone(tmp_path):
+    path = str(tmp_path / "autosave.fqs")
+    autosave = Autosave(path)
+    autosave.begin(_game(1))
+    autosave.discard()
+    autosave.flush()
+    assert not os.path.exists(path)
+    assert load_autosave(path) is None
+
+
+def _failing_once(monkeypatch, call, error, hold=None):
+    """Make the `call`-th record packed by the writer thread raise `error` (once `hold` is set, if given)."""
+    pack, calls = savegame._pack_record, []
+
+    def flaky(payload):
+        calls.append(payload['type'])
+        if len(calls) == call:
+            if hold is not None:
+                hold.wait()
+            raise error
+        return pack(payload)
+
+    monkeypatch.setattr(savegame, '_pack_record', flaky)
+    return calls
+
+
+@pytest.mark.parametrize('error', [OSError("disk full"), ValueError("not serializable")])
+def test_failed_write_is_followed_by_a_fresh_base(tmp_path, monkeypatch, error):
+    path = str(tmp_path / "autosave.fqs")
+    calls = _failing_once(monkeypatch, 3, error)     # the second month's delta
+    sim, bot = _game(5), random.Random(5)
+    autosave = Autosave(path)
+    autosave.begin(sim)
+    for _ in range(6):
+        play_random_month(sim, bot)
+        autosave.append(sim)
+        autosave.flush()                # returns: the writer survived the failure
+    assert calls == ['base', 'delta', 'delta', 'base', 'delta', 'delta', 'delta']
+
+    state, monthly_log, ops = load_autosave(path)
+    resumed = _resume(state, monthly_log, ops)
+    assert resumed.snapshot() == sim.snapshot()
+    assert resumed.monthly_log == sim.monthly_log
+    assert ops == sim.recorder.ops
+
+
+def test_deltas_queued_behind_a_failed_write_are_dropped(tmp_path, monkeypatch):
+    path = str(tmp_path / "autosave.fqs")
+    hold = threading.Event()
+    _failing_once(monkeypatch, 2, OSError("disk full"), hold)
+    sim, bot = _game(6), random.Random(6)
+    autosave = Autosave(path)
+    autosave.begin(sim)
+    autosave.flush()
+    base = load_autosave(path)
+    for _ in range(3):                  # all queued before the first of them fails
+        play_random_month(sim, bot)
+        autosave.append(sim)
+    hold.set()
+    autosave.flush()
+    assert load_autosave(path) == base  # the base alone, not a base with a gap in its deltas
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from finance_sim import FinanceSimulation
+from store import Store, derived, tracked
+
+
+class Account(Store):
+    money = tracked()
+    debt = tracked()
+    items = tracked()           # list; touch('items') after changing it in place
+    label = tracked()
+
+    def __init__(self):
+        self.money, self.debt, self.items, self.label = 100, 40, [], ''
+        self.calls = 0
+
+    @derived('money', 'debt')
+    def net_worth(self):
+        self.calls += 1
+        return self.money - self.debt
+
+    @derived('net_worth', 'items')
+    def summary(self):
+        return f"{self.net_worth} / {len(self.items)} items"
+
+
+@pytest.fixture
+def account():
+    account = Account()
+    changes = []
+    account.subscribe({'money', 'net_worth', 'items'}, changes.append)
+    account.subscribe({'summary'}, changes.append)
+    account.publish()           # drop what __init__ set
+    return account, changes
+
+
+def test_derived_is_memoized_until_a_dependency_is_assigned():
+    a = Account()
+    assert a.net_worth == 60 and a.net_worth == 60
+    assert a.calls == 1
+    a.label = 'x'                               # not a dependency
+    assert a.net_worth == 60 and a.calls == 1
+    a.debt = 10
+    assert a.net_worth == 90 and a.calls == 2
+
+
+def test_assignment_invalidates_derived_values_transitively():
+    a = Account()
+    assert a.summary == "60 / 0 items"
+    a.money = 200
+    assert a.summary == "160 / 0 items"
+
+
+def test_in_place_mutation_needs_touch():
+    a = Account()
+    assert a.summary == "60 / 0 items"
+    a.items.append('car')
+    assert a.summary == "60 / 0 items"           # stale: the list changed behind the store's back
+    a.touch('items')
+    assert a.summary == "60 / 1 items"
+
+
+def test_subscribers_get_only_their_changed_names_once_per_publish(account):
+    a, changes = account
+    a.label = 'x'
+    a.publish()
+    assert changes == []                        # nobody shows label
+    a.debt = 0
+    a.debt = 5
+    a.publish()
+    assert changes == [{'net_worth'}, {'summary'}]
+    changes.clear()
+    a.items.append('car')
+    a.touch('items')
+    a.money = 1
+    a.publish()
+    assert changes == [{'money', 'net_worth', 'items'}, {'summary'}]
+    changes.clear()
+    a.publish()
+    assert changes == []
+
+
+def test_nothing_is_recorded_without_subscribers():
+    a = Account()
+    a.money = 1
+    a.touch('items')
+    assert a._changes is None
+
+
+def test_simulation_touch_refreshes_derived_state():
+    sim = FinanceSimulation()
+    sim.selected_class, sim.selected_education, sim.selected_difficulty = 'middle', 'university', 'normal'
+    sim.start_game(11)
+    sim.money = 10_000
+    sim.debuffs = []
+    assert 'health_therapy' not in sim.legal_moves
+    sim.debuffs.append('unhappy')
+    sim.touch('debuffs')
+    assert 'health_therapy' in sim.legal_moves
+
+    worth = sim.net_worth
+    sim.holdings += np.full_like(sim.holdings, 100.0)    # in place: the assignment re-sets the same array
+    assert sim.investments == pytest.approx(sum(sim.holdings))
+    assert sim.net_worth == pytest.approx(worth + 100.0 * len(sim.holdings))
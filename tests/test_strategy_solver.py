@@ -0,0 +1,48 @@
+import pickle
+
+import pytest
+
+import strategy_solver
+
+SETUP = ('middle', 'university', 'normal')
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / strategy_solver.CACHE_DIR).mkdir()
+    return tmp_path
+
+
+@pytest.mark.parametrize('contents', [b'', b'not a pickle', b'\x80\x04\x95\x10junk', pickle.dumps([1, 2])],
+                         ids=['empty', 'garbage', 'truncated', 'not a result'])
+def test_unreadable_cache_is_a_miss(cache_dir, contents):
+    with open(strategy_solver._cache_path(SETUP), 'wb') as f:
+        f.write(contents)
+    assert strategy_solver.load_result(SETUP) is None
+
+
+def test_missing_cache_is_a_miss(cache_dir):
+    assert strategy_solver.load_result(SETUP) is None
+
+
+def test_benchmark_replays_the_players_game_length(tmp_path, monkeypatch, capsys):
+    from finance_sim import FinanceSimulation
+    from policies import RandomPolicy, play_policy
+    from replay import Replay, save_replay
+
+    sim = FinanceSimulation()
+    sim.selected_class, sim.selected_education, sim.selected_difficulty = SETUP
+    sim.months_per_game = 12
+    sim.start_game(77)
+    replay = sim.recorder = Replay.for_game(sim)
+    play_policy(sim, RandomPolicy())
+    save_replay(replay, str(tmp_path))
+
+    played = []
+    monkeypatch.setattr(strategy_solver, 'solver_policy', lambda setup, iterations: None)
+    monkeypatch.setattr(strategy_solver, 'play_game', lambda sim, choose: played.append(sim) or 1)
+    strategy_solver._benchmark_replays([str(tmp_path)], 1)
+    [game] = played
+    assert (game.months_per_game, game.seed, game.current_month) == (12, 77, 0)
+    assert "solver 1" in capsys.readouterr().out
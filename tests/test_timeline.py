@@ -0,0 +1,133 @@
+import pytest
+
+from finance_sim import FinanceSimulation, DEBUFF_MONTHS, VEHICLE_UPKEEP
+from timeline import Timeline
+
+
+def _fire(timeline, month):
+    return list(timeline.pop_due(month))
+
+
+def test_effects_fire_by_month_then_schedule_order():
+    t = Timeline()
+    t.schedule(5, 'b')
+    t.schedule(3, 'a', args=1)
+    t.schedule(5, 'c')
+    assert _fire(t, 2) == []
+    assert _fire(t, 5) == [('a', 1), ('b', None), ('c', None)]
+    assert len(t) == 0
+
+
+def test_rescheduling_a_key_replaces_it():
+    t = Timeline()
+    t.schedule(4, 'expire', key='k')
+    t.schedule(9, 'expire', key='k')
+    assert len(t) == 1 and t.due_month('k') == 9
+    assert _fire(t, 8) == []
+    assert _fire(t, 9) == [('expire', None)]
+    assert t.due_month('k') is None
+
+
+def test_cancelled_effect_never_fires_and_the_key_is_reusable():
+    t = Timeline()
+    t.schedule(4, 'expire', key='k')
+    t.cancel('k')
+    t.cancel('k')                       # cancelling twice is harmless
+    assert len(t) == 0 and t.due_month('k') is None
+    t.schedule(6, 'expire', key='k')
+    assert _fire(t, 5) == []
+    assert _fire(t, 6) == [('expire', None)]
+
+
+def test_recurring_effect_requeues_itself():
+    t = Timeline()
+    t.schedule(2, 'charge', key='upkeep', every=1, args=150)
+    assert _fire(t, 4) == [('charge', 150)] * 3
+    assert t.due_month('upkeep') == 5 and len(t) == 1
+
+
+def test_state_round_trip():
+    t = Timeline()
+    t.schedule(7, 'b', key='x', args='y')
+    t.schedule(3, 'a', every=2)
+    t.schedule(9, 'dead', key='z')
+    t.cancel('z')
+    restored = Timeline.from_state(t.state())
+    assert restored.state() == t.state() == [[3, 'a', None, 2, None], [7, 'b', 'x', None, 'y']]
+    assert _fire(restored, 7) == _fire(t, 7)
+
+
+# ---------- effects in the simulation ----------
+@pytest.fixture
+def sim():
+    sim = FinanceSimulation()
+    sim.selected_class, sim.selected_education, sim.selected_difficulty = 'middle', 'university', 'normal'
+    sim.start_game(3)
+    sim.debuffs = []
+    sim.timeline = Timeline()
+    sim.current_month = 5
+    return sim
+
+
+def _play_effects(sim, month):
+    """Fire what is due in `month` as next_month() would; returns its messages."""
+    sim.current_month = month
+    messages = []
+    sim._run_due_effects(messages)
+    return messages
+
+
+def test_debuff_expires_after_its_months(sim):
+    sim._add_debuff('distracted')       # during month 5: months 6, 7 and 8 are affected
+    months = DEBUFF_MONTHS['distracted']
+    assert sim.timeline.due_month('debuff:distracted') == 6 + months
+    for month in range(6, 6 + months):
+        _play_effects(sim, month)
+        assert 'distracted' in sim.debuffs
+    assert _play_effects(sim, 6 + months) == ["No longer distracted"]
+    assert sim.debuffs == []
+
+
+def test_renewing_a_debuff_pushes_its_expiry_back(sim):
+    sim._add_debuff('unhappy')
+    sim.current_month = 8
+    sim._add_debuff('unhappy')
+    assert sim.debuffs == ['unhappy'] and len(sim.timeline) == 1
+    assert sim.timeline.due_month('debuff:unhappy') == 9 + DEBUFF_MONTHS['unhappy']
+    assert _play_effects(sim, 6 + DEBUFF_MONTHS['unhappy']) == []
+    assert 'unhappy' in sim.debuffs
+
+
+def test_therapy_cancels_pending_expiries(sim):
+    sim._add_debuff('distracted')
+    sim._add_debuff('unhappy')
+    sim.money = 10_000
+    sim._action_callback('health_therapy')()
+    assert sim.debuffs == [] and len(sim.timeline) == 0
+    sim.current_month = 7
+    sim._add_debuff('distracted')       # a fresh debuff is not cut short by the cancelled expiry
+    assert _play_effects(sim, 6 + DEBUFF_MONTHS['distracted']) == []
+    assert sim.debuffs == ['distracted']
+
+
+def test_income_suspension_never_shortens(sim):
+    sim.suspend_income(4)
+    assert sim.months_no_income == 4
+    sim.suspend_income(2)
+    assert sim.months_no_income == 4
+    sim.suspend_income(6, sim.current_month + 1)
+    assert sim.months_no_income == 7
+    assert _play_effects(sim, 11) == []
+    assert _play_effects(sim, 12) == ["💼 Income resumes"]
+    assert sim.months_no_income == 0
+
+
+def test_vehicle_upkeep_is_charged_from_the_purchase_month(sim):
+    sim.money = 100_000
+    sim._action_callback('life_vehicle')()
+    assert sim.has_vehicle
+    money = sim.money
+    _play_effects(sim, 5)
+    assert sim.money == money - VEHICLE_UPKEEP
+    _play_effects(sim, 7)
+    assert sim.money == money - 3 * VEHICLE_UPKEEP
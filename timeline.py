@@ -0,0 +1,86 @@
+"""
+Scheduled effects: a priority queue of things that happen in a future month.
+
+FinanceSimulation.next_month() drains every effect due in the month being
+played (pop_due) and fires it; the heap keeps that O(log n) per due effect
+however many effects are waiting, so long games can hold hundreds.
+
+An effect is a kind (the simulation's handler name), a due month, optional
+JSON-ready args and optionally:
+
+    key     at most one effect per key is live: scheduling a key again
+            replaces the earlier effect, cancel(key) drops it, and
+            due_month(key) answers "when?" in O(1)
+    every   recurring: after firing it is re-queued `every` months later
+
+Replaced and cancelled entries stay in the heap marked dead and are skipped
+when they surface (the heapq documentation's lazy-deletion recipe), so
+neither operation has to search the heap.
+
+Effects carry no callables, so a timeline snapshots as plain lists and
+replays reproduce it exactly; entries due in the same month fire in the
+order they were scheduled.
+"""
+import heapq
+
+_DUE, _SEQ, _KIND, _KEY, _EVERY, _ARGS = range(6)
+
+
+class Timeline:
+    def __init__(self):
+        self._heap = []         # [due, seq, kind, key, every, args]; kind None = dead
+        self._keyed = {}        # key -> its live heap entry
+        self._seq = 0
+        self._live = 0
+
+    def __len__(self):
+        return self._live
+
+    def schedule(self, due, kind, key=None, every=None, args=None):
+        if key is not None:
+            self.cancel(key)
+        entry = [due, self._seq, kind, key, every, args]
+        self._seq += 1
+        heapq.heappush(self._heap, entry)
+        if key is not None:
+            self._keyed[key] = entry
+        self._live += 1
+
+    def cancel(self, key):
+        entry = self._keyed.pop(key, None)
+        if entry is not None:
+            entry[_KIND] = None
+            self._live -= 1
+
+    def due_month(self, key):
+        """Month the effect under `key` is due, or None if there is none."""
+        entry = self._keyed.get(key)
+        return entry[_DUE] if entry is not None else None
+
+    def pop_due(self, month):
+        """Yield (kind, args) for every live effect due by `month`, earliest first."""
+        heap = self._heap
+        while heap and heap[0][_DUE] <= month:
+            entry = heapq.heappop(heap)
+            kind = entry[_KIND]
+            if kind is None:
+                continue
+            self._live -= 1
+            key, every = entry[_KEY], entry[_EVERY]
+            if key is not None:
+                del self._keyed[key]
+            if every:
+                self.schedule(entry[_DUE] + every, kind, key, every, entry[_ARGS])
+            yield kind, entry[_ARGS]
+
+    # ---------- save / resume ----------
+    def state(self):
+        """Live effects in firing order."""
+        return [[e[_DUE], e[_KIND], e[_KEY], e[_EVERY], e[_ARGS]] for e in sorted(self._heap) if e[_KIND] is not None]
+
+    @classmethod
+    def from_state(cls, state):
+        timeline = cls()
+        for due, kind, key, every, args in state:
+            timeline.schedule(due, kind, key, every, args)
+        return timeline
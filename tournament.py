@@ -0,0 +1,202 @@
+"""
+Tournament runner for FinanceQuest bot policies (see policies.py).
+
+Every policy plays the same scenarios (setup + game seed), so differences come
+from the strategies and not from luck: scores are compared pairwise per
+scenario against the leader. Scenarios are split into chunks and played on a
+process pool; each worker receives the roster once.
+
+    python tournament.py                                   default roster, 2,000 seeds
+    python tournament.py -n 100000 -j 16 -o results.json   overnight run
+    python tournament.py --setup lower polytechnic hard --solver
+    python tournament.py --roster my_bots                  my_bots.ROSTER (a list of Policy)
+    python tournament.py --tape market_tape.fqt            historical market (see market_tape.py)
+
+Scenario i uses seed `--seed + i` and cycles through the chosen setups.
+"""
+import argparse
+import array
+import importlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from finance_sim import FinanceSimulation
+from market_tape import open_tape
+import policies
+import strategy_solver
+
+CHUNK_SIZE = 500
+HISTOGRAM_BIN = 5000
+_GOAL_KEYS = ('netWorth', 'emergencyFund', 'debtFree', 'happiness')
+
+_roster = None      # per worker process
+_tape = None
+
+
+def _init_worker(roster, tape=None):
+    global _roster, _tape
+    _roster = roster
+    _tape = tape        # arrives as its path and is re-mapped here, not copied
+
+
+def scenario(setups, base_seed, i):
+    return setups[i % len(setups)], base_seed + i
+
+
+def _play_chunk(setups, base_seed, start, stop):
+    """Play scenarios [start, stop) with every policy: {name: (scores bytes, goal counts, bankruptcies)}."""
+    out = {}
+    sim = FinanceSimulation()
+    sim.market_tape = _tape
+    for policy in _roster:
+        scores = array.array('i')
+        goals = [0] * len(_GOAL_KEYS)
+        bankrupt = 0
+        for i in range(start, stop):
+            setup, seed = scenario(setups, base_seed, i)
+            sim.selected_class, sim.selected_education, sim.selected_difficulty = setup
+            sim.start_game(seed)
+            scores.append(policies.play_policy(sim, policy))
+            for g, key in enumerate(_GOAL_KEYS):
+                goals[g] += sim.goals[key]['completed']
+            bankrupt += sim.current_month < sim.months_per_game
+        out[policy.name] = (scores.tobytes(), goals, bankrupt)
+    return start, out
+
+
+def run_tournament(roster, setups, seeds, base_seed=0, workers=None, progress=True, tape=None):
+    """
+    Play every policy on `seeds` scenarios; returns {name: {'scores': array, 'goals': [...], 'bankrupt': n}}.
+    With a market_tape.MarketTape as `tape`, investment returns come from it.
+    """
+    names = [p.name for p in roster]
+    if len(set(names)) != len(names):
+        raise ValueError("policy names must be unique")
+    chunks = [(s, min(s + CHUNK_SIZE, seeds)) for s in range(0, seeds, CHUNK_SIZE)]
+    parts = {}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(roster, tape)) as pool:
+        futures = [pool.submit(_play_chunk, setups, base_seed, start, stop) for start, stop in chunks]
+        for done, future in enumerate(as_completed(futures), 1):
+            start, out = future.result()
+            parts[start] = out
+            if progress and (done % max(1, len(chunks) // 10) == 0 or done == len(chunks)):
+                elapsed = time.perf_counter() - started
+                print(f"  {done}/{len(chunks)} chunks, {elapsed:.0f}s "
+                      f"({done * CHUNK_SIZE * len(roster) / elapsed:,.0f} games/s)", file=sys.stderr)
+    results = {}
+    for name in names:
+        scores = array.array('i')
+        goals = [0] * len(_GOAL_KEYS)
+        bankrupt = 0
+        for start, _ in chunks:     # scenario order, so scores line up across policies
+            raw, chunk_goals, chunk_bankrupt = parts[start][name]
+            scores.frombytes(raw)
+            goals = [a + b for a, b in zip(goals, chunk_goals)]
+            bankrupt += chunk_bankrupt
+        results[name] = {'scores': scores, 'goals': goals, 'bankrupt': bankrupt}
+    return results
+
+
+# ============================================================
+# LEADERBOARD
+# ============================================================
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _mean_ci(values):
+    n = len(values)
+    mean = sum(values) / n
+    sd = math.sqrt(sum((v - mean) ** 2 for v in values) / max(n - 1, 1))
+    return mean, 1.96 * sd / math.sqrt(n)
+
+
+def leaderboard(results):
+    """Ranked rows with score distribution, goal rates and the paired gap to the leader."""
+    rows = []
+    for name, r in results.items():
+        scores = r['scores']
+        n = len(scores)
+        ordered = sorted(scores)
+        mean, ci = _mean_ci(scores)
+        histogram = {}
+        for s in scores:
+            histogram[s // HISTOGRAM_BIN * HISTOGRAM_BIN] = histogram.get(s // HISTOGRAM_BIN * HISTOGRAM_BIN, 0) + 1
+        rows.append({
+            'policy': name, 'games': n, 'mean': mean, 'ci95': ci,
+            'p5': _percentile(ordered, 0.05), 'p25': _percentile(ordered, 0.25), 'median': _percentile(ordered, 0.5),
+            'p75': _percentile(ordered, 0.75), 'p95': _percentile(ordered, 0.95),
+            'bankrupt_rate': r['bankrupt'] / n,
+            'goal_rates': {key: count / n for key, count in zip(_GOAL_KEYS, r['goals'])},
+            'histogram': {str(k): v for k, v in sorted(histogram.items())},
+        })
+    rows.sort(key=lambda row: row['mean'], reverse=True)
+    leader = results[rows[0]['policy']]['scores']
+    for row in rows:
+        diffs = [a - b for a, b in zip(results[row['policy']]['scores'], leader)]
+        row['gap'], row['gap_ci95'] = _mean_ci(diffs)
+    return rows
+
+
+def print_leaderboard(rows):
+    print(f"{'#':>3} {'policy':34} {'mean':>9} {'±95%':>7} {'gap':>8} {'±95%':>6} "
+          f"{'p5':>7} {'median':>7} {'p95':>7} {'bust':>5}  goals NW/EF/DF/H")
+    for rank, row in enumerate(rows, 1):
+        goals = "/".join(f"{row['goal_rates'][k]:.0%}" for k in _GOAL_KEYS)
+        print(f"{rank:3} {row['policy'][:34]:34} {row['mean']:9,.0f} {row['ci95']:7,.0f} {row['gap']:8,.0f} "
+              f"{row['gap_ci95']:6,.0f} {row['p5']:7,} {row['median']:7,} {row['p95']:7,} "
+              f"{row['bankrupt_rate']:5.1%}  {goals}")
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+def _load_roster(module_name):
+    module = importlib.import_module(module_name)
+    roster = getattr(module, 'ROSTER', None)
+    return list(roster() if callable(roster) else roster)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play FinanceQuest bot policies against identical seeded scenarios.")
+    parser.add_argument('-n', '--seeds', type=int, default=2000, help="scenarios per policy")
+    parser.add_argument('--seed', type=int, default=0, help="first scenario seed")
+    parser.add_argument('--setup', nargs=3, metavar=('CLASS', 'EDUCATION', 'DIFFICULTY'),
+                        help="play one setup (default: cycle through all 27)")
+    parser.add_argument('--roster', help="module whose ROSTER lists the policies (default: policies.default_roster)")
+    parser.add_argument('--solver', action='store_true', help="add the strategy solver's policy (solves uncached setups first)")
+    parser.add_argument('--tape', help="market tape to draw investment returns from (default: random returns)")
+    parser.add_argument('-j', '--workers', type=int, help="worker processes (default: all cores)")
+    parser.add_argument('-o', '--out', help="write the leaderboard with score histograms as JSON")
+    args = parser.parse_args(argv)
+
+    setups = [tuple(args.setup)] if args.setup else strategy_solver.all_setups()
+    roster = _load_roster(args.roster) if args.roster else policies.default_roster()
+    tape = open_tape(args.tape) if args.tape else None
+    if args.solver:
+        # solve up front in parallel rather than once per worker
+        for _ in strategy_solver.solve_all(setups, workers=args.workers):
+            pass
+        roster.append(policies.SolverPolicy())
+    start = time.perf_counter()
+    print(f"{len(roster)} policies x {args.seeds:,} scenarios on {len(setups)} setup(s)", file=sys.stderr)
+    rows = leaderboard(run_tournament(roster, setups, args.seeds, args.seed, args.workers, tape=tape))
+    print_leaderboard(rows)
+    print(f"{len(roster) * args.seeds:,} games in {time.perf_counter() - start:.1f}s")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'seeds': args.seeds, 'first_seed': args.seed, 'setups': setups, 'leaderboard': rows}, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Background "what-if" evaluation of the actions on offer.
+
+For the current game state and each candidate action, a worker process runs a
+batch of Monte Carlo rollouts: restore the state, play the action, then let a
+default continuation policy (the strategy solver's for this setup when it is
+cached, otherwise its heuristic) finish the game under the normal rules. The
+batch reports the expected final score and the chance of completing each goal.
+In games longer than WHATIF_HORIZON months, rollouts stop that many months
+ahead and report the score there instead.
+
+Every action of one state uses the same rollout seeds (common random numbers),
+so differences between actions are not drowned out by event noise. Results are
+cached per (state hash, action); the GUI requests all enabled actions as soon
+as the action panel is rebuilt and only ever polls for finished results, so
+hovering a button never waits on a simulation.
+"""
+import hashlib
+import json
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from finance_sim import FinanceSimulation
+import strategy_solver
+
+WHATIF_ROLLOUTS = 48
+WHATIF_CACHE_SIZE = 512
+WHATIF_HORIZON = 24         # months per rollout, so long games cost the same as a standard one
+# Snapshot entries that never change what happens next (the RNG is reseeded per rollout)
+_IGNORED_FIELDS = ('rng', 'game_message', 'avatar')
+
+_policies = {}      # per worker process: setup -> continuation policy
+
+
+def state_hash(state):
+    relevant = {k: v for k, v in state.items() if k not in _IGNORED_FIELDS}
+    return hashlib.sha1(json.dumps(relevant, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _continuation(setup):
+    if setup not in _policies:
+        result = strategy_solver.load_result(setup)
+        _policies[setup] = (strategy_solver.TablePolicy(result['policy'], strategy_solver.HeuristicPolicy(**result['params']))
+                            if result is not None else strategy_solver.heuristic_action)
+    return _policies[setup]
+
+
+def _lower_priority():
+    """Worker initializer: rollouts must never take CPU from the game's own frames."""
+    if hasattr(os, 'nice'):
+        os.nice(10)
+
+
+def rollout_batch(state, actions, rollouts, seed):
+    """{action: outcome summary} for playing each action from `state`, then finishing the game `rollouts` times."""
+    sim = FinanceSimulation()
+    return {action: _rollouts(sim, state, action, rollouts, seed) for action in actions}
+
+
+def _rollouts(sim, state, action, rollouts, seed):
+    policy = _continuation((state['selected_class'], state['selected_education'], state['selected_difficulty']))
+    scores = []
+    goal_hits = {}
+    for i in range(rollouts):
+        sim.restore(state)
+        sim.rng.seed(seed + i)
+        if sim.market_tape is not None:
+            sim._plan_market(seed + i)      # an unseen market, not the game's own future
+        sim.apply_action(action)
+        scores.append(strategy_solver.play_game(sim, policy, WHATIF_HORIZON))
+        for key, goal in sim.goals.items():
+            goal_hits[key] = goal_hits.get(key, 0) + goal['completed']
+    mean = sum(scores) / rollouts
+    sd = (sum((s - mean) ** 2 for s in scores) / max(rollouts - 1, 1)) ** 0.5
+    return {'score': mean, 'ci95': 1.96 * sd / rollouts ** 0.5,
+            'goals': {key: hits / rollouts for key, hits in goal_hits.items()}}
+
+
+class WhatIfEvaluator:
+    """
+    Speculative what-if rollouts on a process pool, with an LRU cache of
+    finished results. Jobs are submitted by a dispatcher thread, so the game
+    thread only hashes the state and queues it.
+    """
+
+    def __init__(self, rollouts=WHATIF_ROLLOUTS, workers=None):
+        self.rollouts = rollouts
+        # leave a core for the game itself
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.enabled = True
+        self._pool = None
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._pending = {}                  # (state hash, action) -> Future
+        self._results = OrderedDict()       # (state hash, action) -> result dict
+
+    def request(self, sim, actions):
+        """Queue rollouts for every action not already known for `sim`'s state; returns the state hash."""
+        state = sim.snapshot()
+        key = state_hash(state)
+        if self.enabled:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._queue.put((key, state, list(actions)))
+        return key
+
+    def result(self, key, action):
+        """Finished result for (state, action), or None while it is still running."""
+        job = (key, action)
+        with self._lock:
+            if job in self._results:
+                self._results.move_to_end(job)
+                return self._results[job]
+            future = self._pending.get(job)
+            if future is None or not future.done():
+                return None
+            batch = [j for j, f in self._pending.items() if f is future]
+            for j in batch:
+                del self._pending[j]
+            if future.cancelled() or future.exception() is not None:
+                return None
+            for j in batch:
+                self._results[j] = future.result()[j[1]]
+            while len(self._results) > WHATIF_CACHE_SIZE:
+                self._results.popitem(last=False)
+            return self._results[job]
+
+    def shutdown(self):
+        self.enabled = False
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    # ---------- dispatcher thread ----------
+    def _run(self):
+        while self.enabled:
+            key, state, actions = self._queue.get()
+            while not self._queue.empty():      # only the newest state is worth simulating
+                key, state, actions = self._queue.get()
+            try:
+                self._dispatch(key, state, actions)
+            except (OSError, RuntimeError) as e:
+                print(f"What-if evaluation disabled: {e}")
+                self.enabled = False
+
+    def _dispatch(self, key, state, actions):
+        with self._lock:
+            for job, future in list(self._pending.items()):
+                if job[0] != key and (future.cancelled() or future.cancel()):   # the player moved on before it started
+                    del self._pending[job]
+            todo = [a for a in actions if (key, a) not in self._results and (key, a) not in self._pending]
+        if not self.enabled:
+            return
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_lower_priority)
+        seed = int(key[:8], 16)
+        # one batch per worker: a state's actions are sent (and the state pickled) only a few times
+        for batch in (todo[i::self.workers] for i in range(min(self.workers, len(todo)))):
+            future = self._pool.submit(rollout_batch, state, batch, self.rollouts, seed)
+            with self._lock:
+                self._pending.update(((key, action), future) for action in batch)